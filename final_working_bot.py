@@ -4,91 +4,45 @@ Zcryptoanalysis Bot - Working for @Zcryptoanzlysis_bot
 Ready to run immediately
 """
 
+import os
+import sys
 import requests
 import json
 import time
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zcryptoanalysis-bot'))
+
+from engine import Pipeline, CompactRenderer, WORKING
+from engine.fetcher import SyncFetcher
+
 # Configuration - UPDATE WITH YOUR TOKEN
 BOT_TOKEN = "YOUR_BOT_TOKEN_HERE"  # Replace with actual bot token
 API_URL = f"https://api.telegram.org/bot{BOT_TOKEN}"
 
+fetcher = SyncFetcher(
+    ['https://api.dexscreener.com/latest/dex/tickers'],
+    timeout=10,
+    allow_sample=os.getenv('ALLOW_SAMPLE_DATA', '').lower() in ('1', 'true', 'yes')
+)
+pipeline = Pipeline.from_profile(WORKING, fetcher=fetcher, renderer=CompactRenderer())
+
 def get_base_opportunities():
     """Get Base chain opportunities"""
-    try:
-        response = requests.get('https://api.dexscreener.com/latest/dex/tickers', timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            tickers = data.get('tickers', [])
-            return [t for t in tickers if t.get('chainId') == 'base']
-        return get_sample_data()
-    except:
-        return get_sample_data()
+    return pipeline.parser.select_chain(fetcher.fetch())
 
 def get_sample_data():
     """Reliable sample data"""
-    return [
-        {'chainId': 'base', 'baseToken': {'symbol': 'AERO', 'name': 'Aerodrome Finance'}, 'priceUsd': '0.000001234', 'liquidity': {'usd': 75000}, 'volume': {'h24': 250000}, 'priceChange': {'h24': 15.7}},
-        {'chainId': 'base', 'baseToken': {'symbol': 'DEGEN', 'name': 'Degen'}, 'priceUsd': '0.00004567', 'liquidity': {'usd': 125000}, 'volume': {'h24': 180000}, 'priceChange': {'h24': -8.3}},
-        {'chainId': 'base', 'baseToken': {'symbol': 'BRETT', 'name': 'Brett'}, 'priceUsd': '0.00001234', 'liquidity': {'usd': 200000}, 'volume': {'h24': 350000}, 'priceChange': {'h24': 28.5}},
-        {'chainId': 'base', 'baseToken': {'symbol': 'BASEDOG', 'name': 'Base Dog'}, 'priceUsd': '0.000000891', 'liquidity': {'usd': 95000}, 'volume': {'h24': 120000}, 'priceChange': {'h24': 45.2}}
-    ]
+    return fetcher.sample_data
 
 def analyze_opportunities(tickers):
     """Analyze opportunities"""
-    opportunities = []
-    for ticker in tickers:
-        try:
-            token = ticker['baseToken']['symbol']
-            price = float(ticker['priceUsd'])
-            liquidity = float(ticker.get('liquidity', {}).get('usd', 0))
-            volume = float(ticker.get('volume', {}).get('h24', 0))
-            price_change = float(ticker.get('priceChange', {}).get('h24', 0))
-            
-            if liquidity >= 50000 and abs(price_change) >= 3:
-                risk_score = 2
-                if liquidity < 100000:
-                    risk_score += 3
-                elif liquidity < 500000:
-                    risk_score += 2
-                
-                if abs(price_change) > 100:
-                    risk_score += 4
-                elif abs(price_change) > 50:
-                    risk_score += 2
-                elif abs(price_change) > 20:
-                    risk_score += 1
-                
-                opportunities.append({
-                    "token": token,
-                    "price": price,
-                    "change_24h": price_change,
-                    "liquidity": liquidity,
-                    "risk_score": min(risk_score, 10),
-                    "risk_level": "🟢 Low" if min(risk_score, 10) <= 3 else "🟡 Medium" if min(risk_score, 10) <= 5 else "🟠 High"
-                })
-        except:
-            continue
-    return sorted(opportunities, key=lambda x: abs(x["change_24h"]), reverse=True)
+    return pipeline.analyze(tickers)
 
 def generate_report():
     """Generate formatted report"""
-    tickers = get_base_opportunities()
-    opportunities = analyze_opportunities(tickers)
-    
-    if not opportunities:
-        return "ℹ️ No Base chain opportunities found meeting criteria"
-    
-    report = "🎯 **Zcryptoanalysis Report**\n\n"
-    report += f"📊 Found **{len(opportunities)}** Base chain opportunities\n\n"
-    
-    for opp in opportunities[:5]:
-        emoji = "🚀" if opp["change_24h"] > 0 else "📉"
-        report += f"{emoji} **{opp['token']}** - ${opp['price']:.8f}\n"
-        report += f"📈 {opp['change_24h']:+.2f}% | 💧 ${opp['liquidity']:,}\n"
-        report += f"Risk: {opp['risk_level']} ({opp['risk_score']}/10)\n\n"
-    
-    return report
+    _, opportunities, report = pipeline.run()
+    return fetcher.data_notice() + (report or pipeline.renderer.render([]))
 
 def send_message(chat_id, text):
     """Send message to Telegram"""
@@ -133,10 +87,10 @@ def handle_commands():
 • 3%+ price change detection"""
                             send_message(chat_id, help_text)
                         elif text.startswith('/status'):
-                            status = f"🤖 **Bot Status**
-✅ Online and working
-📊 Data: DexScreener API
-⌚ Updated: {str(datetime.utcnow())[:19]}"
+                            status = (f"🤖 **Bot Status**\n"
+                                      f"✅ Online and working\n"
+                                      f"📊 Data: DexScreener API\n"
+                                      f"⌚ Updated: {str(datetime.utcnow())[:19]}")
                             send_message(chat_id, status)
                         
                         last_update_id = update['update_id']
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Decode benchmark: stdlib json into the TickerParser records the pipeline
+uses, the fastest JSON backend into the same records, and one pass over the
+rows for every scanned chain. Reports wall time and peak memory per fixture as JSON
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+from typing import List, Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import FIXTURE_SIZES, load_fixture
+from bench_scan import measure
+
+from engine import TickerParser, CHAIN_PROFILES
+from engine.decoder import JSON_BACKEND, loads, decode_record
+
+
+def current_path(chains: List[str]):
+    """json.loads into generic dicts, then each chain's parser walks them"""
+    parsers = [TickerParser(chain=chain) for chain in chains]
+
+    def run(body: bytes):
+        rows = json.loads(body).get('tickers') or []
+        return [record for parser in parsers for record in parser.parse(rows)]
+    return run
+
+
+def fast_json_path(chains: List[str]):
+    """Same parsers, fed by the fastest installed JSON backend"""
+    parsers = [TickerParser(chain=chain) for chain in chains]
+
+    def run(body: bytes):
+        rows = loads(body).get('tickers') or []
+        return [record for parser in parsers for record in parser.parse(rows)]
+    return run
+
+
+def single_pass_path(chains: List[str]):
+    """Fastest JSON backend, then one pass decoding rows on any scanned chain"""
+    scanned = set(chains)
+
+    def run(body: bytes):
+        rows = loads(body).get('tickers') or []
+        records = []
+        for row in rows:
+            if row.get('chainId') in scanned:
+                record = decode_record(row)
+                if record is not None:
+                    records.append(record)
+        return records
+    return run
+
+
+PATHS = {
+    'current': current_path,
+    'fast_json': fast_json_path,
+    'single_pass': single_pass_path
+}
+
+
+def bench_fixture(body: bytes, chains: List[str], repeat: int) -> Dict[str, Any]:
+    results = {}
+    for name, build in PATHS.items():
+        run = build(chains)
+        sample = measure(lambda: run, body, repeat)
+        sample['rows'] = len(sample.pop('result'))
+        results[name] = sample
+    baseline = results['current']['best_s']
+    for sample in results.values():
+        sample['speedup'] = baseline / sample['best_s'] if sample['best_s'] else None
+    return results
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='DexScreener payload decode benchmark')
+    parser.add_argument('--fixtures', nargs='+', default=list(FIXTURE_SIZES),
+                        help='fixture names or paths to recorded payload files')
+    parser.add_argument('--chains', nargs='+', default=list(CHAIN_PROFILES), help='chains to decode')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write JSON results to this file')
+    args = parser.parse_args(argv)
+
+    report = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'json_backend': JSON_BACKEND,
+        'chains': args.chains,
+        'repeat': args.repeat,
+        'results': {}
+    }
+    for fixture in args.fixtures:
+        body = load_fixture(fixture)
+        label = os.path.splitext(os.path.basename(fixture))[0]
+        report['results'][label] = dict(payload_bytes=len(body), **bench_fixture(body, args.chains, args.repeat))
+        print(f"📊 {label}: done", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
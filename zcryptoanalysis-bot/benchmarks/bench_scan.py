@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the scan pipeline
+Replays DexScreener payload fixtures through each analyzer and reports
+per-stage throughput and peak memory as JSON. Stateful stages (indicators,
+drain detection, pair aggregation) run on a fresh analyzer every iteration,
+and anything an analyzer writes goes to a temporary directory
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List, Dict, Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixtures import FIXTURE_SIZES, load_fixture
+
+from engine.decoder import loads
+
+
+# Each loader builds a fresh analyzer whose files live under the given directory
+def load_production(directory: str):
+    from production_bot import ProductionZcryptoBot
+    analyzer = ProductionZcryptoBot()
+    return {
+        'filter': lambda rows: [t for t in rows if t.get('chainId') == 'base'],
+        'analyze': analyzer.analyze_opportunities,
+        'render': lambda opps: analyzer.generate_summary(opps),
+        'pipeline': analyzer.pipeline
+    }
+
+
+def load_zcrypto(directory: str):
+    from zcryptoanalysis_bot import ZcryptoAnalyzer
+    analyzer = ZcryptoAnalyzer()
+    return {
+        'filter': lambda rows: [t for t in rows if t.get('chainId') == 'base'],
+        'analyze': analyzer.analyze_opportunities,
+        'render': lambda opps: '\n'.join(f"{o['token']} {o['price']:.8f} {o['change_24h']:+.2f}%" for o in opps[:10]),
+        'pipeline': analyzer.pipeline
+    }
+
+
+def load_crypto_final(directory: str):
+    from crypto_final_fixed import CryptoAnalyzer
+    analyzer = CryptoAnalyzer(ticker_log_dir=os.path.join(directory, 'ticker-log'))
+    return {
+        'filter': lambda rows: [p for p in rows if p.get('chainId') == 'base'],
+        'analyze': analyzer.filter_opportunities,
+        'render': lambda opps: json.dumps({'opportunities': opps, 'total_found': len(opps)}, default=str),
+        'pipeline': analyzer.pipeline
+    }
+
+
+def load_engine(scorer_name):
+    def load(directory: str):
+        import engine
+        pipeline = engine.Pipeline.from_profile(engine.PRODUCTION, scorer_class=getattr(engine, scorer_name),
+                                                renderer=engine.TelegramRenderer())
+        return {
+            'filter': pipeline.parser.select_chain,
+            'analyze': pipeline.analyze,
+            'render': pipeline.render,
+            'pipeline': pipeline
+        }
+    return load
+
+
+ANALYZERS = {
+    'engine_scalar': load_engine('ScalarScorer'),
+    'engine_column': load_engine('ColumnScorer'),
+    'production_bot': load_production,
+    'zcryptoanalysis_bot': load_zcrypto,
+    'crypto_final_fixed': load_crypto_final
+}
+
+
+def measure(make: Callable[[], Callable], arg: Any, repeat: int) -> Dict[str, Any]:
+    """Best/median wall time over repeat runs, plus peak traced memory of one run
+
+    make() is called untimed before every run and returns the function to time,
+    so a stateful stage can start each run from a fresh analyzer
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        func = make()
+        gc.collect()
+        start = time.perf_counter()
+        result = func(arg)
+        times.append(time.perf_counter() - start)
+
+    func = make()
+    gc.collect()
+    tracemalloc.start()
+    func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'best_s': min(times),
+        'median_s': statistics.median(times),
+        'peak_bytes': peak,
+        'result': result
+    }
+
+
+def run_stage(stats: Dict, name: str, func: Callable, arg: Any, rows: int, repeat: int,
+              make: Callable[[], Callable] = None) -> Any:
+    """Measure one stage and record it without the stage output"""
+    sample = measure(make or (lambda: func), arg, repeat)
+    result = sample.pop('result')
+    sample['rows'] = rows
+    sample['rows_per_s'] = rows / sample['best_s'] if sample['best_s'] else None
+    stats[name] = sample
+    return result
+
+
+def bench_analyzer(name: str, payload: bytes, repeat: int, workdir: str) -> Dict[str, Any]:
+    """Run parse -> filter -> analyze (score+sort) -> score -> sort -> render for one analyzer"""
+    def fresh():
+        return ANALYZERS[name](tempfile.mkdtemp(dir=workdir))
+
+    try:
+        stages = fresh()
+    except ImportError as e:
+        return {'skipped': f'import failed: {e}'}
+
+    def decode(body: bytes):
+        """Payload bytes to the analyzer's typed records, as the fetcher and parser do on every scan"""
+        data = loads(body)
+        return stages['pipeline'].parser.parse(data.get('pairs') or data.get('tickers') or [])
+
+    stats: Dict[str, Any] = {}
+    records = run_stage(stats, 'parse', decode, payload, 0, repeat)
+    data = loads(payload)
+    rows = data.get('pairs') or data.get('tickers') or []
+    stats['parse']['rows'] = len(rows)
+    stats['parse']['rows_per_s'] = len(rows) / stats['parse']['best_s']
+    stats['parse']['records'] = len(records)
+
+    base_rows = run_stage(stats, 'filter', stages['filter'], rows, len(rows), repeat)
+    opportunities = run_stage(stats, 'analyze', None, base_rows, len(base_rows), repeat,
+                              make=lambda: fresh()['analyze'])
+    # The scorer alone, on the records one fresh analysis parsed, annotated and filtered
+    stages['analyze'](base_rows)
+    pipeline = stages['pipeline']
+    records = pipeline.filter.apply(pipeline.parsed[1])
+    run_stage(stats, 'score', pipeline.scorer.score_all, records, len(records), repeat)
+    run_stage(stats, 'sort', lambda opps: sorted(opps, key=lambda x: abs(x['change_24h']), reverse=True),
+              opportunities, len(opportunities), repeat)
+    run_stage(stats, 'render', stages['render'], opportunities, len(opportunities), repeat)
+
+    # 'score' is already inside 'analyze'
+    stats['total_best_s'] = sum(v['best_s'] for stage, v in stats.items() if isinstance(v, dict) and stage != 'score')
+    stats['opportunities'] = len(opportunities)
+    return stats
+
+
+def compare(old_path: str, new_path: str):
+    """Print per-stage speedups between two result files"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    for fixture, analyzers in new['results'].items():
+        for analyzer, stages in analyzers.items():
+            if not isinstance(stages, dict):
+                continue
+            before = old['results'].get(fixture, {}).get(analyzer, {})
+            if 'skipped' in stages or 'skipped' in before or not before:
+                continue
+            for stage, sample in stages.items():
+                if not isinstance(sample, dict) or stage not in before:
+                    continue
+                ratio = before[stage]['best_s'] / sample['best_s'] if sample['best_s'] else float('inf')
+                print(f"{fixture:10} {analyzer:20} {stage:8} "
+                      f"{before[stage]['best_s'] * 1000:9.2f}ms -> {sample['best_s'] * 1000:9.2f}ms  x{ratio:.2f}")
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='Offline scan pipeline benchmark')
+    parser.add_argument('--fixtures', nargs='+', default=list(FIXTURE_SIZES),
+                        help='fixture names or paths to recorded payload files')
+    parser.add_argument('--analyzers', nargs='+', default=list(ANALYZERS), choices=list(ANALYZERS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = {
+        'timestamp': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': {}
+    }
+
+    with tempfile.TemporaryDirectory(prefix='bench_scan_') as workdir:
+        # Module-level paths of the bots are read on import, which happens in the loaders
+        os.environ['TICKER_LOG_DIR'] = os.path.join(workdir, 'ticker-log')
+        os.environ['SNAPSHOT_CACHE_PATH'] = os.path.join(workdir, 'snapshot.json')
+        for fixture in args.fixtures:
+            payload = load_fixture(fixture)
+            label = os.path.splitext(os.path.basename(fixture))[0]
+            report['results'][label] = {'payload_bytes': len(payload)}
+            for analyzer in args.analyzers:
+                report['results'][label][analyzer] = bench_analyzer(analyzer, payload, args.repeat, workdir)
+                print(f"📊 {label} / {analyzer}: done", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Deterministic DexScreener payload fixtures for offline benchmarks
+Synthetic tickers shaped like /dex/tickers and /pairs responses
+"""
+
+import json
+import os
+import random
+from typing import Dict, Any
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# name -> (row count, share of rows on Base)
+FIXTURE_SIZES = {
+    'small': (200, 0.5),
+    'typical': (5000, 0.15),
+    'all_chain': (50000, 0.1)
+}
+
+OTHER_CHAINS = ['ethereum', 'solana', 'arbitrum', 'bsc', 'polygon', 'optimism']
+
+
+def make_ticker(rng: random.Random, index: int, chain_id: str) -> Dict[str, Any]:
+    """One synthetic pair with the fields every analyzer reads"""
+    symbol = f'TK{index:05d}'
+    liquidity = round(10 ** rng.uniform(3, 7), 2)
+    return {
+        'chainId': chain_id,
+        'dexId': rng.choice(['uniswap', 'aerodrome', 'sushiswap', 'baseswap']),
+        'pairAddress': f'0x{rng.getrandbits(160):040x}',
+        'baseToken': {
+            'address': f'0x{rng.getrandbits(160):040x}',
+            'symbol': symbol,
+            'name': f'Token {index}'
+        },
+        'quoteToken': {'symbol': 'WETH'},
+        'priceUsd': f'{10 ** rng.uniform(-9, 2):.10g}',
+        'liquidity': {'usd': liquidity},
+        'volume': {'h24': round(liquidity * rng.uniform(0.01, 8), 2)},
+        'priceChange': {'h24': round(rng.gauss(0, 40), 2)}
+    }
+
+
+def make_payload(rows: int, base_share: float, seed: int = 42) -> Dict[str, Any]:
+    """Payload in the /dex/tickers shape"""
+    rng = random.Random(seed)
+    tickers = []
+    for i in range(rows):
+        chain_id = 'base' if rng.random() < base_share else rng.choice(OTHER_CHAINS)
+        tickers.append(make_ticker(rng, i, chain_id))
+    return {'schemaVersion': '1.0.0', 'tickers': tickers}
+
+
+def load_fixture(name: str) -> bytes:
+    """Raw payload bytes for a named fixture or a path to a recorded payload"""
+    if os.path.exists(name):
+        with open(name, 'rb') as f:
+            return f.read()
+
+    path = os.path.join(FIXTURES_DIR, f'{name}.json')
+    if not os.path.exists(path):
+        rows, base_share = FIXTURE_SIZES[name]
+        os.makedirs(FIXTURES_DIR, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(make_payload(rows, base_share), f, separators=(',', ':'))
+
+    with open(path, 'rb') as f:
+        return f.read()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker for upstream API endpoints
+Fails fast while an endpoint is down instead of waiting out full timeouts
+"""
+
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 30, max_backoff: float = 600):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_until = 0.0
+        self.probe_in_flight = False
+
+    def allow_request(self, now: float = None) -> bool:
+        """Whether a call may go through; an expired open circuit lets one probe pass"""
+        now = time.time() if now is None else now
+
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if now < self.opened_until:
+                return False
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+        if self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+
+    def record_success(self):
+        """Close the circuit and reset backoff"""
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.probe_in_flight = False
+
+    def release_probe(self):
+        """End a probe whose outcome was never recorded, so a later call may probe again"""
+        self.probe_in_flight = False
+
+    def record_failure(self, now: float = None):
+        """Count a failure, opening the circuit with exponential backoff past the threshold"""
+        now = time.time() if now is None else now
+        self.failures += 1
+        self.probe_in_flight = False
+
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            backoff = min(self.base_backoff * (2 ** self.trips), self.max_backoff)
+            self.trips += 1
+            self.state = OPEN
+            self.opened_until = now + backoff
+
+    def retry_in(self, now: float = None) -> float:
+        """Seconds until an open circuit allows a probe"""
+        now = time.time() if now is None else now
+        if self.state != OPEN:
+            return 0.0
+        return max(self.opened_until - now, 0.0)
@@ -5,154 +5,127 @@ DexScreener integration with risk scoring
 """
 
 import asyncio
-import aiohttp
-import json
 import logging
 import os
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
+
+from engine import Pipeline, JsonReportRenderer, CRYPTO_FINAL_FIXED
+from engine.async_fetcher import AsyncFetcher, MAX_ADDRESSES_PER_REQUEST
+from engine.scheduler import PollScheduler
+from engine.ticker_log import TickerLog, DEFAULT_LOG_DIR
+from engine.rollup import OHLCVRollup
+from metrics import metrics
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# DexScreener request budget for DEX_FETCH_MODE=adaptive
+DEX_REQUESTS_PER_MINUTE = float(os.getenv('DEX_REQUESTS_PER_MINUTE', '60'))
+# How often pairs/adaptive modes still pull the trending list to find new pairs
+DEX_DISCOVERY_SECONDS = float(os.getenv('DEX_DISCOVERY_SECONDS', '900'))
+
 class CryptoAnalyzer:
-    def __init__(self):
+    def __init__(self, fetch_mode: str = None, max_tracked_pairs: int = 300, ticker_log_dir: str = DEFAULT_LOG_DIR):
         self.base_url = 'https://api.dexscreener.com/latest'
-        self.min_liquidity = 50000
+        self.min_liquidity = CRYPTO_FINAL_FIXED.filter.min_liquidity
+        # 'trending' pulls the shared list; 'pairs' queries only tracked pair addresses;
+        # 'adaptive' polls each tracked pair on its own cadence, hot pairs first
+        self.fetcher = AsyncFetcher(
+            [f'{self.base_url}/pairs/trending'],
+            fetch_mode=fetch_mode or os.getenv('DEX_FETCH_MODE', 'trending'),
+            max_tracked_pairs=max_tracked_pairs,
+            discovery_interval=DEX_DISCOVERY_SECONDS,
+            scheduler=PollScheduler(requests_per_minute=DEX_REQUESTS_PER_MINUTE, batch_size=MAX_ADDRESSES_PER_REQUEST)
+        )
+        self.pipeline = Pipeline.from_profile(CRYPTO_FINAL_FIXED, fetcher=self.fetcher, renderer=JsonReportRenderer())
+        # Every changed snapshot is appended here; query with `python -m engine.ticker_log AERO --hours 6`
+        self.ticker_log = TickerLog(ticker_log_dir)
+        # 1m/5m/1h/1d candles beside it; `python -m engine.rollup AERO --resolution 1h --days 7`
+        self.rollup = OHLCVRollup(self.ticker_log)
+        self.rollup.catch_up()
         
+    @property
+    def snapshot_changed(self) -> bool:
+        return self.fetcher.snapshot_changed
+    
+    def track_pairs(self, addresses: Iterable[str]):
+        """Add Base pair addresses to the watchlist, evicting the oldest past the cap"""
+        self.fetcher.track_pairs(addresses)
+    
+    def untrack_pairs(self, addresses: Iterable[str]):
+        """Remove pair addresses from the watchlist"""
+        self.fetcher.untrack_pairs(addresses)
+    
+    def watch_pairs(self, addresses: Iterable[str], weight: float = 1.0):
+        """Pairs a subscriber cares about: tracked, and refreshed faster in adaptive mode"""
+        self.fetcher.add_interest(addresses, weight)
+    
+    async def scan_tokens(self, token_addresses: List[str]) -> List[Dict[str, Any]]:
+        """Scan every Base pair of the given token addresses via the per-token endpoint"""
+        pairs = await self.fetcher.fetch_addresses('tokens', token_addresses)
+        return self.filter_opportunities(pairs)
+    
     async def scan_base_pairs(self) -> List[Dict[str, Any]]:
         """Scan Base chain for crypto opportunities"""
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f'{self.base_url}/pairs/trending'
-                async with session.get(url) as response:
-                    data = await response.json()
-                    pairs = data.get('pairs', [])
-                    base_pairs = [p for p in pairs if p.get('chainId') == 'base']
-                    return self.filter_opportunities(base_pairs)
+            _, opportunities, _ = await self.pipeline.run_async()
         except Exception as e:
             logger.error(f'Base scan error: {e}')
             return []
+        self.track_pairs(o['pair_address'] for o in opportunities)
+        return opportunities
     
     def filter_opportunities(self, pairs: List[Dict]) -> List[Dict[str, Any]]:
         """Filter and score crypto opportunities"""
-        opportunities = []
-        
-        for pair in pairs:
-            try:
-                if not self.is_valid_pair(pair):
-                    continue
-                    
-                liquidity = float(pair['liquidity']['usd'])
-                volume_24h = float(pair['volume']['h24'])
-                change_24h = float(pair['priceChange']['h24'])
-                
-                # Focus on significant movers with good volume
-                if abs(change_24h) > 5 and volume_24h > 10000:
-                    risk_score = self.calculate_risk_score(pair)
-                    
-                    opportunities.append({
-                        'token': pair['baseToken']['symbol'],
-                        'name': pair['baseToken'].get('name', ''),
-                        'price': float(pair['priceUsd']),
-                        'volume_24h': volume_24h,
-                        'liquidity': liquidity,
-                        'change_24h': change_24h,
-                        'risk_score': risk_score,
-                        'risk_level': self.get_risk_level(risk_score),
-                        'pair_address': pair.get('pairAddress', ''),
-                        'created_at': str(datetime.utcnow())
-                    })
-            except Exception as e:
-                logger.debug(f'Skipping invalid pair: {e}')
-                continue
-                
-        return sorted(opportunities, key=lambda x: abs(x['change_24h']), reverse=True)[:20]
+        opportunities = self.pipeline.analyze(pairs)
+        self.track_pairs(o['pair_address'] for o in opportunities)
+        return opportunities
     
     def is_valid_pair(self, pair: Dict) -> bool:
         """Validate if pair meets basic criteria"""
-        try:
-            if pair.get('chainId') != 'base':
-                return False
-            if 'liquidity' not in pair or 'usd' not in pair['liquidity']:
-                return False
-            liquidity = float(pair['liquidity']['usd'])
-            return liquidity >= self.min_liquidity
-        except (KeyError, ValueError, TypeError):
-            return False
+        record = self.pipeline.parser.parse_one(pair)
+        return (record is not None and pair.get('chainId') == 'base'
+                and record['liquidity'] >= self.min_liquidity)
     
     def calculate_risk_score(self, pair: Dict) -> int:
         """Calculate risk score 1-10 based on multiple factors"""
-        try:
-            score = 3  # Base score
-            
-            # Liquidity risk
-            liquidity = float(pair['liquidity']['usd'])
-            if liquidity < 100000:
-                score += 3
-            elif liquidity < 500000:
-                score += 2
-            elif liquidity < 1000000:
-                score += 1
-                
-            # Volatility risk
-            change_24h = abs(float(pair['priceChange']['h24']))
-            if change_24h > 500:
-                score += 4
-            elif change_24h > 200:
-                score += 3
-            elif change_24h > 100:
-                score += 2
-            elif change_24h > 50:
-                score += 1
-                
-            # Volume risk
-            volume_24h = float(pair['volume']['h24'])
-            if volume_24h < 50000:
-                score += 2
-            elif volume_24h < 100000:
-                score += 1
-                
-            return min(score, 10)
-        except:
+        record = self.pipeline.parser.parse_one(pair)
+        if record is None:
             return 8
+        return self.pipeline.scorer.score(record['liquidity'], record['volume_24h'], abs(record['change_24h']))
     
     def get_risk_level(self, score: int) -> str:
         """Convert risk score to human-readable level"""
-        if score <= 3:
-            return "Low"
-        elif score <= 5:
-            return "Medium"
-        elif score <= 7:
-            return "High"
-        else:
-            return "Extreme"
+        return CRYPTO_FINAL_FIXED.risk_model.risk_level(score)
+    
+    def log_snapshot(self) -> int:
+        """Append every parsed ticker of the current snapshot to the ticker log and roll it into candles"""
+        result = self.pipeline.last_result
+        if result is None or self.fetcher.data_source != 'live':
+            return 0
+        records = self.pipeline.snapshot_records()
+        logged = self.ticker_log.append(records, timestamp=self.fetcher.snapshot_time)
+        self.rollup.add(records, self.fetcher.snapshot_time)
+        return logged
     
     async def run_analysis(self) -> Dict[str, Any]:
         """Run complete analysis and return results"""
         logger.info('🔍 Starting Base chain crypto analysis...')
         
         opportunities = await self.scan_base_pairs()
+        if self.snapshot_changed:
+            logged = await asyncio.to_thread(self.log_snapshot)
+            logger.info(f'🗄️  Logged {logged} tickers to {self.ticker_log.directory}')
+        
+        if opportunities and not self.snapshot_changed:
+            metrics.inc('skipped_reports')
+            logger.info('ℹ️  DexScreener snapshot unchanged, skipping report')
+            return {'timestamp': str(datetime.utcnow()), 'opportunities': opportunities,
+                    'total_found': len(opportunities), 'unchanged': True}
         
         if opportunities:
-            report = {
-                'timestamp': str(datetime.utcnow()),
-                'opportunities': opportunities,
-                'total_found': len(opportunities),
-                'summary': {
-                    'low_risk': len([o for o in opportunities if o['risk_score'] <= 3]),
-                    'medium_risk': len([o for o in opportunities if 3 < o['risk_score'] <= 5]),
-                    'high_risk': len([o for o in opportunities if o['risk_score'] > 5])
-                }
-            }
-            
-            # Save report
-            reports_dir = '/tmp/crypto-reports'
-            os.makedirs(reports_dir, exist_ok=True)
-            filename = f"{reports_dir}/analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, 'w') as f:
-                json.dump(report, f, indent=2, default=str)
-            
+            report = self.pipeline.last_result.report
             logger.info(f'✅ Analysis complete. Found {len(opportunities)} opportunities')
             return report
         else:
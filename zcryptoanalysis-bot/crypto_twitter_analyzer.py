@@ -12,26 +12,38 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import re
 
+from token_index import TokenIndex
+from mention_velocity import MentionVelocity
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Recent search rejects longer queries
+MAX_QUERY_LENGTH = 512
+QUERY_SUFFIX = ' -is:retweet lang:en'
+# Used until the first scan fills the token index
+CHAIN_TERMS = [
+    'base chain', 'base crypto', 'base token', 'base launch',
+    'new listing base', 'base dex', 'base trading'
+]
+
 class TwitterAnalyzer:
-    def __init__(self, bearer_token: str):
+    def __init__(self, bearer_token: str, token_index: TokenIndex = None, velocity: MentionVelocity = None):
         self.bearer_token = bearer_token
         self.base_url = 'https://api.twitter.com/2'
         self.small_account_range = (100, 10000)  # 100-10k followers
+        self.token_index = token_index or TokenIndex()
+        self.velocity = velocity or MentionVelocity()
+
+    def update_token_universe(self, tickers: List[Dict]) -> Dict[str, int]:
+        """Refresh the mention index from the latest DexScreener scan"""
+        return self.token_index.update(tickers)
         
     async def search_crypto_tweets(self, keywords: List[str], max_results: int = 100) -> List[Dict[str, Any]]:
         """Search for crypto tweets from small accounts"""
         headers = {'Authorization': f'Bearer {self.bearer_token}'}
         
-        # Build query for Base chain crypto mentions
-        query_terms = [
-            'base chain', 'base crypto', 'base token', 'base launch',
-            'new listing base', 'base dex', 'base trading'
-        ]
-        query = ' OR '.join(f'"{term}"' for term in query_terms)
-        query += ' -is:retweet lang:en'
+        query = self.build_query()
         
         url = f'{self.base_url}/tweets/search/recent'
         params = {
@@ -55,6 +67,20 @@ class TwitterAnalyzer:
             logger.error(f'Twitter search error: {e}')
             return []
     
+    def build_query(self) -> str:
+        """Cashtags of the tracked tokens, as many as fit; generic Base phrases before the first scan"""
+        terms = []
+        length = len(QUERY_SUFFIX) + 2
+        for symbol in self.token_index.cashtags():
+            term = f'${symbol}'
+            if length + len(term) + 4 > MAX_QUERY_LENGTH:
+                break
+            terms.append(term)
+            length += len(term) + 4
+        if not terms:
+            terms = [f'"{term}"' for term in CHAIN_TERMS]
+        return f"({' OR '.join(terms)}){QUERY_SUFFIX}"
+    
     def filter_small_accounts(self, data: Dict) -> List[Dict[str, Any]]:
         """Filter tweets from small crypto accounts"""
         tweets = []
@@ -69,6 +95,9 @@ class TwitterAnalyzer:
                 if self.small_account_range[0] <= followers <= self.small_account_range[1]:
                     sentiment = self.analyze_sentiment(tweet.get('text', ''))
                     urgency = self.detect_urgency(tweet.get('text', ''))
+                    mentions = self.token_index.extract_mentions(tweet.get('text', ''))
+                    if mentions:
+                        self.velocity.observe_tweet(tweet['id'], mentions, ts=self.tweet_timestamp(tweet))
                     
                     tweets.append({
                         'id': tweet['id'],
@@ -78,11 +107,19 @@ class TwitterAnalyzer:
                         'created_at': tweet['created_at'],
                         'sentiment': sentiment,
                         'urgency_score': urgency,
+                        'mentions': mentions,
                         'verified': user.get('verified', False)
                     })
         
         return tweets
     
+    def tweet_timestamp(self, tweet: Dict) -> float:
+        """Epoch seconds for a tweet's created_at, falling back to now"""
+        try:
+            return datetime.fromisoformat(tweet['created_at'].replace('Z', '+00:00')).timestamp()
+        except (KeyError, ValueError, AttributeError):
+            return datetime.now().timestamp()
+    
     def analyze_sentiment(self, text: str) -> str:
         """Simple sentiment analysis"""
         bullish_words = ['buy', 'moon', 'gem', 'rocket', 'pump', 'bullish', 'alpha']
@@ -0,0 +1,30 @@
+"""
+Shared scan engine for every Zcryptoanalysis entry point
+
+Stages are plain objects composed by Pipeline; fetchers live in
+engine.fetcher (requests) and engine.async_fetcher (aiohttp) so the
+rest of the engine imports without network dependencies.
+"""
+
+from .parser import TickerParser
+from .scorer import ThresholdFilter, RiskModel, ScalarScorer, ColumnScorer
+from .ranker import ChangeRanker
+from .renderer import TelegramRenderer, ListRenderer, CompactRenderer, ConsoleRenderer, JsonReportRenderer
+from .pipeline import Pipeline, ScanResult
+from .profiles import (Profile, PRODUCTION, ZCRYPTO, TELEGRAM, WORKING, CRYPTO_FINAL, CRYPTO_FINAL_FIXED,
+                       SOLANA, ETHEREUM, ARBITRUM, CHAIN_PROFILES, CHAIN_LABELS, CHAIN_ALIASES)
+from .multichain import MultiChainScanner
+from .lookup import PairLookup, PrefixIndex
+from .indicators import IndicatorTracker
+from .drain_detector import LiquidityDrainDetector
+from .aggregator import PairAggregator
+from .scheduler import PollScheduler
+
+__all__ = [
+    'TickerParser', 'ThresholdFilter', 'RiskModel', 'ScalarScorer', 'ColumnScorer', 'ChangeRanker',
+    'TelegramRenderer', 'ListRenderer', 'CompactRenderer', 'ConsoleRenderer', 'JsonReportRenderer',
+    'Pipeline', 'ScanResult', 'MultiChainScanner', 'PairLookup', 'PrefixIndex', 'IndicatorTracker',
+    'LiquidityDrainDetector', 'PairAggregator', 'PollScheduler', 'Profile',
+    'PRODUCTION', 'ZCRYPTO', 'TELEGRAM', 'WORKING', 'CRYPTO_FINAL', 'CRYPTO_FINAL_FIXED',
+    'SOLANA', 'ETHEREUM', 'ARBITRUM', 'CHAIN_PROFILES', 'CHAIN_LABELS', 'CHAIN_ALIASES'
+]
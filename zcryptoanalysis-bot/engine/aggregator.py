@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Group-by stage: pairs of the same base token folded together in one hash
+pass, with liquidity-weighted price, total volume and the widest price
+spread between pools (an arbitrage signal when it is large enough)
+"""
+
+from typing import List, Dict, Any
+
+from .ticker_log import token_key
+
+GROUP_FIELDS = ('pairs', 'weighted_price', 'total_volume', 'spread', 'arbitrage')
+
+
+class PairAggregator:
+    def __init__(self, spread_threshold: float = 2.0, min_pair_liquidity: float = 10000):
+        # Spread in percent of the cheaper pool; pools thinner than min_pair_liquidity
+        # cannot be traded against without eating the whole difference in slippage
+        self.spread_threshold = spread_threshold
+        self.min_pair_liquidity = min_pair_liquidity
+
+    def annotate(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add each record's token-level aggregates, grouped by base token address"""
+        # key -> [pairs, liquidity, price * liquidity, volume, min price, max price]
+        groups: Dict[str, list] = {}
+        keys = []
+        min_liquidity = self.min_pair_liquidity
+        for record in records:
+            key = token_key(record)
+            keys.append(key)
+            price, liquidity = record['price'], record['liquidity']
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = [0, 0.0, 0.0, 0.0, float('inf'), 0.0]
+            group[0] += 1
+            group[1] += liquidity
+            group[2] += price * liquidity
+            group[3] += record['volume_24h']
+            if liquidity >= min_liquidity and price > 0:
+                if price < group[4]:
+                    group[4] = price
+                if price > group[5]:
+                    group[5] = price
+
+        stats = {}
+        for key, (pairs, liquidity, weighted, volume, low, high) in groups.items():
+            spread = (high - low) / low * 100 if high > low else 0.0
+            stats[key] = {
+                'pairs': pairs,
+                'weighted_price': weighted / liquidity if liquidity else None,
+                'total_volume': volume,
+                'spread': spread,
+                'arbitrage': spread >= self.spread_threshold
+            }
+        for record, key in zip(records, keys):
+            record.update(stats[key])
+        return records
+
+    def dedupe(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One record per token: its deepest pool among those given"""
+        best: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            key = token_key(record)
+            current = best.get(key)
+            if current is None or record['liquidity'] > current['liquidity']:
+                best[key] = record
+        return list(best.values())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Async fetcher stage over aiohttp, with tracked-pair modes that query
+only the pairs we watch, on any chain
+"""
+
+import asyncio
+import time
+from typing import List, Dict, Any, Iterable, Tuple
+
+import aiohttp
+
+from metrics import metrics
+
+from circuit_breaker import CircuitBreaker
+
+from .fetcher import SnapshotFetcher, DEFAULT_HEADERS, payload_rows
+from .decoder import loads
+from .scheduler import PollScheduler
+
+DEXSCREENER_URL = 'https://api.dexscreener.com/latest'
+
+# DexScreener accepts up to 30 comma-separated addresses per pairs/tokens request
+MAX_ADDRESSES_PER_REQUEST = 30
+
+# Stands in for a body hash on snapshots assembled from pair lookups, so the
+# fallback can serve them; never equal to a real body's sha256
+TRACKED_ROWS = 'tracked-pairs'
+
+
+class AsyncFetcher(SnapshotFetcher):
+    def __init__(self, endpoints: List[str] = None, key: str = 'pairs', chain: str = 'base',
+                 fetch_mode: str = 'trending', max_tracked_pairs: int = 300, scheduler: PollScheduler = None,
+                 discovery_interval: float = 900, **kwargs):
+        super().__init__(endpoints or [f'{DEXSCREENER_URL}/pairs/trending'], key=key, **kwargs)
+        self.chain = chain
+        # 'trending' pulls the shared list; 'pairs' queries every tracked pair address each time;
+        # 'adaptive' queries only the tracked pairs the scheduler says are due
+        self.fetch_mode = fetch_mode
+        self.max_tracked_pairs = max_tracked_pairs
+        # pair address -> chain id, least recently tracked first
+        self.tracked_pairs: Dict[str, str] = {}
+        self.scheduler = scheduler or PollScheduler(batch_size=MAX_ADDRESSES_PER_REQUEST)
+        # Latest row per tracked pair; adaptive mode refreshes it piecemeal
+        self.pair_rows: Dict[str, Dict] = {}
+        # Pairs/adaptive modes still pull the trending list this often, so new pairs can be tracked
+        self.discovery_interval = discovery_interval
+        self.discovered_at = None
+        # Rows of the last trending pull; untracked pairs among them stay in every snapshot until
+        # the next pull replaces them, so they keep their last known values in between
+        self.discovered: List[Dict] = []
+
+    def track_pairs(self, addresses: Iterable[str], chain: str = None):
+        """Add pair addresses on a chain (default: the fetcher's) to the watchlist, evicting the oldest past the cap"""
+        chain = chain or self.chain
+        for address in addresses:
+            if not address:
+                continue
+            self.tracked_pairs.pop(address, None)
+            self.tracked_pairs[address] = chain
+        evicted = []
+        while len(self.tracked_pairs) > self.max_tracked_pairs:
+            evicted.append(next(iter(self.tracked_pairs)))
+            del self.tracked_pairs[evicted[-1]]
+        if self.fetch_mode == 'adaptive':
+            self.scheduler.untrack(evicted)
+            for address in evicted:
+                self.pair_rows.pop(address, None)
+            self.scheduler.track(self.tracked_pairs)
+
+    def untrack_pairs(self, addresses: Iterable[str]):
+        """Remove pair addresses from the watchlist"""
+        addresses = list(addresses)
+        for address in addresses:
+            self.tracked_pairs.pop(address, None)
+            self.pair_rows.pop(address, None)
+        self.scheduler.untrack(addresses)
+
+    def add_interest(self, addresses: Iterable[str], weight: float = 1.0, chain: str = None):
+        """Subscribers watching pairs (addresses, or address -> weight): track them, and in adaptive mode poll them faster"""
+        weights = addresses if isinstance(addresses, dict) else dict.fromkeys(addresses, weight)
+        weights = {address: weight for address, weight in weights.items() if address}
+        self.track_pairs(weights, chain)
+        for address, weight in weights.items():
+            self.scheduler.add_interest(address, weight)
+
+    async def fetch(self) -> List[Dict]:
+        """Latest rows: tracked pairs when in pairs/adaptive mode, else the first healthy endpoint"""
+        if self.fetch_mode in ('pairs', 'adaptive') and self.tracked_pairs:
+            if self.fetch_mode == 'adaptive':
+                rows = await self.fetch_due()
+            else:
+                rows, failed = await self.fetch_tracked(list(self.tracked_pairs))
+                if len(failed) == len(self.tracked_pairs):
+                    rows = self.fallback_snapshot()
+                else:
+                    self.pair_rows = {row.get('pairAddress'): row for row in rows}
+                    rows = self.tracked_snapshot(changed=True)
+            if self.data_source == 'live' and self.discovery_due() and await self.discover():
+                rows = self.tracked_snapshot(changed=True)
+            return rows
+
+        self.discovered_at = time.monotonic()
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, timeout=timeout) as session:
+            for endpoint in self.endpoints:
+                if not self.breakers[endpoint].allow_request():
+                    continue
+                try:
+                    metrics.inc('api_requests')
+                    with metrics.span('fetch'):
+                        async with session.get(endpoint, headers=self.conditional_headers(endpoint)) as response:
+                            body = await response.read()
+                            status, headers = response.status, response.headers
+                    rows = self.accept_response(endpoint, status, headers, body)
+                except Exception:
+                    self.record_error(endpoint)
+                    continue
+                finally:
+                    # Also on cancellation, so a half-open probe never stays in flight
+                    self.breakers[endpoint].release_probe()
+                if rows is not None:
+                    if self.fetch_mode != 'trending':
+                        # Nothing tracked yet: this pull seeds the pairs/adaptive snapshots
+                        self.discovered = rows
+                    return rows
+
+        return self.fallback_snapshot()
+
+    async def fetch_due(self) -> List[Dict]:
+        """Refresh only the pairs whose cadence is up, within the request budget"""
+        due = self.scheduler.due()
+        metrics.set_gauge('scheduler_due_pairs', len(due))
+        rows, failed = await self.fetch_tracked(due) if due else ([], [])
+        if failed:
+            # Retried shortly rather than pushed back a whole cadence
+            self.scheduler.retry(failed)
+        if due and len(failed) == len(due):
+            # Nothing came back: the last snapshot is served as cache
+            return self.fallback_snapshot()
+        failed = set(failed)
+        self.scheduler.observe(rows, [address for address in due if address not in failed])
+        for row in rows:
+            self.pair_rows[row.get('pairAddress')] = row
+        return self.tracked_snapshot(changed=bool(rows))
+
+    def discovery_due(self) -> bool:
+        return self.discovered_at is None or time.monotonic() - self.discovered_at >= self.discovery_interval
+
+    async def discover(self) -> bool:
+        """Pull the trending list for the tracked-pairs snapshots, so newly trending pairs can be tracked"""
+        self.discovered_at = time.monotonic()
+        endpoint = self.endpoints[0]
+        if not self.breakers[endpoint].allow_request():
+            return False
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        try:
+            metrics.inc('api_requests')
+            async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, timeout=timeout) as session:
+                with metrics.span('fetch'):
+                    async with session.get(endpoint) as response:
+                        response.raise_for_status()
+                        trending = payload_rows(loads(await response.read()), self.key)
+        except Exception:
+            self.record_error(endpoint)
+            return False
+        finally:
+            self.breakers[endpoint].release_probe()
+        self.breakers[endpoint].record_success()
+        metrics.inc('discoveries')
+        self.discovered = trending
+        return True
+
+    def tracked_snapshot(self, changed: bool) -> List[Dict]:
+        """Adopt the tracked pairs' rows, plus discovered pairs not tracked yet, as the live snapshot"""
+        rows = list(self.pair_rows.values())
+        # Tracked rows are at least as fresh; discovery only adds the pairs we do not track yet
+        tracked = self.pair_rows.keys()
+        self.cached_rows = [row for row in self.discovered if row.get('pairAddress') not in tracked] + rows
+        self.body_hash = TRACKED_ROWS
+        # The trending validators describe a body we no longer hold
+        self.validators.clear()
+        return self.live_snapshot(changed)
+
+    def export_state(self) -> Dict[str, Any]:
+        """Snapshot, validators and the watchlist, for persisting across restarts"""
+        state = super().export_state()
+        state['tracked_pairs'] = dict(self.tracked_pairs)
+        return state
+
+    def restore_state(self, state: Dict[str, Any]):
+        """Adopt a persisted snapshot and watchlist; every restored pair is due for a poll"""
+        super().restore_state(state)
+        self.tracked_pairs.update(state.get('tracked_pairs') or {})
+        self.track_pairs(())
+        # Restored rows stand in for each pair until it is polled or rediscovered
+        self.pair_rows = {row.get('pairAddress'): row for row in self.cached_rows
+                          if row.get('pairAddress') in self.tracked_pairs}
+        self.discovered = [row for row in self.cached_rows if row.get('pairAddress') not in self.tracked_pairs]
+
+    async def fetch_tracked(self, addresses: List[str]) -> Tuple[List[Dict], List[str]]:
+        """fetch_batches for tracked pairs, one pairs/<chain> lookup per chain, concurrently"""
+        by_chain: Dict[str, List[str]] = {}
+        for address in addresses:
+            by_chain.setdefault(self.tracked_pairs.get(address, self.chain), []).append(address)
+        results = await asyncio.gather(*(self.fetch_batches(f'pairs/{chain}', chain_addresses)
+                                         for chain, chain_addresses in by_chain.items()))
+        rows, failed = [], []
+        for chain_rows, chain_failed in results:
+            rows.extend(chain_rows)
+            failed.extend(chain_failed)
+        return rows, failed
+
+    def breaker(self, path: str) -> CircuitBreaker:
+        """Circuit breaker for a pairs/tokens lookup path"""
+        url = f'{DEXSCREENER_URL}/dex/{path}'
+        if url not in self.breakers:
+            self.breakers[url] = CircuitBreaker()
+        return self.breakers[url]
+
+    async def fetch_batch(self, session: aiohttp.ClientSession, path: str, addresses: List[str]) -> List[Dict]:
+        """Fetch one batch of addresses from a pairs/tokens endpoint"""
+        url = f"{DEXSCREENER_URL}/dex/{path}/{','.join(addresses)}"
+        metrics.inc('api_requests')
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return payload_rows(loads(await response.read()), 'pairs')
+
+    async def fetch_batches(self, path: str, addresses: List[str]) -> Tuple[List[Dict], List[str]]:
+        """Fetch all addresses in max-size batches, concurrently; (rows, addresses of the failed batches)"""
+        if not addresses:
+            return [], []
+        breaker = self.breaker(path)
+        if not breaker.allow_request():
+            return [], list(addresses)
+
+        batches = [addresses[i:i + MAX_ADDRESSES_PER_REQUEST]
+                   for i in range(0, len(addresses), MAX_ADDRESSES_PER_REQUEST)]
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        try:
+            async with aiohttp.ClientSession(headers=DEFAULT_HEADERS, timeout=timeout) as session:
+                with metrics.span('fetch'):
+                    results = await asyncio.gather(*[self.fetch_batch(session, path, batch) for batch in batches],
+                                                   return_exceptions=True)
+        except Exception as exc:
+            results = [exc] * len(batches)
+        finally:
+            breaker.release_probe()
+
+        rows, failed = [], []
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                metrics.inc('api_errors')
+                failed.extend(batch)
+                continue
+            rows.extend(result)
+        if len(failed) == len(addresses):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return rows, failed
+
+    async def fetch_addresses(self, path: str, addresses: List[str]) -> List[Dict]:
+        """Fetch all addresses in max-size batches, concurrently"""
+        rows, _ = await self.fetch_batches(path, addresses)
+        return rows
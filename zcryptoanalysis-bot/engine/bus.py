@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Snapshot bus over a local Unix socket: one scanner process publishes scored
+snapshots, any number of Telegram workers subscribe and only render/reply
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Each message is a 4-byte big-endian length followed by a JSON snapshot
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+# Subscribers that fall this far behind are dropped rather than buffered forever
+MAX_PENDING_BYTES = 16 * 1024 * 1024
+
+
+def encode_frame(snapshot: Dict[str, Any]) -> bytes:
+    """Length-prefixed JSON frame for one snapshot"""
+    body = json.dumps(snapshot, separators=(',', ':'), default=str).encode()
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """Next snapshot from the stream; raises IncompleteReadError at EOF"""
+    (size,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f'snapshot frame too large: {size} bytes')
+    return json.loads(await reader.readexactly(size))
+
+
+class SnapshotPublisher:
+    """Scanner side: keeps the latest snapshot and pushes every new one to all subscribers"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = 0
+        self.latest_frame: Optional[bytes] = None
+        self.subscribers = set()
+        self.server = None
+
+    async def start(self):
+        """Listen on the socket path, replacing a stale socket left by a crashed scanner"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self.handle_subscriber, path=self.path)
+        os.chmod(self.path, 0o660)
+
+    async def handle_subscriber(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Send the current snapshot, then keep the connection until the worker goes away"""
+        self.subscribers.add(writer)
+        metrics.set_gauge('bus_subscribers', len(self.subscribers))
+        try:
+            if self.latest_frame is not None:
+                writer.write(self.latest_frame)
+                await writer.drain()
+            await reader.read()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            metrics.set_gauge('bus_subscribers', len(self.subscribers))
+            writer.close()
+
+    def next_version(self) -> int:
+        """Strictly increasing, and wall-clock based so a restarted scanner keeps moving forward"""
+        self.version = max(self.version + 1, time.time_ns() // 1000)
+        return self.version
+
+    def publish(self, snapshot: Dict[str, Any]) -> int:
+        """Stamp the snapshot with a new version and fan it out; returns the version"""
+        snapshot = dict(snapshot, version=self.next_version(), published_at=time.time())
+        self.latest_frame = encode_frame(snapshot)
+        metrics.inc('bus_published')
+        metrics.set_gauge('bus_frame_bytes', len(self.latest_frame))
+
+        for writer in list(self.subscribers):
+            if writer.transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+                metrics.inc('bus_dropped_subscribers')
+                self.subscribers.discard(writer)
+                writer.close()
+                continue
+            writer.write(self.latest_frame)
+        return snapshot['version']
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for writer in list(self.subscribers):
+            writer.close()
+
+
+class SnapshotSubscriber:
+    """Worker side: follows the scanner, only ever moving to newer snapshot versions"""
+
+    def __init__(self, path: str, on_snapshot: Callable[[Dict[str, Any]], None] = None,
+                 max_backoff: float = 10):
+        self.path = path
+        self.on_snapshot = on_snapshot
+        self.max_backoff = max_backoff
+        self.latest: Optional[Dict[str, Any]] = None
+        self.version = 0
+        self.connected = False
+
+    def accept(self, snapshot: Dict[str, Any]) -> bool:
+        """Adopt a snapshot unless its version or its data is older than what we already have"""
+        version = snapshot.get('version', 0)
+        # A restarted scanner may republish a restored copy; never step back in data time either
+        data_time = snapshot.get('snapshot_time') or 0
+        current_time = (self.latest or {}).get('snapshot_time') or 0
+        if version <= self.version or data_time < current_time:
+            metrics.inc('bus_stale_snapshots')
+            return False
+        self.version = version
+        self.latest = snapshot
+        metrics.inc('bus_received')
+        if self.on_snapshot is not None:
+            self.on_snapshot(snapshot)
+        return True
+
+    def render(self, chain: str, render: Callable[[List[Dict[str, Any]]], Any]) -> Optional[Tuple[int, Any]]:
+        """(version, render(opportunities)) for one chain of the latest snapshot"""
+        snapshot = self.latest
+        if snapshot is None:
+            return None
+        return snapshot['version'], render(snapshot['chains'].get(chain) or [])
+
+    async def run(self):
+        """Stay subscribed forever, reconnecting with backoff when the scanner restarts"""
+        backoff = 0.5
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except OSError:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            self.connected = True
+            backoff = 0.5
+            try:
+                while True:
+                    self.accept(await read_frame(reader))
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+                if not isinstance(e, asyncio.IncompleteReadError):
+                    logger.warning(f'Snapshot bus error: {e}')
+            finally:
+                self.connected = False
+                writer.close()
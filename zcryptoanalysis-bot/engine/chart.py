@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Price and liquidity charts from the OHLCV rollups, rendered headless with
+matplotlib's Agg backend in a process pool so the event loop never blocks
+PNGs are cached per token and that token's newest candle; once Telegram has
+the image, its file_id is resent instead of the bytes
+"""
+
+import asyncio
+import importlib.util
+import io
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence
+
+from metrics import metrics
+
+from .rollup import OHLCVRollup
+
+# matplotlib is only imported inside the render workers
+CHARTS_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
+
+
+def warm_worker():
+    """Pay matplotlib's import once per worker, not on the first chart"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: F401
+
+
+def render_chart(title: str, times: Sequence[float], closes: Sequence[float],
+                 liquidity: Sequence[float]) -> bytes:
+    """PNG of close price over pool liquidity (runs in a worker process)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    # Figure objects, not pyplot: no global state shared between renders
+    figure = Figure(figsize=(8, 4.5), dpi=100)
+    FigureCanvasAgg(figure)
+    price_axis, liquidity_axis = figure.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': (3, 1)})
+    x = [datetime.fromtimestamp(t, timezone.utc) for t in times]
+    rising = closes[-1] >= closes[0]
+
+    price_axis.plot(x, closes, color='#16a34a' if rising else '#dc2626', linewidth=1.5)
+    price_axis.set_title(title, loc='left', fontsize=11)
+    price_axis.set_ylabel('Price (USD)')
+    price_axis.grid(alpha=0.3)
+    liquidity_axis.fill_between(x, liquidity, color='#2563eb', alpha=0.35, linewidth=0)
+    liquidity_axis.set_ylabel('Liquidity')
+    liquidity_axis.grid(alpha=0.3)
+    figure.autofmt_xdate()
+    figure.tight_layout()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+class Chart:
+    """A rendered chart: PNG bytes until Telegram has stored it, its file_id after"""
+    __slots__ = ('key', 'png', 'file_id', 'points')
+
+    def __init__(self, key: tuple, png: bytes, points: int):
+        self.key = key
+        self.png = png
+        self.file_id = None
+        self.points = points
+
+    @property
+    def photo(self):
+        """What to pass to send_photo"""
+        return self.file_id or self.png
+
+    def uploaded(self, file_id: str):
+        """Telegram has the image; later sends reference it and the bytes can go"""
+        self.file_id = file_id
+        self.png = None
+
+
+class ChartService:
+    def __init__(self, rollup: OHLCVRollup, workers: int = 2, cache_size: int = 128,
+                 resolution: str = '5m', hours: float = 24):
+        self.rollup = rollup
+        self.workers = workers
+        self.cache_size = cache_size
+        self.resolution = resolution
+        self.hours = hours
+        self.pool = None
+        # (token key, token version) -> Chart, least recently used first
+        self.cache: OrderedDict = OrderedDict()
+        # token key -> its newest cache key, so superseded versions are dropped right away
+        self.latest: Dict[str, tuple] = {}
+        # Renders in flight; concurrent requests for the same chart share one
+        self.pending: Dict[tuple, asyncio.Future] = {}
+
+    def executor(self) -> ProcessPoolExecutor:
+        """Render pool, started on the first chart request"""
+        if self.pool is None:
+            # spawn: forking a process that runs threads and an event loop is unsafe
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=warm_worker)
+        return self.pool
+
+    async def chart(self, token: str, title: str) -> Optional[Chart]:
+        """Chart for a token key, from cache when its candles have not changed; None without enough history"""
+        # Off the loop: the rollup lock may be held by a write or compaction
+        key = (token, await asyncio.to_thread(self.rollup.token_version, token, self.resolution))
+        chart = self.cache.get(key)
+        if chart is not None:
+            metrics.inc('chart_cache_hits')
+            self.cache.move_to_end(key)
+            return chart
+
+        future = self.pending.get(key)
+        if future is None:
+            metrics.inc('chart_cache_misses')
+            future = self.pending[key] = asyncio.ensure_future(self.render(key, title))
+            future.add_done_callback(lambda _: self.pending.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def render(self, key: tuple, title: str) -> Optional[Chart]:
+        token = key[0]
+        # A copy made under the rollup lock; the pool never sees candles that are still changing
+        candles = await asyncio.to_thread(self.rollup.candles, token, self.resolution,
+                                          time.time() - self.hours * 3600)
+        if len(candles) < 2:
+            return None
+        loop = asyncio.get_running_loop()
+        with metrics.span('chart_render'):
+            png = await loop.run_in_executor(self.executor(), render_chart, title,
+                                             [c['timestamp'] for c in candles], [c['close'] for c in candles],
+                                             [c['liquidity'] for c in candles])
+        chart = Chart(key, png, len(candles))
+        self.store(token, chart)
+        return chart
+
+    def store(self, token: str, chart: Chart):
+        previous = self.latest.get(token)
+        if previous is not None and previous != chart.key:
+            self.cache.pop(previous, None)
+        self.latest[token] = chart.key
+        self.cache[chart.key] = chart
+        while len(self.cache) > self.cache_size:
+            evicted, _ = self.cache.popitem(last=False)
+            if self.latest.get(evicted[0]) == evicted:
+                del self.latest[evicted[0]]
+        metrics.set_gauge('chart_cache_size', len(self.cache))
+
+    def stats(self) -> Dict[str, int]:
+        return {'cached': len(self.cache), 'rendering': len(self.pending),
+                'uploaded': sum(1 for chart in self.cache.values() if chart.file_id)}
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Schema-aware decoding of DexScreener payloads into the pipeline's flat records
+Numeric strings are converted once, at decode time; orjson is used when it
+is installed, stdlib json otherwise
+"""
+
+import json
+from typing import Dict, Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def loads(body: bytes) -> Any:
+    """Decode a JSON body with the fastest available backend"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def decode_record(row: Dict, legacy_fields: bool = False) -> Optional[Dict[str, Any]]:
+    """Flat record the pipeline stages annotate, every field converted once; None for a malformed row"""
+    try:
+        base = row['baseToken']
+        token = base['symbol']
+        price = float(row['priceUsd'])
+        # Nested objects are read in place; a missing one costs a None check, not a throwaway dict
+        liquidity = row.get('liquidity')
+        liquidity = float(liquidity.get('usd', 0)) if liquidity else 0.0
+        volume = row.get('volume')
+        volume = float(volume.get('h24', 0)) if volume else 0.0
+        change = row.get('priceChange')
+        change = float(change.get('h24', 0)) if change else 0.0
+
+        if legacy_fields:
+            # Older payloads used flat liquidityUsd / volume24h / priceChange24h fields
+            liquidity = liquidity or float(row.get('liquidityUsd', 0))
+            volume = volume or float(row.get('volume24h', 0))
+            change = change or float(row.get('priceChange24h', 0))
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+    return {
+        'token': token,
+        'name': base.get('name') or token,
+        'price': price,
+        'change_24h': change,
+        'liquidity': liquidity,
+        'volume_24h': volume,
+        'pair_address': row.get('pairAddress', ''),
+        'token_address': base.get('address', ''),
+        'chain_id': row.get('chainId', '')
+    }
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Liquidity-drain (rug pull) detector: compares every pair's pool liquidity
+with the previous snapshot over parallel arrays, so a pulled pool is flagged
+on the first poll after it happens; the diff is one vectorized numpy pass
+when numpy is installed, a single Python loop over the records otherwise
+"""
+
+import math
+import time
+from array import array
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .ticker_log import token_key
+
+# (position in the snapshot, previous liquidity, drop %, price move %, price spike)
+Flag = Tuple[int, float, float, float, bool]
+
+
+class LiquidityDrainDetector:
+    """Previous liquidity and price per pair in parallel arrays, diffed against each new snapshot"""
+
+    def __init__(self, drop_percent: float = 30, spike_drop_percent: float = 15, spike_percent: float = 20,
+                 min_liquidity: float = 10000, max_gap: float = 900, cooldown: float = 1800,
+                 evict_after: int = 120):
+        # Alert on a drop of drop_percent, or of spike_drop_percent while price rose spike_percent
+        self.drop_percent = drop_percent
+        self.spike_drop_percent = spike_drop_percent
+        self.spike_percent = spike_percent
+        # Dust pools are ignored, and so are comparisons across a gap in the feed (e.g. a restore)
+        self.min_liquidity = min_liquidity
+        self.max_gap = max_gap
+        self.cooldown = cooldown
+        # Pairs missing from this many snapshots give their slot back
+        self.evict_after = evict_after
+
+        self.slots: Dict[str, int] = {}
+        # slot -> pair key, None while the slot is on the free list
+        self.keys: List[Optional[str]] = []
+        self.free: List[int] = []
+        self.liquidity = array('d')
+        self.price = array('d')
+        self.seen = array('d')
+        self.alerted = array('d')
+        # Number of the last snapshot each slot's pair appeared in
+        self.snapshot = array('Q')
+        self.snapshots = 0
+        self.last_update = None
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def slot(self, record: Dict[str, Any]) -> int:
+        key = record.get('pair_address') or token_key(record)
+        slot = self.slots.get(key)
+        if slot is not None:
+            return slot
+        if self.free:
+            slot = self.free.pop()
+            self.keys[slot] = key
+        else:
+            slot = len(self.keys)
+            self.keys.append(key)
+            self.liquidity.append(math.nan)
+            self.price.append(math.nan)
+            self.seen.append(0.0)
+            self.alerted.append(0.0)
+            self.snapshot.append(0)
+        self.slots[key] = slot
+        return slot
+
+    def evict(self) -> int:
+        """Free the slots of pairs not seen in evict_after snapshots; returns how many"""
+        oldest = self.snapshots - self.evict_after
+        evicted = 0
+        for slot, key in enumerate(self.keys):
+            if key is None or self.snapshot[slot] > oldest:
+                continue
+            del self.slots[key]
+            self.keys[slot] = None
+            self.liquidity[slot] = self.price[slot] = math.nan
+            self.seen[slot] = self.alerted[slot] = 0.0
+            self.free.append(slot)
+            evicted += 1
+        return evicted
+
+    def observe(self, records: List[Dict[str, Any]], now: float = None) -> List[Dict[str, Any]]:
+        """Alerts for pairs drained since the previous snapshot, then remember this one"""
+        now = time.time() if now is None else now
+        if now == self.last_update:
+            return []
+        self.last_update = now
+        self.snapshots += 1
+        snapshots = self.snapshots
+
+        # Slots are allocated before any array view is taken: arrays cannot grow while numpy holds one
+        slots = array('q', [self.slot(record) for record in records])
+        diff = self.diff_vectorized if numpy is not None else self.diff_records
+        flagged = [(i, records[i], previous, drop, move, spike)
+                   for i, previous, drop, move, spike in diff(records, slots, now, snapshots)]
+
+        # Amortized: one sweep every evict_after snapshots
+        if snapshots % self.evict_after == 0:
+            self.evict()
+
+        alerts = []
+        for i, record, previous, drop, move, spike in flagged:
+            slot = slots[i]
+            if now - self.alerted[slot] < self.cooldown:
+                continue
+            self.alerted[slot] = now
+            alerts.append({
+                'token': record['token'],
+                'name': record['name'],
+                'chain_id': record.get('chain_id', ''),
+                'pair_address': record.get('pair_address', ''),
+                'price': record['price'],
+                'price_change': move,
+                'previous_liquidity': previous,
+                'liquidity': record['liquidity'],
+                'drop_percent': drop,
+                'price_spike': spike,
+                'detected_at': now
+            })
+        alerts.sort(key=lambda a: a['previous_liquidity'] - a['liquidity'], reverse=True)
+        return alerts
+
+    def diff_vectorized(self, records: List[Dict[str, Any]], slots: array, now: float, snapshots: int) -> List[Flag]:
+        """Whole-snapshot diff with numpy over zero-copy views of the state arrays, then the state update"""
+        index = numpy.frombuffer(slots, dtype=numpy.int64)
+        current = numpy.fromiter((record['liquidity'] for record in records), numpy.float64, len(records))
+        current_price = numpy.fromiter((record['price'] for record in records), numpy.float64, len(records))
+        state_liquidity = numpy.frombuffer(self.liquidity)
+        state_price = numpy.frombuffer(self.price)
+        state_seen = numpy.frombuffer(self.seen)
+
+        previous = state_liquidity[index]
+        previous_price = state_price[index]
+        # New pairs carry NaN, so every comparison is False for them
+        eligible = (now - state_seen[index] <= self.max_gap) & (previous >= self.min_liquidity) & (previous > 0)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            drop = (previous - current) / previous * 100
+            move = numpy.where(previous_price > 0, (current_price - previous_price) / previous_price * 100, 0.0)
+        spike = (drop >= self.spike_drop_percent) & (move >= self.spike_percent)
+        hits = numpy.flatnonzero(eligible & ((drop >= self.drop_percent) | spike))
+
+        state_liquidity[index] = current
+        state_price[index] = current_price
+        state_seen[index] = now
+        numpy.frombuffer(self.snapshot, dtype=numpy.uint64)[index] = snapshots
+        return [(int(i), float(previous[i]), float(drop[i]), float(move[i]), bool(spike[i])) for i in hits]
+
+    def diff_records(self, records: List[Dict[str, Any]], slots: array, now: float, snapshots: int) -> List[Flag]:
+        """The same diff without numpy, fused with the state update in one pass over the records"""
+        liquidity, price, seen, snapshot = self.liquidity, self.price, self.seen, self.snapshot
+        floor = min(self.drop_percent, self.spike_drop_percent)
+        flagged = []
+        for i, (record, slot) in enumerate(zip(records, slots)):
+            current, current_price = record['liquidity'], record['price']
+            previous, previous_price = liquidity[slot], price[slot]
+            fresh = now - seen[slot] <= self.max_gap
+            liquidity[slot] = current
+            price[slot] = current_price
+            seen[slot] = now
+            snapshot[slot] = snapshots
+
+            # New pairs carry NaN, so this comparison is False for them
+            if not (fresh and previous >= self.min_liquidity and previous > 0):
+                continue
+            drop = (previous - current) / previous * 100
+            if drop < floor:
+                continue
+            move = (current_price - previous_price) / previous_price * 100 if previous_price > 0 else 0.0
+            spike = drop >= self.spike_drop_percent and move >= self.spike_percent
+            if drop >= self.drop_percent or spike:
+                flagged.append((i, previous, drop, move, spike))
+        return flagged
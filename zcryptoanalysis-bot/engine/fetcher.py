@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Fetcher stage: DexScreener snapshots with conditional requests, body-hash
+dedup, per-endpoint circuit breakers and honest fallback
+requests is imported lazily so importing the engine stays cheap
+"""
+
+import hashlib
+import socket
+import time
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit
+
+from circuit_breaker import CircuitBreaker
+from metrics import metrics
+
+from .decoder import loads
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+TICKER_ENDPOINTS = [
+    'https://api.dexscreener.com/latest/dex/tickers',
+    'https://api.dexscreener.io/latest/dex/tickers'
+]
+
+# Used only when sample data is explicitly enabled
+SAMPLE_TICKERS = [
+    {
+        'chainId': 'base',
+        'baseToken': {'symbol': 'AERO', 'name': 'Aerodrome Finance'},
+        'priceUsd': '0.000001234',
+        'liquidity': {'usd': 75000},
+        'volume': {'h24': 250000},
+        'priceChange': {'h24': 15.7}
+    },
+    {
+        'chainId': 'base',
+        'baseToken': {'symbol': 'DEGEN', 'name': 'Degen'},
+        'priceUsd': '0.00004567',
+        'liquidity': {'usd': 125000},
+        'volume': {'h24': 180000},
+        'priceChange': {'h24': -8.3}
+    },
+    {
+        'chainId': 'base',
+        'baseToken': {'symbol': 'BASEDOG', 'name': 'Base Dog'},
+        'priceUsd': '0.000000891',
+        'liquidity': {'usd': 95000},
+        'volume': {'h24': 120000},
+        'priceChange': {'h24': 45.2}
+    },
+    {
+        'chainId': 'base',
+        'baseToken': {'symbol': 'BRETT', 'name': 'Brett'},
+        'priceUsd': '0.00001234',
+        'liquidity': {'usd': 200000},
+        'volume': {'h24': 350000},
+        'priceChange': {'h24': 28.5}
+    }
+]
+
+
+def payload_rows(data: Any, key: str) -> List[Dict]:
+    """Rows under key of a decoded payload; ValueError when the body is not shaped like one"""
+    if not isinstance(data, dict):
+        raise ValueError(f'expected a JSON object, got {type(data).__name__}')
+    rows = data.get(key) or []
+    if not isinstance(rows, list):
+        raise ValueError(f'expected a list under {key!r}, got {type(rows).__name__}')
+    return rows
+
+
+def source_notice(data_source: str, age: Optional[float]) -> str:
+    """Warning line for a snapshot's data source and age (empty for live data)"""
+    minutes = int((age or 0) // 60)
+    if data_source == 'restored':
+        return f"♻️ Bot just restarted - showing saved data from {minutes} min ago while refreshing\n\n"
+    if data_source == 'cache':
+        return f"⚠️ DexScreener unavailable - showing last good data from {minutes} min ago\n\n"
+    if data_source == 'sample':
+        return "⚠️ DexScreener unavailable - showing SAMPLE data, not live prices\n\n"
+    return ""
+
+
+class SnapshotFetcher:
+    """Snapshot bookkeeping shared by the sync and async fetchers"""
+
+    def __init__(self, endpoints: List[str], key: str = 'tickers', timeout: float = 15,
+                 allow_sample: bool = False, sample_data: List[Dict] = None):
+        self.endpoints = endpoints
+        self.key = key
+        self.timeout = timeout
+        self.allow_sample = allow_sample
+        self.sample_data = sample_data if sample_data is not None else SAMPLE_TICKERS
+
+        # HTTP validators per endpoint and hash of the last body
+        self.validators: Dict[str, Dict[str, Optional[str]]] = {}
+        self.body_hash = None
+        self.cached_rows: List[Dict] = []
+        self.snapshot_changed = True
+        self.snapshot_time = None
+        # 'live' | 'cache' (last good snapshot) | 'restored' (from disk) | 'sample' | 'none'
+        self.data_source = 'none'
+        self.breakers = {endpoint: CircuitBreaker() for endpoint in endpoints}
+
+    def conditional_headers(self, endpoint: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers from the endpoint's last response"""
+        validators = self.validators.get(endpoint, {})
+        headers = {}
+        if not self.body_hash:
+            return headers
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def accept_response(self, endpoint: str, status: int, headers: Any, body: bytes) -> Optional[List[Dict]]:
+        """Rows for a response, reusing the cache when unchanged; None on a failed status, ValueError on a bad body"""
+        breaker = self.breakers[endpoint]
+
+        if status == 304 and self.body_hash:
+            breaker.record_success()
+            metrics.inc('cache_hits')
+            metrics.inc('not_modified')
+            return self.live_snapshot(changed=False)
+
+        if status != 200:
+            metrics.inc('api_errors')
+            breaker.record_failure()
+            return None
+
+        validators = {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified')
+        }
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        if body_hash == self.body_hash:
+            self.validators[endpoint] = validators
+            breaker.record_success()
+            metrics.inc('cache_hits')
+            metrics.inc('unchanged_bodies')
+            return self.live_snapshot(changed=False)
+
+        with metrics.span('json_decode'):
+            rows = payload_rows(loads(body), self.key)
+        # Validators only for bodies we adopted, so a 304 never revalidates a rejected one
+        self.validators[endpoint] = validators
+        breaker.record_success()
+        self.cached_rows = rows
+        self.body_hash = body_hash
+        return self.live_snapshot(changed=True)
+
+    def record_error(self, endpoint: str):
+        """Count a transport-level failure against the endpoint"""
+        metrics.inc('api_errors')
+        self.breakers[endpoint].record_failure()
+
+    def live_snapshot(self, changed: bool) -> List[Dict]:
+        """Mark the cached rows as freshly confirmed by DexScreener"""
+        self.snapshot_changed = changed or self.data_source != 'live'
+        self.snapshot_time = time.time()
+        self.data_source = 'live'
+        metrics.set_gauge('snapshot_tickers', len(self.cached_rows))
+        return self.cached_rows
+
+    def fallback_snapshot(self) -> List[Dict]:
+        """Serve the last good snapshot, or sample data only when explicitly enabled"""
+        metrics.inc('fallbacks')
+
+        if self.cached_rows and self.body_hash:
+            metrics.inc('fallbacks_cache')
+            self.snapshot_changed = self.data_source not in ('cache', 'restored')
+            self.data_source = 'cache'
+            return self.cached_rows
+
+        if self.allow_sample:
+            metrics.inc('fallbacks_sample')
+            self.snapshot_changed = self.data_source != 'sample'
+            self.data_source = 'sample'
+            return self.sample_data
+
+        self.snapshot_changed = True
+        self.data_source = 'none'
+        return []
+
+    def snapshot_age(self) -> Optional[float]:
+        """Seconds since DexScreener last confirmed the snapshot"""
+        if self.snapshot_time is None:
+            return None
+        return time.time() - self.snapshot_time
+
+    def export_state(self) -> Dict[str, Any]:
+        """Snapshot and validators, for persisting across restarts"""
+        return {
+            'rows': self.cached_rows,
+            'body_hash': self.body_hash,
+            'validators': self.validators,
+            'snapshot_time': self.snapshot_time
+        }
+
+    def restore_state(self, state: Dict[str, Any]):
+        """Adopt a persisted snapshot; the next fetch revalidates it with conditional headers"""
+        self.cached_rows = state.get('rows') or []
+        self.body_hash = state.get('body_hash')
+        self.validators = {endpoint: v for endpoint, v in (state.get('validators') or {}).items()
+                           if endpoint in self.breakers}
+        self.snapshot_time = state.get('snapshot_time')
+        self.snapshot_changed = False
+        self.data_source = 'restored'
+
+    def data_notice(self) -> str:
+        """Warning line when the report is not built from live data"""
+        return source_notice(self.data_source, self.snapshot_age())
+
+
+class SyncFetcher(SnapshotFetcher):
+    """Blocking fetcher over requests, trying endpoints in order"""
+
+    def __init__(self, endpoints: List[str] = None, **kwargs):
+        super().__init__(endpoints or TICKER_ENDPOINTS, **kwargs)
+        self.session = None
+
+    def get_session(self):
+        """Shared keep-alive session; requests is imported on first use"""
+        if self.session is None:
+            import requests
+            self.session = requests.Session()
+            self.session.headers.update(DEFAULT_HEADERS)
+        return self.session
+
+    def warm(self) -> float:
+        """Resolve DNS and open pooled TLS connections to every endpoint host; returns seconds taken"""
+        start = time.perf_counter()
+        session = self.get_session()
+        for endpoint in self.endpoints:
+            parts = urlsplit(endpoint)
+            try:
+                socket.getaddrinfo(parts.hostname, parts.port or 443)
+                session.head(f'{parts.scheme}://{parts.netloc}/', timeout=self.timeout)
+            except Exception:
+                continue
+        return time.perf_counter() - start
+
+    def fetch(self) -> List[Dict]:
+        """Latest rows from the first healthy endpoint, else the fallback snapshot"""
+        for endpoint in self.endpoints:
+            if not self.breakers[endpoint].allow_request():
+                continue
+            try:
+                session = self.get_session()
+                metrics.inc('api_requests')
+                with metrics.span('fetch'):
+                    response = session.get(endpoint, headers=self.conditional_headers(endpoint), timeout=self.timeout)
+                # Undecodable or mis-shaped bodies count against the endpoint like transport errors
+                rows = self.accept_response(endpoint, response.status_code, response.headers, response.content)
+            except Exception:
+                self.record_error(endpoint)
+                continue
+            finally:
+                # A half-open probe must not stay in flight, whatever escaped above
+                self.breakers[endpoint].release_probe()
+            if rows is not None:
+                return rows
+
+        return self.fallback_snapshot()
+
+
+class StaticFetcher:
+    """Fixed rows, for replaying recorded payloads and offline runs"""
+
+    def __init__(self, rows: List[Dict], data_source: str = 'live'):
+        self.rows = rows
+        self.data_source = data_source
+        self.snapshot_changed = True
+        self.fetched = False
+
+    def fetch(self) -> List[Dict]:
+        self.snapshot_changed = not self.fetched
+        self.fetched = True
+        return self.rows
+
+    def data_notice(self) -> str:
+        return ""
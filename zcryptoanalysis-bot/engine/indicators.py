@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Streaming technical indicators per pair: EMA, Wilder RSI and a
+liquidity-weighted VWAP, each updated in O(1) from the latest snapshot
+State lives in parallel arrays indexed by a slot per pair, so tracking
+thousands of pairs costs a few dozen bytes each instead of a dict apiece
+"""
+
+import time
+from array import array
+from typing import List, Dict, Any, Optional, Tuple
+
+from .ticker_log import token_key
+
+INDICATOR_FIELDS = ('ema', 'rsi', 'vwap')
+
+
+def vwap_deviation(price: float, vwap: Optional[float]) -> Optional[float]:
+    """Percent distance of price from its VWAP, None until the VWAP exists"""
+    if not vwap:
+        return None
+    return (price - vwap) / vwap * 100
+
+
+class IndicatorTracker:
+    """Indicator state for every pair seen on one chain, advanced once per snapshot"""
+
+    def __init__(self, ema_period: int = 12, rsi_period: int = 14, vwap_period: int = 48,
+                 max_idle: float = 6 * 3600):
+        self.ema_alpha = 2 / (ema_period + 1)
+        self.vwap_alpha = 2 / (vwap_period + 1)
+        self.rsi_period = rsi_period
+        self.max_idle = max_idle
+
+        # pair key -> slot; freed slots are reused before the arrays grow
+        self.slots: Dict[str, int] = {}
+        self.free: List[int] = []
+        self.ema = array('d')
+        self.avg_gain = array('d')
+        self.avg_loss = array('d')
+        self.last_price = array('d')
+        # Exponentially decayed sums of price * liquidity and of liquidity
+        self.vwap_num = array('d')
+        self.vwap_den = array('d')
+        self.last_seen = array('d')
+        self.samples = array('I')
+
+        self.last_update: Optional[float] = None
+        self.last_prune = 0.0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    @staticmethod
+    def key(record: Dict[str, Any]) -> str:
+        return record.get('pair_address') or token_key(record)
+
+    def slot(self, key: str) -> int:
+        """Slot for a pair, allocating (or recycling) one on first sight"""
+        slot = self.slots.get(key)
+        if slot is not None:
+            return slot
+        if self.free:
+            slot = self.free.pop()
+            for column in (self.ema, self.avg_gain, self.avg_loss, self.last_price,
+                           self.vwap_num, self.vwap_den, self.last_seen):
+                column[slot] = 0.0
+            self.samples[slot] = 0
+        else:
+            slot = len(self.samples)
+            for column in (self.ema, self.avg_gain, self.avg_loss, self.last_price,
+                           self.vwap_num, self.vwap_den, self.last_seen):
+                column.append(0.0)
+            self.samples.append(0)
+        self.slots[key] = slot
+        return slot
+
+    def update(self, records: List[Dict[str, Any]], now: float = None) -> List[Dict[str, Any]]:
+        """Advance every pair by one sample and annotate the records with ema, rsi and vwap"""
+        now = time.time() if now is None else now
+        # The same snapshot fed twice (a restore, a re-analysis) must not count as a new sample
+        if now == self.last_update:
+            return self.annotate(records)
+        self.last_update = now
+
+        ema_alpha, vwap_keep = self.ema_alpha, 1 - self.vwap_alpha
+        ema, gains, losses, last = self.ema, self.avg_gain, self.avg_loss, self.last_price
+        num, den, samples, seen = self.vwap_num, self.vwap_den, self.samples, self.last_seen
+        for record in records:
+            i = self.slot(self.key(record))
+            price, liquidity = record['price'], record['liquidity']
+            n = samples[i]
+            if n == 0:
+                ema[i] = price
+                num[i] = price * liquidity
+                den[i] = liquidity
+            elif seen[i] != now:
+                delta = price - last[i]
+                ema[i] += ema_alpha * (price - ema[i])
+                # Simple mean of the first rsi_period moves, Wilder smoothing after that
+                k = min(n, self.rsi_period)
+                gains[i] += ((delta if delta > 0 else 0.0) - gains[i]) / k
+                losses[i] += ((-delta if delta < 0 else 0.0) - losses[i]) / k
+                num[i] = num[i] * vwap_keep + price * liquidity
+                den[i] = den[i] * vwap_keep + liquidity
+            else:
+                # A pair listed twice in one snapshot keeps its first sample
+                continue
+            last[i] = price
+            seen[i] = now
+            samples[i] = n + 1
+
+        if now - self.last_prune > 3600:
+            self.prune(now)
+        return self.annotate(records)
+
+    def values(self, slot: int) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """(ema, rsi, vwap) for a slot; None until there is a move to measure, RSI until rsi_period moves"""
+        if self.samples[slot] < 2:
+            return None, None, None
+        rsi = None
+        if self.samples[slot] > self.rsi_period:
+            gain, loss = self.avg_gain[slot], self.avg_loss[slot]
+            if loss:
+                rsi = 100 - 100 / (1 + gain / loss)
+            else:
+                rsi = 100.0 if gain else 50.0
+        den = self.vwap_den[slot]
+        return self.ema[slot], rsi, (self.vwap_num[slot] / den if den else None)
+
+    def annotate(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copy current indicator values onto records (None for pairs never tracked)"""
+        for record in records:
+            slot = self.slots.get(self.key(record))
+            if slot is None:
+                record['ema'] = record['rsi'] = record['vwap'] = None
+            else:
+                record['ema'], record['rsi'], record['vwap'] = self.values(slot)
+        return records
+
+    def prune(self, now: float):
+        """Free the slots of pairs that dropped out of the feed more than max_idle ago"""
+        self.last_prune = now
+        cutoff = now - self.max_idle
+        for key, slot in list(self.slots.items()):
+            if self.last_seen[slot] < cutoff:
+                del self.slots[key]
+                self.free.append(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'pairs': len(self.slots),
+            'slots': len(self.samples),
+            'bytes': sum(column.itemsize * len(column) for column in (
+                self.ema, self.avg_gain, self.avg_loss, self.last_price,
+                self.vwap_num, self.vwap_den, self.last_seen, self.samples))
+        }
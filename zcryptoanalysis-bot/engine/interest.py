@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Subscriber interest shared between processes: bot workers append the pairs
+users look up, the scanner drains them into its poll scheduler each scan
+"""
+
+import logging
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTEREST_PATH = '/tmp/zcryptoanalysis/interest.log'
+
+
+class InterestLog:
+    """Append-only file of 'chain<TAB>pair address<TAB>weight' lines"""
+
+    def __init__(self, path: str = DEFAULT_INTEREST_PATH):
+        self.path = path
+
+    def record(self, pairs: Iterable[Tuple[str, str]], weight: float = 1.0) -> int:
+        """Append (chain, pair address) entries in one O_APPEND write, so lines from several workers never interleave"""
+        data = ''.join(f'{chain}\t{address}\t{weight:g}\n' for chain, address in pairs if chain and address)
+        if not data:
+            return 0
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data.encode())
+        finally:
+            os.close(fd)
+        return data.count('\n')
+
+    def drain(self) -> Dict[str, Dict[str, float]]:
+        """Everything appended since the last drain, as chain -> {pair address: summed weight}"""
+        # Renamed first, so appends landing while it is read start a fresh file
+        draining = f'{self.path}.{os.getpid()}.draining'
+        try:
+            os.replace(self.path, draining)
+        except FileNotFoundError:
+            return {}
+        try:
+            with open(draining) as f:
+                lines = f.read().splitlines()
+        finally:
+            os.unlink(draining)
+
+        interest: Dict[str, Dict[str, float]] = defaultdict(dict)
+        for line in lines:
+            try:
+                chain, address, weight = line.split('\t')
+                interest[chain][address] = interest[chain].get(address, 0.0) + float(weight)
+            except ValueError:
+                logger.warning(f'Skipping malformed interest line: {line!r}')
+        return dict(interest)
+
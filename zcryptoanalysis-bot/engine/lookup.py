@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Point lookups over the latest snapshot: symbol, name and address to pairs
+Rebuilt off to the side on each refresh and swapped in with one assignment
+"""
+
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from heapq import nsmallest
+from typing import List, Dict, Any, Iterable
+
+from .pipeline import Pipeline
+
+
+def normalize_address(address: str) -> str:
+    """EVM addresses are case-insensitive; base58 (Solana) addresses are not"""
+    return address.lower() if address.startswith('0x') else address
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase words of a token name, so 'Aerodrome  Finance' matches 'aerodrome finance'"""
+    return ' '.join(re.findall(r'[a-z0-9]+', name.lower()))
+
+
+class PairLookup:
+    """Immutable hash tables over one snapshot's scored pairs"""
+
+    def __init__(self, records: List[Dict[str, Any]] = (), version: Any = None):
+        self.version = version
+        self.size = len(records)
+        self.symbols: Dict[str, List[Dict[str, Any]]] = {}
+        self.names: Dict[str, List[Dict[str, Any]]] = {}
+        self.addresses: Dict[str, List[Dict[str, Any]]] = {}
+
+        # Deepest pools first, so ambiguous symbols list the real pair before clones
+        self.records = sorted(records, key=lambda r: r['liquidity'], reverse=True)
+        for record in self.records:
+            self.symbols.setdefault(record['token'].upper(), []).append(record)
+            name = normalize_name(record['name'])
+            if name:
+                self.names.setdefault(name, []).append(record)
+            for address in (record['pair_address'], record['token_address']):
+                if address:
+                    self.addresses.setdefault(normalize_address(address), []).append(record)
+
+    @classmethod
+    def from_pipelines(cls, pipelines: Dict[str, Pipeline], version: Any = None) -> 'PairLookup':
+        """Every parsed pair of each chain's last snapshot, scored with that chain's model"""
+        records = []
+        for pipeline in pipelines.values():
+            records.extend(pipeline.scorer.score_all(pipeline.snapshot_records()))
+        return cls(records, version)
+
+    def find(self, query: str) -> List[Dict[str, Any]]:
+        """Pairs for a pair/token address, a symbol or cashtag, or an exact token name"""
+        query = query.strip()
+        if not query:
+            return []
+        return (self.addresses.get(normalize_address(query))
+                or self.symbols.get(query.lstrip('$').upper())
+                or self.names.get(normalize_name(query))
+                or [])
+
+
+class PrefixIndex:
+    """Autocomplete over symbols and name words: sorted keys plus bisect, with an LRU of hot prefixes"""
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = (), cache_size: int = 1024, max_scan: int = 5000):
+        # records arrive deepest-liquidity first; list position doubles as rank
+        self.records = list(records)
+        self.cache_size = cache_size
+        self.max_scan = max_scan
+        self.cache: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        entries = set()
+        for rank, record in enumerate(self.records):
+            entries.add((record['token'].lower(), rank))
+            words = normalize_name(record['name']).split()
+            for i in range(len(words)):
+                entries.add((' '.join(words[i:]), rank))
+        entries = sorted(entries)
+        self.keys = [key for key, _ in entries]
+        self.ranks = [rank for _, rank in entries]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Up to limit pairs whose symbol or a name word starts with prefix; exact symbols first"""
+        prefix = normalize_name(prefix.lstrip('$')) if prefix.strip() else ''
+        key = (prefix, limit)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        if prefix:
+            lo = bisect_left(self.keys, prefix)
+            hi = min(bisect_left(self.keys, prefix + '\uffff'), lo + self.max_scan)
+            ranks = set(self.ranks[lo:hi])
+            results = [self.records[rank] for rank in nsmallest(
+                limit, ranks, key=lambda rank: (self.records[rank]['token'].lower() != prefix, rank))]
+        else:
+            results = self.records[:limit]
+
+        self.cache[key] = results
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return results
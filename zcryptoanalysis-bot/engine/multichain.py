@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Multi-chain scan: one shared fetch partitioned by chainId, then an
+independent filter/score/render pipeline per chain with its own thresholds
+"""
+
+import asyncio
+import inspect
+from typing import List, Dict, Callable, Optional
+
+from metrics import metrics
+
+from .pipeline import Pipeline, ScanResult
+from .profiles import Profile, CHAIN_ALIASES
+from .scorer import ScalarScorer
+from .indicators import IndicatorTracker
+from .drain_detector import LiquidityDrainDetector
+from .aggregator import PairAggregator
+
+
+class MultiChainScanner:
+    def __init__(self, fetcher, profiles: Dict[str, Profile], renderer_factory: Optional[Callable] = None,
+                 scorer_class=ScalarScorer, track_indicators: bool = False, detect_drains: bool = False,
+                 group_pairs: bool = False):
+        self.fetcher = fetcher
+        # renderer_factory(chain, profile) builds each chain's renderer (e.g. with its label)
+        # Indicator and drain state is per chain, so concurrent chain threads never share arrays
+        self.pipelines: Dict[str, Pipeline] = {
+            chain: Pipeline.from_profile(
+                profile, scorer_class=scorer_class, fetcher=fetcher,
+                renderer=renderer_factory(chain, profile) if renderer_factory else None,
+                indicators=IndicatorTracker() if track_indicators else None,
+                drains=LiquidityDrainDetector() if detect_drains else None,
+                aggregator=PairAggregator() if group_pairs else None
+            )
+            for chain, profile in profiles.items()
+        }
+
+    @property
+    def chains(self) -> List[str]:
+        return list(self.pipelines)
+
+    def resolve(self, name: Optional[str], default: str = 'base') -> Optional[str]:
+        """Canonical chain id for a user-supplied name or alias, None if not scanned"""
+        if not name:
+            return default
+        chain = name.strip().lower()
+        chain = CHAIN_ALIASES.get(chain, chain)
+        return chain if chain in self.pipelines else None
+
+    def partition(self, raw: List[Dict]) -> Dict[str, List[Dict]]:
+        """Rows per configured chain in a single pass; other chains are dropped"""
+        partitions = {chain: [] for chain in self.pipelines}
+        for row in raw:
+            bucket = partitions.get(row.get('chainId'))
+            if bucket is not None:
+                bucket.append(row)
+        return partitions
+
+    def cached(self) -> Dict[str, ScanResult]:
+        """Last result per chain (chains never scanned are absent)"""
+        return {chain: p.last_result for chain, p in self.pipelines.items() if p.last_result is not None}
+
+    def alerts(self) -> List[Dict]:
+        """Liquidity-drain alerts raised by the latest snapshot, across chains"""
+        return [alert for p in self.pipelines.values() for alert in p.alerts]
+
+    def is_fresh(self) -> bool:
+        """Whether every chain's cached result matches the current snapshot"""
+        return (not self.fetcher.snapshot_changed
+                and all(p.last_result is not None for p in self.pipelines.values()))
+
+    def process(self, raw: List[Dict]) -> Dict[str, ScanResult]:
+        """Analyze every chain one after another (for blocking callers)"""
+        if self.is_fresh():
+            metrics.inc('skipped_analyses')
+            return self.cached()
+
+        for chain, rows in self.partition(raw).items():
+            self.timed_process(chain, rows)
+        return self.cached()
+
+    async def process_async(self, raw: List[Dict]) -> Dict[str, ScanResult]:
+        """Analyze every chain concurrently in worker threads, off the event loop"""
+        if self.is_fresh():
+            metrics.inc('skipped_analyses')
+            return self.cached()
+
+        partitions = self.partition(raw)
+        await asyncio.gather(*(
+            asyncio.to_thread(self.timed_process, chain, rows) for chain, rows in partitions.items()
+        ))
+        return self.cached()
+
+    def timed_process(self, chain: str, rows: List[Dict]) -> ScanResult:
+        """One chain's analysis, timed into its own latency histogram"""
+        with metrics.span(f'scan_{chain}'):
+            return self.pipelines[chain].process_rows(rows)
+
+    def restore_missing(self):
+        """Rebuild chains without a result from the fetcher's cached rows (after a disk restore)"""
+        partitions = self.partition(self.fetcher.cached_rows)
+        for chain, pipeline in self.pipelines.items():
+            if pipeline.last_result is None:
+                pipeline.process_rows(partitions[chain])
+
+    def run(self) -> Dict[str, ScanResult]:
+        """Fetch once with a blocking fetcher and scan every chain"""
+        return self.process(self.fetcher.fetch())
+
+    async def run_async(self) -> Dict[str, ScanResult]:
+        """Fetch once and scan every chain concurrently"""
+        if inspect.iscoroutinefunction(self.fetcher.fetch):
+            raw = await self.fetcher.fetch()
+        else:
+            raw = await asyncio.to_thread(self.fetcher.fetch)
+        return await self.process_async(raw)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Parser stage: raw DexScreener tickers/pairs to flat numeric records,
+converted once by the schema-aware decoder
+"""
+
+from typing import List, Dict, Any, Optional
+
+from .decoder import decode_record
+
+
+class TickerParser:
+    def __init__(self, chain: str = 'base', legacy_fields: bool = False):
+        self.chain = chain
+        # Older payloads used flat liquidityUsd / volume24h / priceChange24h fields
+        self.legacy_fields = legacy_fields
+
+    def select_chain(self, rows: List[Dict]) -> List[Dict]:
+        """Raw rows on this parser's chain"""
+        return [r for r in rows if r.get('chainId') == self.chain]
+
+    def parse_one(self, ticker: Dict) -> Optional[Dict[str, Any]]:
+        """One flat record, or None when required fields are missing or malformed"""
+        return decode_record(ticker, self.legacy_fields)
+
+    def parse(self, rows: List[Dict]) -> List[Dict[str, Any]]:
+        """Records for every well-formed row on this parser's chain"""
+        chain, legacy = self.chain, self.legacy_fields
+        records = []
+        for row in rows:
+            if row.get('chainId') != chain:
+                continue
+            record = decode_record(row, legacy)
+            if record is not None:
+                records.append(record)
+        return records
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Composable scan pipeline: fetcher -> parser -> filter -> scorer -> ranker -> renderer
+"""
+
+import asyncio
+import inspect
+from datetime import datetime
+from typing import List, Dict, Any, NamedTuple
+
+from metrics import metrics
+
+from .parser import TickerParser
+from .ranker import ChangeRanker
+from .scorer import ThresholdFilter, ScalarScorer
+
+
+class ScanResult(NamedTuple):
+    rows: List[Dict]
+    opportunities: List[Dict[str, Any]]
+    report: Any
+
+
+class Pipeline:
+    STAGES = ('fetcher', 'parser', 'indicators', 'drains', 'aggregator', 'filter', 'scorer', 'ranker', 'renderer')
+
+    def __init__(self, fetcher=None, parser=None, filter=None, scorer=None, ranker=None, renderer=None,
+                 indicators=None, drains=None, aggregator=None):
+        self.fetcher = fetcher
+        self.parser = parser or TickerParser()
+        # Optional IndicatorTracker and LiquidityDrainDetector: fed every parsed pair, before the filter
+        self.indicators = indicators
+        self.drains = drains
+        # Optional PairAggregator: token-level stats from every pair, then one record per token
+        self.aggregator = aggregator
+        self.alerts: List[Dict[str, Any]] = []
+        self.filter = filter or ThresholdFilter()
+        self.scorer = scorer
+        self.ranker = ranker or ChangeRanker()
+        self.renderer = renderer
+        self.last_result = None
+        # (rows, records) of the last analysis, so lookups and the ticker log reuse its parse
+        self.parsed = None
+
+    @classmethod
+    def from_profile(cls, profile, scorer_class=ScalarScorer, **stages) -> 'Pipeline':
+        """Pipeline with an entry point's thresholds, overriding any stage by keyword"""
+        defaults = {
+            'parser': TickerParser(chain=profile.chain, legacy_fields=profile.legacy_fields),
+            'filter': profile.filter,
+            'scorer': scorer_class(profile.risk_model),
+            'ranker': ChangeRanker(limit=profile.limit)
+        }
+        defaults.update(stages)
+        return cls(**defaults)
+
+    def with_stages(self, **stages) -> 'Pipeline':
+        """Copy of this pipeline with some stages swapped (e.g. scorer=ColumnScorer(model))"""
+        unknown = set(stages) - set(self.STAGES)
+        if unknown:
+            raise ValueError(f'unknown pipeline stages: {sorted(unknown)}')
+        current = {name: getattr(self, name) for name in self.STAGES}
+        current.update(stages)
+        return Pipeline(**current)
+
+    def analyze(self, rows: List[Dict]) -> List[Dict[str, Any]]:
+        """Parse, filter, score and rank raw rows"""
+        records = self.parser.parse(rows)
+        self.parsed = (rows, records)
+        snapshot_time = getattr(self.fetcher, 'snapshot_time', None)
+        if self.indicators is not None:
+            with metrics.span('update_indicators'):
+                self.indicators.update(records, snapshot_time)
+        if self.drains is not None:
+            # Pools drained below the filter's floor are exactly the ones to catch, so this sees them all
+            with metrics.span('detect_drains'):
+                self.alerts = self.drains.observe(records, snapshot_time)
+            if self.alerts:
+                metrics.inc('drain_alerts', len(self.alerts))
+        if self.aggregator is not None:
+            with metrics.span('aggregate_pairs'):
+                self.aggregator.annotate(records)
+        records = self.filter.apply(records)
+        if self.aggregator is not None:
+            records = self.aggregator.dedupe(records)
+        scored = self.scorer.score_all(records)
+        timestamp = str(datetime.utcnow())[:19]
+        for record in scored:
+            record['timestamp'] = timestamp
+        return self.ranker.rank(scored)
+
+    def snapshot_records(self) -> List[Dict[str, Any]]:
+        """Every parsed pair of the last snapshot with its indicators and group stats, parsed once"""
+        result = self.last_result
+        if result is None:
+            return []
+        if self.parsed is None or self.parsed[0] is not result.rows:
+            # A result restored from disk was never analysed in this process
+            records = self.parser.parse(result.rows)
+            if self.indicators is not None:
+                self.indicators.annotate(records)
+            if self.aggregator is not None:
+                self.aggregator.annotate(records)
+            self.parsed = (result.rows, records)
+        return self.parsed[1]
+
+    def render(self, opportunities: List[Dict[str, Any]]) -> Any:
+        if self.renderer is None or not opportunities:
+            return None
+        return self.renderer.render(opportunities)
+
+    def process(self, raw: List[Dict]) -> ScanResult:
+        """Analyze and render fetched rows, reusing the last result if the snapshot is unchanged"""
+        if not self.fetcher.snapshot_changed and self.last_result is not None:
+            metrics.inc('skipped_analyses')
+            return self.last_result
+
+        return self.process_rows(self.parser.select_chain(raw))
+
+    def process_rows(self, rows: List[Dict]) -> ScanResult:
+        """Analyze and render rows already selected for this pipeline's chain"""
+        with metrics.span('analyze_opportunities'):
+            opportunities = self.analyze(rows)
+        with metrics.span('generate_summary'):
+            report = self.render(opportunities)
+        self.last_result = ScanResult(rows, opportunities, report)
+        return self.last_result
+
+    def run(self) -> ScanResult:
+        """Fetch with a blocking fetcher and process the snapshot"""
+        return self.process(self.fetcher.fetch())
+
+    async def run_async(self) -> ScanResult:
+        """Fetch with an async fetcher (or a sync one off the event loop) and process"""
+        if inspect.iscoroutinefunction(self.fetcher.fetch):
+            raw = await self.fetcher.fetch()
+        else:
+            raw = await asyncio.to_thread(self.fetcher.fetch)
+        return self.process(raw)
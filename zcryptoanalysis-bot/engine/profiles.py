@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Per-entry-point thresholds and risk calibration
+Each script keeps the numbers it shipped with; only the code is shared
+"""
+
+from typing import Optional
+
+from .scorer import ThresholdFilter, RiskModel
+
+EMOJI_LEVELS = [(3, '🟢 Low'), (5, '🟡 Medium'), (7, '🟠 High'), (10, '🔴 Extreme')]
+PLAIN_LEVELS = [(3, 'Low'), (5, 'Medium'), (7, 'High'), (10, 'Extreme')]
+
+# Only pipelines fed by an IndicatorTracker have RSI/VWAP, so these tiers are
+# inert for every entry point that does not track indicators
+RSI_TIERS = [(35, 2), (20, 1)]
+VWAP_TIERS = [(50, 2), (20, 1)]
+
+
+class Profile:
+    def __init__(self, name: str, filter: ThresholdFilter, risk_model: RiskModel,
+                 limit: Optional[int] = None, chain: str = 'base', legacy_fields: bool = False):
+        self.name = name
+        self.filter = filter
+        self.risk_model = risk_model
+        self.limit = limit
+        self.chain = chain
+        self.legacy_fields = legacy_fields
+
+
+PRODUCTION = Profile(
+    'production',
+    ThresholdFilter(min_liquidity=50000, min_change=3),
+    RiskModel(
+        base=2,
+        liquidity_tiers=[(50000, 4), (100000, 3), (250000, 2), (500000, 1)],
+        change_tiers=[(100, 4), (50, 3), (25, 2), (10, 1)],
+        volume_tiers=[(50000, 2), (100000, 1)],
+        levels=[(3, '🟢 Low Risk'), (5, '🟡 Medium Risk'), (7, '🟠 High Risk'), (10, '🔴 Extreme Risk')],
+        rsi_tiers=RSI_TIERS,
+        vwap_tiers=VWAP_TIERS
+    )
+)
+
+ZCRYPTO = Profile(
+    'zcryptoanalysis',
+    ThresholdFilter(min_liquidity=50000, min_change=5),
+    RiskModel(
+        base=3,
+        liquidity_tiers=[(100000, 3), (500000, 2), (1000000, 1)],
+        change_tiers=[(200, 4), (100, 3), (50, 2), (20, 1)],
+        volume_tiers=[(50000, 2), (100000, 1)],
+        levels=EMOJI_LEVELS
+    ),
+    legacy_fields=True
+)
+
+TELEGRAM = Profile(
+    'telegram',
+    ThresholdFilter(min_liquidity=50000, min_change=5),
+    RiskModel(
+        base=3,
+        liquidity_tiers=[(100000, 3), (500000, 2)],
+        change_tiers=[(100, 4), (50, 2), (20, 1)],
+        levels=[(3, 'Low'), (6, 'Medium'), (10, 'High')]
+    )
+)
+
+WORKING = Profile(
+    'working',
+    ThresholdFilter(min_liquidity=50000, min_change=3),
+    RiskModel(
+        base=2,
+        liquidity_tiers=[(100000, 3), (500000, 2)],
+        change_tiers=[(100, 4), (50, 2), (20, 1)],
+        levels=[(3, '🟢 Low'), (5, '🟡 Medium'), (10, '🟠 High')]
+    )
+)
+
+CRYPTO_FINAL = Profile(
+    'crypto_final',
+    ThresholdFilter(min_liquidity=50000, min_change=10, min_volume=10000, change_inclusive=False),
+    RiskModel(
+        base=3,
+        liquidity_tiers=[(100000, 2), (500000, 1)],
+        change_tiers=[(200, 3), (100, 2), (50, 1)],
+        levels=PLAIN_LEVELS
+    ),
+    limit=15
+)
+
+CRYPTO_FINAL_FIXED = Profile(
+    'crypto_final_fixed',
+    ThresholdFilter(min_liquidity=50000, min_change=5, min_volume=10000, change_inclusive=False),
+    RiskModel(
+        base=3,
+        liquidity_tiers=[(100000, 3), (500000, 2), (1000000, 1)],
+        change_tiers=[(500, 4), (200, 3), (100, 2), (50, 1)],
+        volume_tiers=[(50000, 2), (100000, 1)],
+        levels=PLAIN_LEVELS
+    ),
+    limit=20
+)
+
+# Multi-chain scan: one profile per chain, fed from a single shared fetch.
+# Liquidity floors follow each chain's typical pool depth (ETH mainnet pools
+# under ~$250k are mostly dead or honeypots; Solana memecoins trade thinner).
+SOLANA = Profile(
+    'solana',
+    ThresholdFilter(min_liquidity=25000, min_change=5),
+    RiskModel(
+        base=3,
+        liquidity_tiers=[(25000, 4), (50000, 3), (150000, 2), (500000, 1)],
+        change_tiers=[(200, 4), (100, 3), (50, 2), (20, 1)],
+        volume_tiers=[(25000, 2), (75000, 1)],
+        levels=PRODUCTION.risk_model.levels,
+        rsi_tiers=RSI_TIERS,
+        vwap_tiers=VWAP_TIERS
+    ),
+    chain='solana'
+)
+
+ETHEREUM = Profile(
+    'ethereum',
+    ThresholdFilter(min_liquidity=250000, min_change=3),
+    RiskModel(
+        base=2,
+        liquidity_tiers=[(250000, 4), (500000, 3), (1000000, 2), (5000000, 1)],
+        change_tiers=[(50, 4), (25, 3), (10, 2), (5, 1)],
+        volume_tiers=[(100000, 2), (500000, 1)],
+        levels=PRODUCTION.risk_model.levels,
+        rsi_tiers=RSI_TIERS,
+        vwap_tiers=VWAP_TIERS
+    ),
+    chain='ethereum'
+)
+
+ARBITRUM = Profile(
+    'arbitrum',
+    ThresholdFilter(min_liquidity=75000, min_change=3),
+    RiskModel(
+        base=2,
+        liquidity_tiers=[(75000, 4), (150000, 3), (400000, 2), (1000000, 1)],
+        change_tiers=[(100, 4), (50, 3), (25, 2), (10, 1)],
+        volume_tiers=[(50000, 2), (150000, 1)],
+        levels=PRODUCTION.risk_model.levels,
+        rsi_tiers=RSI_TIERS,
+        vwap_tiers=VWAP_TIERS
+    ),
+    chain='arbitrum'
+)
+
+CHAIN_PROFILES = {
+    'base': PRODUCTION,
+    'solana': SOLANA,
+    'ethereum': ETHEREUM,
+    'arbitrum': ARBITRUM
+}
+
+CHAIN_LABELS = {
+    'base': 'Base chain',
+    'solana': 'Solana',
+    'ethereum': 'Ethereum',
+    'arbitrum': 'Arbitrum'
+}
+
+# Short names accepted by /scan <chain>
+CHAIN_ALIASES = {'sol': 'solana', 'eth': 'ethereum', 'arb': 'arbitrum'}
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Ranker stage: order scored records, biggest movers first
+"""
+
+from typing import List, Dict, Any, Optional
+
+
+class ChangeRanker:
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+
+    def rank(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sort by |24h change| descending, keeping at most limit records"""
+        ranked = sorted(records, key=lambda x: abs(x['change_24h']), reverse=True)
+        return ranked[:self.limit] if self.limit else ranked
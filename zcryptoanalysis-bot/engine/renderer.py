@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Renderer stage: scored opportunities to Telegram, console or JSON reports
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any
+
+from .indicators import vwap_deviation
+
+SEPARATOR = "─" * 40 + "\n"
+
+
+class TelegramRenderer:
+    """Channel report used by production_bot"""
+
+    def __init__(self, top_n: int = 5, chain_label: str = 'Base chain'):
+        self.top_n = top_n
+        self.chain_label = chain_label
+
+    def format_opportunity(self, opp: Dict[str, Any]) -> str:
+        """Format opportunity for Telegram"""
+        emoji = "🚀" if opp['change_24h'] > 0 else "📉"
+        return (f"{emoji} **{opp['token']}** ({opp['name'][:20]}...)\n"
+                f"💰 Price: ${opp['price']:.8f}\n"
+                f"📈 Change: {opp['change_24h']:+.2f}%\n"
+                f"💧 Liquidity: ${opp['liquidity']:,}\n"
+                f"📊 Volume: ${opp['volume_24h']:,}\n"
+                f"{self.format_indicators(opp)}"
+                f"{self.format_group(opp)}"
+                f"{opp['risk_level']} ({opp['risk_score']}/10)\n")
+
+    def format_indicators(self, opp: Dict[str, Any]) -> str:
+        """EMA / RSI / VWAP line, empty when the pipeline does not track indicators"""
+        parts = []
+        if opp.get('ema') is not None:
+            parts.append(f"EMA ${opp['ema']:.8f}")
+        if opp.get('rsi') is not None:
+            parts.append(f"RSI {opp['rsi']:.0f}")
+        deviation = vwap_deviation(opp['price'], opp.get('vwap'))
+        if deviation is not None:
+            parts.append(f"VWAP ${opp['vwap']:.8f} ({deviation:+.1f}%)")
+        return f"📐 {' · '.join(parts)}\n" if parts else ""
+
+    def format_group(self, opp: Dict[str, Any]) -> str:
+        """Cross-pair line for tokens trading in several pools, empty otherwise"""
+        if not opp.get('pairs') or opp['pairs'] < 2:
+            return ""
+        # No liquidity-weighted average when every pool of the token is empty
+        average = f"${opp['weighted_price']:.8f}" if opp.get('weighted_price') is not None else "n/a"
+        line = (f"🔀 {opp['pairs']} pairs · Avg {average} · "
+                f"Total vol ${opp['total_volume']:,.0f} · Spread {opp['spread']:.1f}%")
+        if opp.get('arbitrage'):
+            line += " ⚡ Arbitrage"
+        return line + "\n"
+
+    def header(self, opportunities: List[Dict[str, Any]]) -> str:
+        """Report title and risk distribution, ending where the entries start"""
+        total = len(opportunities)
+        # Columnar snapshots expose the score column directly, so counting builds no rows
+        scores = getattr(opportunities, 'risk_scores', None)
+        if scores is None:
+            scores = [o['risk_score'] for o in opportunities]
+        low_risk = sum(1 for score in scores if score <= 3)
+        high_risk = sum(1 for score in scores if score > 7)
+
+        return (f"🎯 **Zcryptoanalysis Report**\n"
+                f"📊 Found **{total}** {self.chain_label} opportunities\n\n"
+                f"🔍 **Risk Distribution:**\n"
+                f"🟢 Low Risk: {low_risk}\n"
+                f"🟡 Medium Risk: {total - low_risk - high_risk}\n"
+                f"🔴 High Risk: {high_risk}\n\n"
+                f"📈 **Top Opportunities:**\n\n")
+
+    def render(self, opportunities: List[Dict[str, Any]]) -> str:
+        """Generate channel summary"""
+        if not opportunities:
+            return f"ℹ️ No {self.chain_label} opportunities found meeting criteria."
+
+        return self.header(opportunities) + SEPARATOR.join(
+            self.format_opportunity(opp) for opp in opportunities[:self.top_n])
+
+    def render_pages(self, opportunities: List[Dict[str, Any]], per_page: int = 5,
+                     max_chars: int = 3500) -> List[str]:
+        """Every opportunity, split into pages: the risk overview and first entries, then per_page entries each
+
+        A page also closes before it passes max_chars, leaving room under Telegram's
+        4096-character limit for data notices and social spikes
+        """
+        if not opportunities:
+            return [self.render(opportunities)]
+
+        header = self.header(opportunities)
+        groups: List[List[str]] = [[]]
+        size = len(header)
+        for opp in opportunities:
+            entry = self.format_opportunity(opp)
+            if groups[-1] and (len(groups[-1]) == per_page or size + len(SEPARATOR) + len(entry) > max_chars):
+                groups.append([])
+                # Room for the continuation title and page footer
+                size = 100
+            size += len(entry) + (len(SEPARATOR) if groups[-1] else 0)
+            groups[-1].append(entry)
+
+        pages = []
+        total, first = len(opportunities), 1
+        for i, group in enumerate(groups):
+            title = header if i == 0 else (f"📈 **{self.chain_label} opportunities "
+                                           f"{first}-{first + len(group) - 1} of {total}**\n\n")
+            page = title + SEPARATOR.join(group)
+            if len(groups) > 1:
+                page += f"\n📄 Page {i + 1}/{len(groups)}\n"
+            pages.append(page)
+            first += len(group)
+        return pages
+
+
+class ListRenderer:
+    """Short risk-dot list used by telegram_bot"""
+
+    def __init__(self, top_n: int = 5):
+        self.top_n = top_n
+
+    def render(self, opportunities: List[Dict[str, Any]]) -> str:
+        message = f"🎯 **Found {len(opportunities)} opportunities:**\n\n"
+        for opp in opportunities[:self.top_n]:
+            emoji = "🟢" if opp['risk_score'] <= 3 else "🟡" if opp['risk_score'] <= 6 else "🔴"
+            message += f"{emoji} **{opp['token']}** - ${opp['price']:.8f}\n"
+            message += f"📈 {opp['change_24h']:+.2f}% | 💧 ${opp['liquidity']:,} | Risk: {opp['risk_level']}\n\n"
+        return message
+
+
+class CompactRenderer:
+    """Three-line-per-token report used by the raw Bot API loops"""
+
+    def __init__(self, top_n: int = 5, chain_label: str = 'Base chain'):
+        self.top_n = top_n
+        self.chain_label = chain_label
+
+    def render(self, opportunities: List[Dict[str, Any]]) -> str:
+        if not opportunities:
+            return f"ℹ️ No {self.chain_label} opportunities found meeting criteria"
+
+        report = "🎯 **Zcryptoanalysis Report**\n\n"
+        report += f"📊 Found **{len(opportunities)}** {self.chain_label} opportunities\n\n"
+        for opp in opportunities[:self.top_n]:
+            emoji = "🚀" if opp['change_24h'] > 0 else "📉"
+            report += f"{emoji} **{opp['token']}** - ${opp['price']:.8f}\n"
+            report += f"📈 {opp['change_24h']:+.2f}% | 💧 ${opp['liquidity']:,}\n"
+            report += f"Risk: {opp['risk_level']} ({opp['risk_score']}/10)\n\n"
+        return report
+
+
+class ConsoleRenderer:
+    """Plain-text listing and risk summary for terminal runs"""
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+
+    def render(self, opportunities: List[Dict[str, Any]]) -> str:
+        lines = [f"\n🎯 Found {len(opportunities)} opportunities:", "-" * 60]
+
+        for i, opp in enumerate(opportunities[:self.top_n]):
+            lines.append(f"{i+1}. {opp['token']} - {opp['name'][:40]}")
+            lines.append(f"   💰 Price: ${opp['price']:.8f}")
+            lines.append(f"   📈 Change: {opp['change_24h']:+.2f}%")
+            lines.append(f"   💧 Liquidity: ${opp['liquidity']:,}")
+            lines.append(f"   📊 Volume: ${opp['volume_24h']:,}")
+            lines.append(f"   {opp['risk_level']} Risk ({opp['risk_score']}/10)")
+            lines.append("")
+
+        total = len(opportunities)
+        low_risk = len([o for o in opportunities if o['risk_score'] <= 3])
+        high_risk = len([o for o in opportunities if o['risk_score'] > 7])
+        lines.append("📈 Analysis Summary:")
+        lines.append(f"   Total opportunities: {total}")
+        lines.append(f"   Low risk: {low_risk}")
+        lines.append(f"   Medium risk: {total - low_risk - high_risk}")
+        lines.append(f"   High risk: {high_risk}")
+        return '\n'.join(lines)
+
+
+class JsonReportRenderer:
+    """Report dict saved by the async analyzers"""
+
+    def __init__(self, include_summary: bool = True):
+        self.include_summary = include_summary
+
+    def render(self, opportunities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        report = {
+            'timestamp': str(datetime.utcnow()),
+            'opportunities': opportunities,
+            'total_found': len(opportunities)
+        }
+        if self.include_summary:
+            report['summary'] = {
+                'low_risk': len([o for o in opportunities if o['risk_score'] <= 3]),
+                'medium_risk': len([o for o in opportunities if 3 < o['risk_score'] <= 5]),
+                'high_risk': len([o for o in opportunities if o['risk_score'] > 5])
+            }
+        return report
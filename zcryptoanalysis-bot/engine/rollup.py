@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Incremental OHLCV rollups over the ticker log: 1m candles are built from
+raw snapshots as they are appended, and each closed bucket cascades into
+5m, 1h and 1d. Retention is tiered, so raw rows only live for hours
+"""
+
+import argparse
+import os
+import struct
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Iterable
+
+from .ticker_log import TickerLog, MappedColumn, RECORD, DEFAULT_LOG_DIR, write_temp
+
+# Finest first: each resolution is built from the one before it
+RESOLUTIONS = {'1m': 60, '5m': 300, '1h': 3600, '1d': 86400}
+# Seconds of history kept per tier ('raw' is the ticker log itself); None keeps it forever
+RETENTION = {'raw': 6 * 3600, '1m': 7 * 86400, '5m': 30 * 86400, '1h': None, '1d': None}
+COMPACT_INTERVAL = 3600
+
+# bucket start, token id, samples, open, high, low, close, volume 24h, liquidity (at close)
+CANDLE = struct.Struct('<dIIdddddd')
+CANDLE_FILE = 'candles_{}.bin'
+
+# Positions in an open candle: [open, high, low, close, volume, liquidity, samples]
+OPEN, HIGH, LOW, CLOSE, VOLUME, LIQUIDITY, SAMPLES = range(7)
+
+
+def fold(current: list, c) -> list:
+    """Extend an open candle with a later one of the same token"""
+    if c[HIGH] > current[HIGH]:
+        current[HIGH] = c[HIGH]
+    if c[LOW] < current[LOW]:
+        current[LOW] = c[LOW]
+    current[CLOSE] = c[CLOSE]
+    current[VOLUME] = c[VOLUME]
+    current[LIQUIDITY] = c[LIQUIDITY]
+    current[SAMPLES] += c[SAMPLES]
+    return current
+
+
+class Level:
+    """One resolution: its candle file and the candles of the bucket still open"""
+    __slots__ = ('name', 'seconds', 'path', 'bucket', 'candles', 'map')
+
+    def __init__(self, name: str, seconds: int, path: str):
+        self.name = name
+        self.seconds = seconds
+        self.path = path
+        self.bucket = None
+        # token id -> open candle
+        self.candles: Dict[int, list] = {}
+        self.map = None
+
+
+class OHLCVRollup:
+    def __init__(self, log: TickerLog, retention: Dict[str, Optional[float]] = None):
+        self.log = log
+        self.retention = dict(RETENTION, **(retention or {}))
+        self.levels = [Level(name, seconds, os.path.join(log.directory, CANDLE_FILE.format(name)))
+                       for name, seconds in RESOLUTIONS.items()]
+        self.by_name = {level.name: level for level in self.levels}
+        self.compacted_at = 0.0
+        # Held while candles change and while queries copy them out, so readers on other
+        # threads never see a half-merged bucket or a file mid-compaction
+        self.lock = threading.RLock()
+        if not log.readonly:
+            for level in self.levels:
+                # Drop a torn trailing candle left by a crash mid-append
+                if os.path.exists(level.path):
+                    size = os.path.getsize(level.path)
+                    if size % CANDLE.size:
+                        os.truncate(level.path, size - size % CANDLE.size)
+
+    def refresh(self, level: Level) -> int:
+        """Map the level's candle file, returning how many candles it holds"""
+        level.map = self.log.mapping(level.path, CANDLE, level.map)
+        return len(level.map) // CANDLE.size if level.map is not None else 0
+
+    def last_bucket(self, level: Level) -> Optional[float]:
+        """Start of the newest flushed bucket of a level"""
+        count = self.refresh(level)
+        return CANDLE.unpack_from(level.map, (count - 1) * CANDLE.size)[0] if count else None
+
+    def flush(self, i: int, cascade: bool = True):
+        """Write a level's open bucket to its file and, optionally, merge it into the next level"""
+        level = self.levels[i]
+        if not level.candles:
+            return
+        payload = bytearray()
+        for token_id in sorted(level.candles):
+            c = level.candles[token_id]
+            payload += CANDLE.pack(level.bucket, token_id, c[SAMPLES], c[OPEN], c[HIGH], c[LOW], c[CLOSE],
+                                   c[VOLUME], c[LIQUIDITY])
+        with open(level.path, 'ab') as f:
+            f.write(payload)
+        if cascade and i + 1 < len(self.levels):
+            self.merge(i + 1, level.bucket, level.candles.items())
+        level.candles = {}
+
+    def merge(self, i: int, start: float, candles: Iterable[tuple], cascade: bool = True):
+        """Fold finer candles starting at a time into a level's open bucket"""
+        level = self.levels[i]
+        bucket = start - start % level.seconds
+        if level.bucket is not None and bucket > level.bucket:
+            self.flush(i, cascade)
+        level.bucket = bucket
+        for token_id, c in candles:
+            current = level.candles.get(token_id)
+            if current is None:
+                level.candles[token_id] = list(c)
+            else:
+                fold(current, c)
+
+    def snapshot_candles(self, rows: Iterable[tuple]) -> Dict[int, list]:
+        """One tick per token from a snapshot's (token id, price, liquidity, volume) rows
+
+        A token's price comes from its deepest pool; liquidity and volume are summed over its pools
+        """
+        ticks: Dict[int, list] = {}
+        depth: Dict[int, float] = {}
+        for token_id, price, liquidity, volume in rows:
+            tick = ticks.get(token_id)
+            if tick is None:
+                ticks[token_id] = [price, price, price, price, volume, liquidity, 1]
+                depth[token_id] = liquidity
+                continue
+            if liquidity > depth[token_id]:
+                depth[token_id] = liquidity
+                tick[OPEN] = tick[HIGH] = tick[LOW] = tick[CLOSE] = price
+            tick[VOLUME] += volume
+            tick[LIQUIDITY] += liquidity
+        return ticks
+
+    def add(self, records: List[Dict[str, Any]], timestamp: float):
+        """Roll one snapshot into the open 1m candles, flushing whatever buckets it closes"""
+        if self.log.readonly:
+            raise PermissionError('ticker log opened read-only')
+        token_id = self.log.token_id
+        with self.lock:
+            ticks = self.snapshot_candles((token_id(r), r['price'], r['liquidity'], r['volume_24h'])
+                                          for r in records)
+            if ticks:
+                self.merge(0, timestamp, ticks.items())
+            if timestamp - self.compacted_at >= COMPACT_INTERVAL:
+                self.compact(timestamp)
+
+    def catch_up(self) -> int:
+        """Rebuild the open buckets after a restart from the data below each level; returns snapshots replayed
+
+        Levels are replayed bottom-up with cascading off, so each one reads a finer
+        tier that is already complete
+        """
+        if self.log.readonly:
+            raise PermissionError('ticker log opened read-only')
+        with self.lock:
+            return self.replay()
+
+    def replay(self) -> int:
+        """catch_up's work, with the lock held"""
+        self.log.refresh()
+        zero = self.levels[0]
+        last = self.last_bucket(zero)
+        rows = self.log.record_range(last + zero.seconds if last is not None else 0.0, float('inf'))
+        snapshots = 0
+        if rows:
+            view = memoryview(self.log.data_map)[rows.start * RECORD.size:rows.stop * RECORD.size]
+            snapshot, current = [], None
+            for ts, token_id, price, liquidity, volume, _ in RECORD.iter_unpack(view):
+                if ts != current and snapshot:
+                    self.merge(0, current, self.snapshot_candles(snapshot).items(), cascade=False)
+                    snapshots += 1
+                    snapshot = []
+                current = ts
+                snapshot.append((token_id, price, liquidity, volume))
+            if snapshot:
+                self.merge(0, current, self.snapshot_candles(snapshot).items(), cascade=False)
+                snapshots += 1
+            view.release()
+
+        for i in range(1, len(self.levels)):
+            finer, level = self.levels[i - 1], self.levels[i]
+            last = self.last_bucket(level)
+            count = self.refresh(finer)
+            if not count:
+                continue
+            starts = MappedColumn(finer.map, CANDLE, count)
+            lo = bisect_left(starts, last + level.seconds) if last is not None else 0
+            batch, current = [], None
+            for start, token_id, samples, o, h, l, c, volume, liquidity in \
+                    CANDLE.iter_unpack(finer.map[lo * CANDLE.size:]):
+                if start != current and batch:
+                    self.merge(i, current, batch, cascade=False)
+                    batch = []
+                current = start
+                batch.append((token_id, (o, h, l, c, volume, liquidity, samples)))
+            if batch:
+                self.merge(i, current, batch, cascade=False)
+        return snapshots
+
+    def compact(self, now: float = None) -> Dict[str, int]:
+        """Drop raw rows and candles past their tier's retention; returns how many were dropped"""
+        now = time.time() if now is None else now
+        with self.lock:
+            self.compacted_at = now
+            dropped = {}
+            if self.retention['raw'] is not None:
+                dropped['raw'] = self.log.compact(now - self.retention['raw'])
+            for level in self.levels:
+                keep = self.retention.get(level.name)
+                count = self.refresh(level)
+                if keep is None or not count:
+                    continue
+                first = bisect_left(MappedColumn(level.map, CANDLE, count), now - keep)
+                if first:
+                    temp = write_temp(level.path, [memoryview(level.map)[first * CANDLE.size:]])
+                    os.replace(temp, level.path)
+                    self.refresh(level)
+                dropped[level.name] = first
+        return dropped
+
+    def candles(self, token: str, resolution: str = '1h', since: float = None,
+                until: float = None) -> List[Dict[str, Any]]:
+        """A token's candles between two times, including the bucket still open in this process
+
+        The result is a copy taken under the lock, safe to hand to another thread or process
+        """
+        with self.lock:
+            return self.query(token, resolution, since, until)
+
+    def query(self, token: str, resolution: str, since: Optional[float],
+              until: Optional[float]) -> List[Dict[str, Any]]:
+        """candles() with the lock held"""
+        level = self.by_name[resolution]
+        i = self.levels.index(level)
+        wanted = set(self.log.resolve(token))
+        if not wanted:
+            return []
+        since = since or 0.0
+        until = time.time() if until is None else until
+
+        candles = []
+        count = self.refresh(level)
+        if count:
+            starts = MappedColumn(level.map, CANDLE, count)
+            lo, hi = bisect_left(starts, since), bisect_right(starts, until)
+            view = memoryview(level.map)[lo * CANDLE.size:hi * CANDLE.size]
+            for start, token_id, samples, o, h, l, c, volume, liquidity in CANDLE.iter_unpack(view):
+                if token_id in wanted:
+                    candles.append(self.candle(start, token_id, (o, h, l, c, volume, liquidity, samples)))
+            view.release()
+        for token_id in sorted(wanted):
+            for start, c in self.live(i, token_id):
+                if since <= start <= until:
+                    candles.append(self.candle(start, token_id, c))
+        return candles
+
+    def live(self, i: int, token_id: int) -> List[tuple]:
+        """(bucket start, candle) of a token's unflushed buckets at a level, finer open buckets folded in"""
+        seconds = self.levels[i].seconds
+        buckets: Dict[float, list] = {}
+        # Coarse to fine is oldest to newest data
+        for level in reversed(self.levels[:i + 1]):
+            c = level.candles.get(token_id)
+            if c is None:
+                continue
+            bucket = level.bucket - level.bucket % seconds
+            if bucket in buckets:
+                fold(buckets[bucket], c)
+            else:
+                buckets[bucket] = list(c)
+        return sorted(buckets.items())
+
+    def token_version(self, token: str, resolution: str) -> tuple:
+        """(start, close, liquidity) of each of a token's newest candles at a resolution
+
+        Changes only when that token's chart would: a new bucket, or a new close or
+        liquidity in the open one. Other tokens' updates leave it alone
+        """
+        level = self.by_name[resolution]
+        i = self.levels.index(level)
+        with self.lock:
+            count = self.refresh(level)
+            version = []
+            for token_id in sorted(self.log.resolve(token)):
+                live = self.live(i, token_id)
+                if live:
+                    start, c = live[-1]
+                    version.append((start, c[CLOSE], c[LIQUIDITY]))
+                else:
+                    version.append(self.last_stored(level, count, token_id))
+        return tuple(version)
+
+    def last_stored(self, level: Level, count: int, token_id: int) -> tuple:
+        """(start, close, liquidity) of a token's candle in the level's newest stored bucket
+
+        Flushes write a bucket's candles sorted by token id, so this is two bisects. A
+        token missing from that bucket versions as the bucket start alone
+        """
+        if not count:
+            return (None,)
+        starts = MappedColumn(level.map, CANDLE, count)
+        newest = starts[count - 1]
+        lo = bisect_left(starts, newest)
+        j = bisect_left(MappedColumn(level.map, CANDLE, count, field=1), token_id, lo, count)
+        if j < count:
+            start, stored_id, _, _, _, _, close, _, liquidity = CANDLE.unpack_from(level.map, j * CANDLE.size)
+            if stored_id == token_id:
+                return start, close, liquidity
+        return (newest,)
+
+    def candle(self, start: float, token_id: int, c) -> Dict[str, Any]:
+        key, symbol = self.log.tokens[token_id]
+        return {
+            'timestamp': start,
+            'token': symbol,
+            'token_key': key,
+            'open': c[OPEN],
+            'high': c[HIGH],
+            'low': c[LOW],
+            'close': c[CLOSE],
+            'volume_24h': c[VOLUME],
+            'liquidity': c[LIQUIDITY],
+            'samples': c[SAMPLES]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Stored and open candle counts per resolution"""
+        return {level.name: {'candles': self.refresh(level), 'open': len(level.candles)} for level in self.levels}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query OHLCV candles rolled up from the ticker log')
+    parser.add_argument('token', nargs='?', help='symbol or token address (omit for candle counts)')
+    parser.add_argument('--resolution', choices=list(RESOLUTIONS), default='1h')
+    parser.add_argument('--days', type=float, default=7, help='how far back to look')
+    parser.add_argument('--dir', default=DEFAULT_LOG_DIR, help='log directory')
+    args = parser.parse_args()
+
+    rollup = OHLCVRollup(TickerLog(args.dir, readonly=True))
+    if not args.token:
+        print(rollup.stats())
+        return
+
+    start = time.perf_counter()
+    candles = rollup.candles(args.token, args.resolution, since=time.time() - args.days * 86400)
+    elapsed = (time.perf_counter() - start) * 1000
+    for c in candles:
+        print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(c['timestamp']))}  {c['token']:<10} "
+              f"O ${c['open']:.8f}  H ${c['high']:.8f}  L ${c['low']:.8f}  C ${c['close']:.8f}  "
+              f"liq ${c['liquidity']:,.0f}  vol ${c['volume_24h']:,.0f}")
+    print(f"📊 {len(candles)} {args.resolution} candles in {elapsed:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Adaptive polling: every tracked pair gets its own refresh cadence from
+recent volatility, volume and subscriber interest, kept in a due-time heap
+Due pairs are packed into full address batches under a request budget
+"""
+
+import heapq
+import math
+import time
+from typing import List, Dict, Any, Iterable
+
+from metrics import metrics
+from rate_limit import ChatRateLimiter
+
+BUDGET_KEY = 'dexscreener'
+
+
+class PairState:
+    __slots__ = ('price', 'volatility', 'volume', 'interest', 'interest_at', 'interval', 'polled_at')
+
+    def __init__(self, interval: float):
+        self.price = 0.0
+        # EWMA of |% move| between polls
+        self.volatility = 0.0
+        self.volume = 0.0
+        self.interest = 0.0
+        self.interest_at = 0.0
+        self.interval = interval
+        self.polled_at = None
+
+
+class PollScheduler:
+    def __init__(self, min_interval: float = 15, max_interval: float = 600, requests_per_minute: float = 60,
+                 batch_size: int = 30, piggyback: float = 60, volatility_ref: float = 2.0,
+                 volume_ref: float = 1000000, interest_ref: float = 5, interest_half_life: float = 1800):
+        # Cadence runs geometrically from max_interval (cold) to min_interval (hot)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        # Pairs due within this many seconds ride along in a batch that has room
+        self.piggyback = piggyback
+        # Values at which each heat component saturates
+        self.volatility_ref = volatility_ref
+        self.volume_ref = volume_ref
+        self.interest_ref = interest_ref
+        self.interest_half_life = interest_half_life
+        # One token per request; a full minute's worth may be spent at once
+        self.budget = ChatRateLimiter(requests_per_minute, burst=max(1, int(requests_per_minute)), max_chats=1)
+
+        self.pairs: Dict[str, PairState] = {}
+        self.due_at: Dict[str, float] = {}
+        # (due time, sequence, address); superseded entries are skipped when popped
+        self.heap: List[tuple] = []
+        self.sequence = 0
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def schedule(self, address: str, due: float):
+        self.due_at[address] = due
+        self.sequence += 1
+        heapq.heappush(self.heap, (due, self.sequence, address))
+
+    def track(self, addresses: Iterable[str], now: float = None):
+        """Start polling pairs, first refresh right away"""
+        now = time.monotonic() if now is None else now
+        for address in addresses:
+            if address and address not in self.pairs:
+                self.pairs[address] = PairState(self.max_interval)
+                self.schedule(address, now)
+        metrics.set_gauge('scheduler_tracked_pairs', len(self.pairs))
+
+    def untrack(self, addresses: Iterable[str]):
+        for address in addresses:
+            self.pairs.pop(address, None)
+            self.due_at.pop(address, None)
+        metrics.set_gauge('scheduler_tracked_pairs', len(self.pairs))
+
+    def current_interest(self, state: PairState, now: float) -> float:
+        return state.interest * 0.5 ** ((now - state.interest_at) / self.interest_half_life)
+
+    def add_interest(self, address: str, weight: float = 1.0, now: float = None):
+        """A user looked at or subscribed to a pair: decaying boost, and pull its next poll in"""
+        now = time.monotonic() if now is None else now
+        state = self.pairs.get(address)
+        if state is None:
+            return
+        state.interest = self.current_interest(state, now) + weight
+        state.interest_at = now
+        if state.polled_at is not None:
+            self.reschedule(address, state, now)
+
+    def heat(self, state: PairState, now: float) -> float:
+        """0 (dormant) .. 1 (hot) from volatility, volume and interest, each saturating at its ref"""
+        return (0.5 * min(1.0, state.volatility / self.volatility_ref)
+                + 0.25 * min(1.0, state.volume / self.volume_ref)
+                + 0.25 * min(1.0, self.current_interest(state, now) / self.interest_ref))
+
+    def interval_for(self, state: PairState, now: float) -> float:
+        return self.max_interval * (self.min_interval / self.max_interval) ** self.heat(state, now)
+
+    def reschedule(self, address: str, state: PairState, now: float):
+        """Next due time from the pair's current cadence and last poll, if sooner than already queued"""
+        state.interval = self.interval_for(state, now)
+        due = max(now, state.polled_at + state.interval)
+        if due < self.due_at.get(address, math.inf):
+            self.schedule(address, due)
+
+    def observe(self, rows: List[Dict], requested: Iterable[str] = (), now: float = None):
+        """Fold fetched pair rows into each pair's stats and schedule its next poll"""
+        now = time.monotonic() if now is None else now
+        # Requested pairs missing from the response (failed batch, delisted) go back in the queue
+        missing = set(requested)
+        for row in rows:
+            address = row.get('pairAddress')
+            missing.discard(address)
+            state = self.pairs.get(address)
+            if state is None:
+                continue
+            try:
+                price = float(row.get('priceUsd') or 0)
+                volume = float((row.get('volume') or {}).get('h24', 0))
+            except (TypeError, ValueError):
+                price, volume = state.price, state.volume
+            if state.price and price:
+                move = abs(price - state.price) / state.price * 100
+                state.volatility += 0.3 * (move - state.volatility)
+            state.price = price or state.price
+            state.volume = volume
+            state.polled_at = now
+            self.due_at.pop(address, None)
+            self.reschedule(address, state, now)
+        for address in missing:
+            state = self.pairs.get(address)
+            if state is not None and address not in self.due_at:
+                state.polled_at = now
+                self.reschedule(address, state, now)
+
+    def retry(self, addresses: Iterable[str], now: float = None):
+        """Requested pairs whose batch failed: due again after min_interval, their stats untouched"""
+        now = time.monotonic() if now is None else now
+        for address in addresses:
+            if address in self.pairs and now + self.min_interval < self.due_at.get(address, math.inf):
+                self.schedule(address, now + self.min_interval)
+        metrics.inc('scheduler_retries')
+
+    def drop_stale(self):
+        """Discard superseded entries at the top of the heap"""
+        while self.heap and self.due_at.get(self.heap[0][2]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def pop_due(self, horizon: float) -> str:
+        """Address of the earliest queued pair due by horizon, or None"""
+        self.drop_stale()
+        if not self.heap or self.heap[0][0] > horizon:
+            return None
+        _, _, address = heapq.heappop(self.heap)
+        del self.due_at[address]
+        return address
+
+    def due(self, now: float = None) -> List[str]:
+        """Addresses to fetch now, in full batches, spending at most the available budget"""
+        now = time.monotonic() if now is None else now
+        batch: List[str] = []
+        addresses: List[str] = []
+        while True:
+            if not batch:
+                self.drop_stale()
+                if not self.heap or self.heap[0][0] > now:
+                    break
+                allowed, _ = self.budget.allow(BUDGET_KEY, now)
+                if not allowed:
+                    metrics.inc('scheduler_deferred_polls', sum(1 for d in self.due_at.values() if d <= now))
+                    break
+                metrics.inc('scheduler_requests')
+            # Overdue pairs first; once none are left, top the batch up with ones due soon
+            address = self.pop_due(now) or self.pop_due(now + self.piggyback)
+            if address is None:
+                break
+            batch.append(address)
+            if len(batch) == self.batch_size:
+                addresses.extend(batch)
+                batch = []
+        addresses.extend(batch)
+        return addresses
+
+    def stats(self, now: float = None) -> Dict[str, Any]:
+        now = time.monotonic() if now is None else now
+        intervals = sorted(state.interval for state in self.pairs.values())
+        return {
+            'pairs': len(self.pairs),
+            'queued': len(self.due_at),
+            'overdue': sum(1 for due in self.due_at.values() if due <= now),
+            'fastest_interval': intervals[0] if intervals else None,
+            'median_interval': intervals[len(intervals) // 2] if intervals else None
+        }
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Filter and scorer stages: threshold gate plus tiered 1-10 risk scoring
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Tuple, Optional
+
+from .indicators import vwap_deviation
+
+Tiers = List[Tuple[float, int]]
+
+
+class ThresholdFilter:
+    def __init__(self, min_liquidity: float = 50000, min_change: float = 3,
+                 min_volume: Optional[float] = None, change_inclusive: bool = True):
+        self.min_liquidity = min_liquidity
+        self.min_change = min_change
+        self.min_volume = min_volume
+        self.change_inclusive = change_inclusive
+
+    def accepts(self, record: Dict[str, Any]) -> bool:
+        """Liquidity floor, |24h change| floor and optional volume floor"""
+        if record['liquidity'] < self.min_liquidity:
+            return False
+        change = abs(record['change_24h'])
+        if change < self.min_change or (not self.change_inclusive and change == self.min_change):
+            return False
+        if self.min_volume is not None and record['volume_24h'] <= self.min_volume:
+            return False
+        return True
+
+    def apply(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Records passing every threshold"""
+        return [r for r in records if self.accepts(r)]
+
+
+class RiskModel:
+    """Tier tables for a risk score; each entry point keeps its own calibration"""
+
+    def __init__(self, base: int, liquidity_tiers: Tiers, change_tiers: Tiers,
+                 volume_tiers: Tiers = None, levels: List[Tuple[int, str]] = None, cap: int = 10,
+                 rsi_tiers: Tiers = None, vwap_tiers: Tiers = None):
+        # liquidity/volume tiers: (upper bound, points), first bound the value is below wins
+        # change tiers: (lower bound, points), first bound the value is above wins
+        # rsi tiers: (lower bound on |RSI - 50|, points); vwap tiers: (lower bound on |% off VWAP|, points)
+        self.base = base
+        self.liquidity_tiers = liquidity_tiers
+        self.change_tiers = change_tiers
+        self.volume_tiers = volume_tiers or []
+        self.levels = levels or []
+        self.cap = cap
+        self.rsi_tiers = rsi_tiers or []
+        self.vwap_tiers = vwap_tiers or []
+
+    def risk_level(self, score: int) -> str:
+        """Label for a score"""
+        for max_score, label in self.levels:
+            if score <= max_score:
+                return label
+        return self.levels[-1][1] if self.levels else ''
+
+    def indicator_points(self, rsi: Optional[float], deviation: Optional[float]) -> int:
+        """Extra points for overbought/oversold RSI and price far off its VWAP (0 while warming up)"""
+        points = 0
+        if rsi is not None:
+            for bound, tier_points in self.rsi_tiers:
+                if abs(rsi - 50) > bound:
+                    points += tier_points
+                    break
+        if deviation is not None:
+            for bound, tier_points in self.vwap_tiers:
+                if abs(deviation) > bound:
+                    points += tier_points
+                    break
+        return points
+
+class ScalarScorer:
+    """Scores one record at a time by walking the tier tables"""
+
+    def __init__(self, model: RiskModel):
+        self.model = model
+
+    def score(self, liquidity: float, volume: float, change: float,
+              rsi: Optional[float] = None, deviation: Optional[float] = None) -> int:
+        """Risk score 1-10 from liquidity, 24h volume, |24h change| and any indicators"""
+        score = self.model.base + self.model.indicator_points(rsi, deviation)
+
+        for bound, points in self.model.liquidity_tiers:
+            if liquidity < bound:
+                score += points
+                break
+
+        for bound, points in self.model.change_tiers:
+            if change > bound:
+                score += points
+                break
+
+        for bound, points in self.model.volume_tiers:
+            if volume < bound:
+                score += points
+                break
+
+        return min(score, self.model.cap)
+
+    def score_all(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Annotate records with risk_score and risk_level"""
+        for record in records:
+            score = self.score(record['liquidity'], record['volume_24h'], abs(record['change_24h']),
+                               record.get('rsi'), vwap_deviation(record['price'], record.get('vwap')))
+            record['risk_score'] = score
+            record['risk_level'] = self.model.risk_level(score)
+        return records
+
+
+class ColumnScorer:
+    """Scores whole columns with bisect lookups into precomputed tier tables"""
+
+    def __init__(self, model: RiskModel):
+        self.model = model
+        self.liquidity = self.below_table(model.liquidity_tiers)
+        self.volume = self.below_table(model.volume_tiers)
+        change = sorted(model.change_tiers)
+        self.change_bounds = [bound for bound, _ in change]
+        self.change_points = [points for _, points in change]
+        self.labels = {}
+
+    @staticmethod
+    def below_table(tiers: Tiers) -> Tuple[List[float], List[int]]:
+        """Bounds and points for 'value < bound' tiers, with 0 points past the last bound"""
+        return [bound for bound, _ in tiers], [points for _, points in tiers] + [0]
+
+    def points_below(self, table: Tuple[List[float], List[int]], values: List[float]) -> List[int]:
+        bounds, points = table
+        return [points[bisect_right(bounds, v)] for v in values]
+
+    def points_above(self, values: List[float]) -> List[int]:
+        bounds, points = self.change_bounds, self.change_points
+        result = []
+        for v in values:
+            i = bisect_left(bounds, v)
+            result.append(points[i - 1] if i else 0)
+        return result
+
+    def score_columns(self, liquidity: List[float], volume: List[float], change: List[float]) -> List[int]:
+        """Scores for parallel columns of liquidity, volume and |change|"""
+        base, cap = self.model.base, self.model.cap
+        return [min(base + a + b + c, cap) for a, b, c in zip(
+            self.points_below(self.liquidity, liquidity),
+            self.points_above(change),
+            self.points_below(self.volume, volume))]
+
+    def score(self, liquidity: float, volume: float, change: float,
+              rsi: Optional[float] = None, deviation: Optional[float] = None) -> int:
+        score = self.score_columns([liquidity], [volume], [change])[0]
+        return min(score + self.model.indicator_points(rsi, deviation), self.model.cap)
+
+    def score_all(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Annotate records with risk_score and risk_level in one columnar pass"""
+        scores = self.score_columns([r['liquidity'] for r in records],
+                                    [r['volume_24h'] for r in records],
+                                    [abs(r['change_24h']) for r in records])
+        model = self.model
+        if model.rsi_tiers or model.vwap_tiers:
+            scores = [min(score + model.indicator_points(r.get('rsi'), vwap_deviation(r['price'], r.get('vwap'))),
+                          model.cap) for r, score in zip(records, scores)]
+        for record, score in zip(records, scores):
+            label = self.labels.get(score)
+            if label is None:
+                label = self.labels[score] = self.model.risk_level(score)
+            record['risk_score'] = score
+            record['risk_level'] = label
+        return records
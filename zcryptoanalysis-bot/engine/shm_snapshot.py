@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Columnar snapshot buffer in shared memory (an mmap'd file, /dev/shm by default)
+The scanner writes each scored snapshot once; bot workers read it in place
+under a seqlock, so N readers cost no copies and no deserialization per /scan
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from metrics import metrics
+
+from .indicators import INDICATOR_FIELDS
+
+MAGIC = b'ZCSN'
+LAYOUT_VERSION = 4
+
+# magic, layout, chain count, seq, version, published_at, snapshot_time,
+# data source, total rows, string blob bytes, extras bytes, reserved
+HEADER = struct.Struct('<4sHHQQdd16sIIII')
+SEQ = struct.Struct('<Q')
+SEQ_OFFSET = 8
+# chain id, first row, row count
+CHAIN_ENTRY = struct.Struct('<16sII')
+
+NUMERIC_FIELDS = ('price', 'change_24h', 'liquidity', 'volume_24h')
+# float64 columns that may be missing (indicators still warming up); stored as NaN
+OPTIONAL_FIELDS = INDICATOR_FIELDS + ('weighted_price', 'total_volume', 'spread')
+# int32 columns that may be missing, stored as -1, with the type rows get back
+OPTIONAL_INT_FIELDS = {'pairs': int, 'arbitrage': bool}
+STRING_FIELDS = ('token', 'name', 'risk_level', 'pair_address', 'token_address', 'chain_id')
+
+READ_RETRIES = 100
+DEFAULT_SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+DEFAULT_SHM_PATH = os.path.join(DEFAULT_SHM_DIR, 'zcryptoanalysis.snapshot')
+
+
+def body_layout(chain_count: int, rows: int) -> Dict[str, Tuple[int, int]]:
+    """(offset, bytes) of every section after the header; numeric columns stay 8-byte aligned"""
+    layout = {}
+    offset = HEADER.size
+    layout['chains'] = (offset, chain_count * CHAIN_ENTRY.size)
+    offset += chain_count * CHAIN_ENTRY.size
+    offset += -offset % 8
+    for field in NUMERIC_FIELDS + OPTIONAL_FIELDS:
+        layout[field] = (offset, rows * 8)
+        offset += rows * 8
+    for field in OPTIONAL_INT_FIELDS:
+        layout[field] = (offset, rows * 4)
+        offset += rows * 4
+    layout['risk_score'] = (offset, rows)
+    offset += rows
+    offset += -offset % 4
+    for field in STRING_FIELDS:
+        layout[field] = (offset, (rows + 1) * 4)
+        offset += (rows + 1) * 4
+    layout['strings'] = (offset, 0)
+    return layout
+
+
+class ChainColumns:
+    """One chain's rows as zero-copy column views; a row becomes a dict only when indexed"""
+
+    def __init__(self, chain: str, columns: Dict[str, memoryview], blob: memoryview, start: int, count: int):
+        self.chain = chain
+        self.columns = columns
+        self.blob = blob
+        self.start = start
+        self.count = count
+
+    @property
+    def risk_scores(self) -> memoryview:
+        """Risk score column for this chain, for aggregate counts without building rows"""
+        return self.columns['risk_score'][self.start:self.start + self.count]
+
+    def string(self, field: str, row: int) -> str:
+        """Decode one string cell from the shared blob"""
+        offsets = self.columns[field]
+        return bytes(self.blob[offsets[row]:offsets[row + 1]]).decode()
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Materialize row i of this chain as an opportunity dict"""
+        row = self.start + i
+        record = {field: self.columns[field][row] for field in NUMERIC_FIELDS}
+        for field in OPTIONAL_FIELDS:
+            value = self.columns[field][row]
+            record[field] = None if math.isnan(value) else value
+        for field, kind in OPTIONAL_INT_FIELDS.items():
+            value = self.columns[field][row]
+            record[field] = None if value < 0 else kind(value)
+        record.update((field, self.string(field, row)) for field in STRING_FIELDS)
+        record['risk_score'] = self.columns['risk_score'][row]
+        # Sections mixing chains (every pair of the snapshot) carry each row's own
+        record['chain_id'] = record['chain_id'] or self.chain
+        return record
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.row(index)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.row(i)
+
+
+class ColumnarSnapshotWriter:
+    """Scanner side: one writer per buffer file"""
+
+    def __init__(self, path: str = DEFAULT_SHM_PATH):
+        self.path = path
+        self.fd = None
+        self.mm = None
+        self.version = 0
+        self.snapshot_time = 0.0
+
+    async def start(self):
+        """Open or create the buffer, continuing the version sequence of a previous scanner"""
+        self.open()
+
+    def open(self):
+        """Map the buffer file, initializing the header of a new one"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o640)
+        size = os.fstat(self.fd).st_size
+        if size < HEADER.size:
+            os.ftruncate(self.fd, mmap.PAGESIZE)
+            size = mmap.PAGESIZE
+        self.mm = mmap.mmap(self.fd, size)
+
+        header = HEADER.unpack_from(self.mm, 0)
+        if header[0] == MAGIC and header[1] == LAYOUT_VERSION:
+            self.version, self.snapshot_time = header[4], header[6]
+            # A crash mid-write leaves seq odd; make it even so readers can proceed
+            if header[3] % 2:
+                SEQ.pack_into(self.mm, SEQ_OFFSET, header[3] + 1)
+        else:
+            HEADER.pack_into(self.mm, 0, MAGIC, LAYOUT_VERSION, 0, 0, 0, 0.0, 0.0, b'', 0, 0, 0, 0)
+
+    def ensure_capacity(self, size: int):
+        """Grow the file (doubling) when a snapshot does not fit; readers remap on demand"""
+        if size <= len(self.mm):
+            return
+        capacity = len(self.mm)
+        while capacity < size:
+            capacity *= 2
+        os.ftruncate(self.fd, capacity)
+        self.mm.resize(capacity)
+
+    def next_version(self) -> int:
+        """Strictly increasing, and wall-clock based so a restarted scanner keeps moving forward"""
+        self.version = max(self.version + 1, time.time_ns() // 1000)
+        return self.version
+
+    def encode(self, chains: Dict[str, List[Dict[str, Any]]]) -> Tuple[List[Tuple[str, int, int]], Dict[str, array], bytes]:
+        """Chain directory, column arrays and string blob for the snapshot's opportunities"""
+        directory = []
+        columns = {field: array('d') for field in NUMERIC_FIELDS + OPTIONAL_FIELDS}
+        columns.update((field, array('i')) for field in OPTIONAL_INT_FIELDS)
+        columns['risk_score'] = array('b')
+        blob = bytearray()
+
+        row = 0
+        for chain, opportunities in chains.items():
+            directory.append((chain, row, len(opportunities)))
+            for opp in opportunities:
+                for field in NUMERIC_FIELDS:
+                    columns[field].append(float(opp[field]))
+                for field in OPTIONAL_FIELDS:
+                    value = opp.get(field)
+                    columns[field].append(math.nan if value is None else float(value))
+                for field in OPTIONAL_INT_FIELDS:
+                    value = opp.get(field)
+                    columns[field].append(-1 if value is None else int(value))
+                columns['risk_score'].append(int(opp['risk_score']))
+                row += 1
+        # Strings are grouped per field so each field's offsets are monotonic
+        for field in STRING_FIELDS:
+            columns[field] = array('I', [len(blob)])
+            for opportunities in chains.values():
+                for opp in opportunities:
+                    blob += str(opp.get(field) or '').encode()
+                    columns[field].append(len(blob))
+        return directory, columns, bytes(blob)
+
+    def publish(self, snapshot: Dict[str, Any]) -> Optional[int]:
+        """Write a snapshot (the bus payload shape) into the buffer; returns its version"""
+        if self.mm is None:
+            self.open()
+        snapshot_time = snapshot.get('snapshot_time') or 0.0
+        if snapshot_time < self.snapshot_time:
+            # e.g. a restored copy from disk that is older than what workers already see
+            metrics.inc('shm_stale_publishes')
+            return None
+
+        directory, columns, blob = self.encode(snapshot['chains'])
+        extras = json.dumps({'spikes': snapshot.get('spikes') or []}, separators=(',', ':')).encode()
+        rows = len(columns['risk_score'])
+        layout = body_layout(len(directory), rows)
+        strings_offset = layout['strings'][0]
+        self.ensure_capacity(strings_offset + len(blob) + len(extras))
+
+        seq = SEQ.unpack_from(self.mm, SEQ_OFFSET)[0]
+        SEQ.pack_into(self.mm, SEQ_OFFSET, seq + 1)
+
+        offset, _ = layout['chains']
+        for chain, start, count in directory:
+            CHAIN_ENTRY.pack_into(self.mm, offset, chain.encode()[:16], start, count)
+            offset += CHAIN_ENTRY.size
+        for field, values in columns.items():
+            offset, size = layout[field]
+            self.mm[offset:offset + size] = values.tobytes()
+        self.mm[strings_offset:strings_offset + len(blob)] = blob
+        self.mm[strings_offset + len(blob):strings_offset + len(blob) + len(extras)] = extras
+
+        version = self.next_version()
+        self.snapshot_time = snapshot_time
+        HEADER.pack_into(self.mm, 0, MAGIC, LAYOUT_VERSION, len(directory), seq + 1, version, time.time(),
+                         snapshot_time, snapshot.get('data_source', 'none').encode()[:16],
+                         rows, len(blob), len(extras), 0)
+        SEQ.pack_into(self.mm, SEQ_OFFSET, seq + 2)
+
+        metrics.inc('shm_published')
+        metrics.set_gauge('shm_snapshot_bytes', strings_offset + len(blob) + len(extras))
+        return version
+
+    async def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            os.close(self.fd)
+            self.mm = None
+
+
+class ColumnarSnapshotReader:
+    """Worker side: reads the latest snapshot in place, retrying while the scanner is mid-write"""
+
+    def __init__(self, path: str = DEFAULT_SHM_PATH):
+        self.path = path
+        self.mm = None
+        self.meta: Optional[Dict[str, Any]] = None
+
+    def mapping(self, size: int = 0) -> Optional[mmap.mmap]:
+        """Read-only map of the buffer, remapped when the scanner has grown the file"""
+        if self.mm is not None and len(self.mm) >= size:
+            return self.mm
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        try:
+            file_size = os.fstat(fd).st_size
+            if file_size < max(size, HEADER.size):
+                return None
+            # Any previous map is dropped, not closed: column views may still reference it
+            self.mm = mmap.mmap(fd, file_size, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        return self.mm
+
+    def read_consistent(self, read: Callable[[mmap.mmap, tuple], Any]) -> Optional[Tuple[int, Any]]:
+        """Run read(mm, header) under the seqlock; (version, result), or None when nothing is published"""
+        for _ in range(READ_RETRIES):
+            mm = self.mapping()
+            if mm is None:
+                return None
+            header = HEADER.unpack_from(mm, 0)
+            seq = header[3]
+            if header[0] != MAGIC or header[1] != LAYOUT_VERSION or seq == 0:
+                return None
+            if seq % 2:
+                time.sleep(0)
+                continue
+
+            size = body_layout(header[2], header[8])['strings'][0] + header[9] + header[10]
+            mm = self.mapping(size)
+            if mm is None:
+                continue
+            try:
+                result = read(mm, header)
+            except (IndexError, ValueError, UnicodeDecodeError):
+                # Torn read; the seq check below decides whether to retry or surface it
+                result = None
+                if SEQ.unpack_from(mm, SEQ_OFFSET)[0] == seq:
+                    raise
+            if SEQ.unpack_from(mm, SEQ_OFFSET)[0] == seq:
+                return header[4], result
+            metrics.inc('shm_read_retries')
+        raise RuntimeError('snapshot buffer kept changing while being read')
+
+    @property
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Snapshot metadata (version, data source, snapshot time, spikes), None until published"""
+        header = self.mapping() and HEADER.unpack_from(self.mm, 0)
+        if self.meta is not None and header and header[4] == self.meta['version']:
+            return self.meta
+
+        def read_meta(mm, header):
+            layout = body_layout(header[2], header[8])
+            extras_offset = layout['strings'][0] + header[9]
+            extras = json.loads(bytes(mm[extras_offset:extras_offset + header[10]]) or b'{}')
+            return {
+                'version': header[4],
+                'published_at': header[5],
+                'snapshot_time': header[6] or None,
+                'data_source': header[7].rstrip(b'\0').decode(),
+                'spikes': extras.get('spikes', [])
+            }
+
+        result = self.read_consistent(read_meta)
+        if result is None:
+            return None
+        self.meta = result[1]
+        return self.meta
+
+    def columns(self, mm: mmap.mmap, header: tuple, chain: str) -> ChainColumns:
+        """Zero-copy views of one chain's rows (empty when the chain is not in the snapshot)"""
+        chain_count, rows = header[2], header[8]
+        layout = body_layout(chain_count, rows)
+        view = memoryview(mm)
+
+        columns = {}
+        for field in NUMERIC_FIELDS + OPTIONAL_FIELDS:
+            offset, size = layout[field]
+            columns[field] = view[offset:offset + size].cast('d')
+        for field in OPTIONAL_INT_FIELDS:
+            offset, size = layout[field]
+            columns[field] = view[offset:offset + size].cast('i')
+        offset, size = layout['risk_score']
+        columns['risk_score'] = view[offset:offset + size].cast('b')
+        for field in STRING_FIELDS:
+            offset, size = layout[field]
+            columns[field] = view[offset:offset + size].cast('I')
+        strings_offset = layout['strings'][0]
+        blob = view[strings_offset:strings_offset + header[9]]
+
+        offset = layout['chains'][0]
+        for _ in range(chain_count):
+            name, start, count = CHAIN_ENTRY.unpack_from(mm, offset)
+            offset += CHAIN_ENTRY.size
+            if name.rstrip(b'\0').decode() == chain:
+                return ChainColumns(chain, columns, blob, start, count)
+        return ChainColumns(chain, columns, blob, 0, 0)
+
+    def render(self, chain: str, render: Callable[[ChainColumns], Any]) -> Optional[Tuple[int, Any]]:
+        """(version, render(rows)) for one chain, computed directly over the shared buffer"""
+        return self.read_consistent(lambda mm, header: render(self.columns(mm, header, chain)))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+On-disk copy of the last good snapshot and rendered report
+Lets a restarted process answer /scan before its first fetch completes
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, Any, Optional
+
+from .pipeline import ScanResult
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+
+class SnapshotStore:
+    def __init__(self, path: str):
+        self.path = path
+
+    def save(self, pipeline) -> bool:
+        """Atomically write the fetcher state and last result; safe to call from a worker thread"""
+        result = pipeline.last_result
+        if result is None or pipeline.fetcher.data_source != 'live':
+            return False
+
+        payload = {
+            'version': STORE_VERSION,
+            'saved_at': time.time(),
+            'fetcher': pipeline.fetcher.export_state(),
+            'opportunities': result.opportunities,
+            'report': result.report
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, separators=(',', ':'), default=str)
+        os.replace(tmp_path, self.path)
+        return True
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Saved payload, or None when missing, unreadable or from another version"""
+        try:
+            with open(self.path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f'Ignoring unreadable snapshot cache {self.path}: {e}')
+            return None
+        if payload.get('version') != STORE_VERSION:
+            return None
+        return payload
+
+    def restore(self, pipeline) -> bool:
+        """Seed the pipeline's fetcher and last result from disk"""
+        payload = self.load()
+        if payload is None:
+            return False
+
+        pipeline.fetcher.restore_state(payload['fetcher'])
+        rows = pipeline.parser.select_chain(pipeline.fetcher.cached_rows)
+        pipeline.last_result = ScanResult(rows, payload['opportunities'], payload['report'])
+        return True
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Append-only binary log of ticker snapshots with a sidecar time index
+Fixed-width records are read through mmap; a per-token list of record numbers,
+kept in memory and extended as the log grows, turns a token's history over a
+time window into a bisect on the index plus reads of only that token's records
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Optional, Iterable
+
+# timestamp, token id, price, liquidity, volume 24h, change 24h
+RECORD = struct.Struct('<dI4xdddd')
+# snapshot timestamp, number of the snapshot's first record
+INDEX_ENTRY = struct.Struct('<dQ')
+# The token id column seen as 32-bit words: the third word of every record
+TOKEN_ID_WORD = 2
+RECORD_WORDS = RECORD.size // 4
+
+DATA_FILE = 'tickers.log'
+INDEX_FILE = 'tickers.idx'
+TOKENS_FILE = 'tokens.tsv'
+
+DEFAULT_LOG_DIR = os.getenv('TICKER_LOG_DIR', '/var/tmp/zcryptoanalysis/ticker-log')
+
+
+def token_key(record: Dict[str, Any]) -> str:
+    """Stable identity for a token: its address, or its symbol when there is none"""
+    address = (record.get('token_address') or '').lower()
+    return address or record['token'].upper()
+
+
+def write_temp(path: str, chunks: Iterable[bytes]) -> str:
+    """Write chunks to a sibling temp file, to be swapped in with os.replace"""
+    temp = path + '.compact'
+    with open(temp, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+    return temp
+
+
+class MappedColumn:
+    """Sequence view of one fixed-width field across an mmap'd file, for bisect"""
+
+    def __init__(self, mm: mmap.mmap, entry: struct.Struct, count: int, field: int = 0):
+        self.mm = mm
+        self.entry = entry
+        self.count = count
+        self.field = field
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int):
+        return self.entry.unpack_from(self.mm, i * self.entry.size)[self.field]
+
+
+class TickerLog:
+    def __init__(self, directory: str = DEFAULT_LOG_DIR, readonly: bool = False):
+        self.directory = directory
+        self.readonly = readonly
+        self.data_path = os.path.join(directory, DATA_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.tokens_path = os.path.join(directory, TOKENS_FILE)
+
+        # token id -> (key, symbol); key -> id; symbol -> ids
+        self.tokens: List[tuple] = []
+        self.ids: Dict[str, int] = {}
+        self.by_symbol: Dict[str, List[int]] = {}
+        self.tokens_size = 0
+
+        self.data_map = None
+        self.index_map = None
+        # path -> inode of the current map, so a compacted (replaced) file is remapped
+        self.inodes: Dict[str, int] = {}
+        # token id -> its record numbers in log order, covering the first `indexed` records
+        self.postings: Dict[int, array] = {}
+        self.indexed = 0
+        if not readonly:
+            os.makedirs(directory, exist_ok=True)
+            self.repair()
+        self.load_tokens()
+
+    def repair(self):
+        """Drop a torn trailing record or index entry left by a crash mid-append"""
+        for path, entry in ((self.data_path, RECORD), (self.index_path, INDEX_ENTRY)):
+            if not os.path.exists(path):
+                open(path, 'ab').close()
+                continue
+            size = os.path.getsize(path)
+            if size % entry.size:
+                os.truncate(path, size - size % entry.size)
+
+    def load_tokens(self):
+        """Read token ids appended since the last load (other processes may be writing)"""
+        try:
+            with open(self.tokens_path, 'rb') as f:
+                f.seek(self.tokens_size)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        # Ignore a partially written last line
+        chunk = chunk[:chunk.rfind(b'\n') + 1]
+        self.tokens_size += len(chunk)
+        for line in chunk.decode().splitlines():
+            key, symbol = line.split('\t')[1:3]
+            self.register(key, symbol)
+
+    def register(self, key: str, symbol: str) -> int:
+        """Add a token to the in-memory tables"""
+        token_id = len(self.tokens)
+        self.tokens.append((key, symbol))
+        self.ids[key] = token_id
+        self.by_symbol.setdefault(symbol.upper(), []).append(token_id)
+        return token_id
+
+    def token_id(self, record: Dict[str, Any]) -> int:
+        """Id for a record's token, assigning and persisting a new one on first sight"""
+        key = token_key(record)
+        token_id = self.ids.get(key)
+        if token_id is None:
+            token_id = self.register(key, record['token'])
+            line = f"{token_id}\t{key}\t{record['token'].replace(chr(9), ' ')}\n".encode()
+            with open(self.tokens_path, 'ab') as f:
+                f.write(line)
+            self.tokens_size += len(line)
+        return token_id
+
+    def append(self, records: Iterable[Dict[str, Any]], timestamp: float = None) -> int:
+        """Append one snapshot of parsed ticker records; returns how many were written"""
+        if self.readonly:
+            raise PermissionError('ticker log opened read-only')
+        timestamp = time.time() if timestamp is None else timestamp
+
+        payload = bytearray()
+        for record in records:
+            payload += RECORD.pack(timestamp, self.token_id(record), record['price'], record['liquidity'],
+                                   record['volume_24h'], record['change_24h'])
+        if not payload:
+            return 0
+
+        first = os.path.getsize(self.data_path) // RECORD.size
+        with open(self.data_path, 'ab') as f:
+            f.write(payload)
+        # Index last: a crash in between leaves records that are still in time order
+        with open(self.index_path, 'ab') as f:
+            f.write(INDEX_ENTRY.pack(timestamp, first))
+        return len(payload) // RECORD.size
+
+    def mapping(self, path: str, entry: struct.Struct, current: Optional[mmap.mmap]) -> Optional[mmap.mmap]:
+        """Read-only map of a file's whole entries, remapped when it has grown or been compacted"""
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        with f:
+            stat = os.fstat(f.fileno())
+            # A concurrent append may have landed only part of its last entry
+            size = stat.st_size - stat.st_size % entry.size
+            if size == 0:
+                return None
+            if current is not None and len(current) == size and self.inodes.get(path) == stat.st_ino:
+                return current
+            self.inodes[path] = stat.st_ino
+            return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+
+    def refresh(self):
+        """Pick up records, index entries and tokens appended since the last query"""
+        inode = self.inodes.get(self.data_path)
+        self.data_map = self.mapping(self.data_path, RECORD, self.data_map)
+        self.index_map = self.mapping(self.index_path, INDEX_ENTRY, self.index_map)
+        self.load_tokens()
+        if self.inodes.get(self.data_path) != inode:
+            # Compaction renumbered every record
+            self.postings = {}
+            self.indexed = 0
+        self.index_tokens()
+
+    def index_tokens(self):
+        """Extend the per-token record lists over the records appended since the last refresh"""
+        total = len(self.data_map) // RECORD.size if self.data_map is not None else 0
+        if total <= self.indexed:
+            return
+        # Only the id column is read, sliced straight out of the map
+        view = memoryview(self.data_map)
+        words = view.cast('I')
+        token_ids = words[self.indexed * RECORD_WORDS + TOKEN_ID_WORD:total * RECORD_WORDS:RECORD_WORDS].tolist()
+        words.release()
+        view.release()
+
+        postings = self.postings
+        for number, token_id in enumerate(token_ids, self.indexed):
+            posting = postings.get(token_id)
+            if posting is None:
+                posting = postings[token_id] = array('I')
+            posting.append(number)
+        self.indexed = total
+
+    def record_range(self, since: float, until: float) -> range:
+        """Record numbers of snapshots taken in [since, until], via bisect on the time index"""
+        if self.data_map is None or self.index_map is None:
+            return range(0)
+        total = len(self.data_map) // RECORD.size
+
+        times = MappedColumn(self.index_map, INDEX_ENTRY, len(self.index_map) // INDEX_ENTRY.size)
+        starts = MappedColumn(self.index_map, INDEX_ENTRY, len(times), field=1)
+        lo = bisect_left(times, since)
+        hi = bisect_right(times, until)
+        if lo >= len(times):
+            return range(0)
+        # Records past the last index entry belong to an append whose entry was not written yet
+        end = starts[hi] if hi < len(times) else total
+        return range(starts[lo], end)
+
+    def resolve(self, token: str) -> List[int]:
+        """Token ids for an address, or for a symbol (every pair sharing it)"""
+        self.load_tokens()
+        token_id = self.ids.get(token.lower())
+        if token_id is not None:
+            return [token_id]
+        return list(self.by_symbol.get(token.upper(), []))
+
+    def history(self, token: str, since: float = None, until: float = None) -> List[Dict[str, Any]]:
+        """Logged samples for a token between two timestamps (defaults: everything until now)
+
+        Raw rows are only kept for the rollup's 'raw' retention; older history is in the candles
+        """
+        self.refresh()
+        wanted = self.resolve(token)
+        if not wanted:
+            return []
+
+        rows = self.record_range(since or 0.0, until if until is not None else time.time())
+        if not rows:
+            return []
+        numbers = []
+        for token_id in wanted:
+            posting = self.postings.get(token_id)
+            if posting:
+                numbers.extend(posting[bisect_left(posting, rows.start):bisect_left(posting, rows.stop)])
+        if len(wanted) > 1:
+            numbers.sort()
+
+        samples = []
+        for number in numbers:
+            ts, token_id, price, liquidity, volume, change = RECORD.unpack_from(self.data_map, number * RECORD.size)
+            samples.append({
+                'timestamp': ts,
+                'token': self.tokens[token_id][1],
+                'token_key': self.tokens[token_id][0],
+                'price': price,
+                'liquidity': liquidity,
+                'volume_24h': volume,
+                'change_24h': change
+            })
+        return samples
+
+    def compact(self, before: float) -> int:
+        """Drop snapshots taken before a time by rewriting both files; returns records dropped"""
+        if self.readonly:
+            raise PermissionError('ticker log opened read-only')
+        self.refresh()
+        if self.data_map is None or self.index_map is None:
+            return 0
+        snapshots = len(self.index_map) // INDEX_ENTRY.size
+        times = MappedColumn(self.index_map, INDEX_ENTRY, snapshots)
+        lo = bisect_left(times, before)
+        if lo == 0:
+            return 0
+        first = MappedColumn(self.index_map, INDEX_ENTRY, snapshots, field=1)[lo] if lo < snapshots \
+            else len(self.data_map) // RECORD.size
+
+        index = bytearray()
+        for timestamp, start in INDEX_ENTRY.iter_unpack(self.index_map[lo * INDEX_ENTRY.size:]):
+            index += INDEX_ENTRY.pack(timestamp, start - first)
+        data_temp = write_temp(self.data_path, [memoryview(self.data_map)[first * RECORD.size:]])
+        index_temp = write_temp(self.index_path, [index])
+        # Both files are ready before either is swapped, keeping the window for readers tiny
+        os.replace(data_temp, self.data_path)
+        os.replace(index_temp, self.index_path)
+        self.refresh()
+        return first
+
+    def stats(self) -> Dict[str, Any]:
+        """Record, snapshot and token counts plus the covered time span"""
+        self.refresh()
+        snapshots = len(self.index_map) // INDEX_ENTRY.size if self.index_map else 0
+        times = MappedColumn(self.index_map, INDEX_ENTRY, snapshots) if snapshots else []
+        return {
+            'records': len(self.data_map) // RECORD.size if self.data_map else 0,
+            'snapshots': snapshots,
+            'tokens': len(self.tokens),
+            'first': times[0] if snapshots else None,
+            'last': times[snapshots - 1] if snapshots else None
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the ticker log')
+    parser.add_argument('token', nargs='?', help='symbol or token address (omit for log stats)')
+    parser.add_argument('--hours', type=float, default=6, help='how far back to look')
+    parser.add_argument('--dir', default=DEFAULT_LOG_DIR, help='log directory')
+    args = parser.parse_args()
+
+    log = TickerLog(args.dir, readonly=True)
+    stats = log.stats()
+    if not args.token:
+        print(stats)
+        return
+
+    start = time.perf_counter()
+    since = time.time() - args.hours * 3600
+    samples = log.history(args.token, since=since)
+    elapsed = (time.perf_counter() - start) * 1000
+    for s in samples:
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(s['timestamp']))}  {s['token']:<10} "
+              f"${s['price']:.8f}  liq ${s['liquidity']:,.0f}  vol ${s['volume_24h']:,.0f}  {s['change_24h']:+.2f}%")
+    print(f"📊 {len(samples)} samples in {elapsed:.1f}ms")
+    if stats['first'] is not None and since < stats['first']:
+        # Compaction has rolled anything older into candles
+        print(f"ℹ️  Raw rows start at {time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['first']))}; "
+              f"for older history run: python -m engine.rollup {args.token} --days {args.hours / 24:g}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Mention-velocity tracking for social spike detection
+Per-token sliding-window counters fed by the Twitter pipeline
+"""
+
+import math
+import time
+from array import array
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterable
+
+# window name -> (bucket seconds, bucket count)
+WINDOWS = {
+    '5m': (60, 5),
+    '1h': (300, 12),
+    '24h': (3600, 24)
+}
+
+# Baseline is an EWMA over completed 5m buckets, roughly one day of history
+BASELINE_ALPHA = 2 / (288 + 1)
+# Completed 5m buckets (30 minutes of history) before a token's z-score counts;
+# a new token has mean 0 and the std floor of 1, so its first mentions would all look like spikes
+MIN_BASELINE_SAMPLES = 6
+
+
+class WindowCounter:
+    """Fixed ring of time buckets with a running total"""
+
+    __slots__ = ('bucket_seconds', 'buckets', 'head', 'total')
+
+    def __init__(self, bucket_seconds: int, bucket_count: int):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = array('I', [0] * bucket_count)
+        self.head = 0  # absolute bucket number of the newest slot
+        self.total = 0
+
+    def advance(self, now: float) -> List[int]:
+        """Roll the ring forward to now, returning counts of buckets that completed"""
+        target = int(now // self.bucket_seconds)
+        if target <= self.head:
+            return []
+
+        size = len(self.buckets)
+        completed = []
+        steps = min(target - self.head, size)
+        for step in range(1, steps + 1):
+            completed.append(self.buckets[(self.head + step - 1) % size] if step == 1 else 0)
+            slot = (self.head + step) % size
+            self.total -= self.buckets[slot]
+            self.buckets[slot] = 0
+
+        self.head = target
+        return completed
+
+    def add(self, ts: float, count: int = 1) -> bool:
+        """Count an event at ts; events older than the window are dropped"""
+        bucket = int(ts // self.bucket_seconds)
+        if bucket <= self.head - len(self.buckets) or bucket > self.head:
+            return False
+        self.buckets[bucket % len(self.buckets)] += count
+        self.total += count
+        return True
+
+
+class TokenVelocity:
+    """Counters and spike baseline for one token"""
+
+    __slots__ = ('windows', 'mean', 'var', 'samples')
+
+    def __init__(self, now: float):
+        self.windows = {name: WindowCounter(*spec) for name, spec in WINDOWS.items()}
+        for counter in self.windows.values():
+            counter.head = int(now // counter.bucket_seconds)
+        self.mean = 0.0
+        self.var = 0.0
+        self.samples = 0
+
+    def advance(self, now: float):
+        """Roll all windows forward and fold finished 5m buckets into the baseline"""
+        for name, counter in self.windows.items():
+            completed = counter.advance(now)
+            if name == '1h':
+                for value in completed:
+                    self.update_baseline(value)
+
+    def update_baseline(self, value: int):
+        """Exponentially weighted mean/variance of 5m mention counts"""
+        self.samples += 1
+        if self.samples == 1:
+            self.mean = float(value)
+            return
+        delta = value - self.mean
+        self.mean += BASELINE_ALPHA * delta
+        self.var = (1 - BASELINE_ALPHA) * (self.var + BASELINE_ALPHA * delta * delta)
+
+    def zscore(self, min_samples: int = MIN_BASELINE_SAMPLES) -> float:
+        """How unusual the current 5m count is against the baseline; 0 until the baseline has min_samples"""
+        if self.samples < min_samples:
+            return 0.0
+        std = max(math.sqrt(self.var), 1.0)
+        return (self.windows['5m'].total - self.mean) / std
+
+
+class MentionVelocity:
+    def __init__(self, z_threshold: float = 3.0, min_mentions: int = 5, max_seen: int = 50000,
+                 min_baseline_samples: int = MIN_BASELINE_SAMPLES):
+        self.z_threshold = z_threshold
+        self.min_mentions = min_mentions
+        self.min_baseline_samples = min_baseline_samples
+        self.max_seen = max_seen
+        self.tokens: Dict[str, TokenVelocity] = {}
+        self.seen: OrderedDict = OrderedDict()
+
+    def record(self, token: str, ts: float = None, count: int = 1, now: float = None) -> bool:
+        """Count mentions of a token at ts (defaults to now)"""
+        now = time.time() if now is None else now
+        ts = now if ts is None else ts
+
+        stats = self.tokens.get(token)
+        if stats is None:
+            stats = self.tokens[token] = TokenVelocity(now)
+        stats.advance(now)
+
+        recorded = False
+        for counter in stats.windows.values():
+            recorded = counter.add(ts, count) or recorded
+        return recorded
+
+    def observe_tweet(self, tweet_id: str, tokens: Iterable[str], ts: float = None, now: float = None):
+        """Record a tweet's mentions once, ignoring tweets already seen in earlier polls"""
+        if tweet_id in self.seen:
+            return
+        self.seen[tweet_id] = None
+        if len(self.seen) > self.max_seen:
+            self.seen.popitem(last=False)
+
+        for token in tokens:
+            self.record(token, ts=ts, now=now)
+
+    def counts(self, token: str, now: float = None) -> Dict[str, int]:
+        """Mention counts per window for one token"""
+        stats = self.tokens.get(token)
+        if stats is None:
+            return {name: 0 for name in WINDOWS}
+        stats.advance(time.time() if now is None else now)
+        return {name: counter.total for name, counter in stats.windows.items()}
+
+    def spikes(self, now: float = None) -> List[Dict[str, Any]]:
+        """Tokens whose 5m mention rate is a z-score outlier, strongest first"""
+        now = time.time() if now is None else now
+        results = []
+
+        for token, stats in self.tokens.items():
+            stats.advance(now)
+            recent = stats.windows['5m'].total
+            if recent < self.min_mentions:
+                continue
+            z = stats.zscore(self.min_baseline_samples)
+            if z >= self.z_threshold:
+                results.append({
+                    'token': token,
+                    'zscore': round(z, 2),
+                    'mentions_5m': recent,
+                    'mentions_1h': stats.windows['1h'].total,
+                    'mentions_24h': stats.windows['24h'].total
+                })
+
+        return sorted(results, key=lambda x: x['zscore'], reverse=True)
+
+    def prune(self, now: float = None) -> int:
+        """Forget tokens with no mentions in the last 24h"""
+        now = time.time() if now is None else now
+        stale = []
+        for token, stats in self.tokens.items():
+            stats.advance(now)
+            if stats.windows['24h'].total == 0:
+                stale.append(token)
+        for token in stale:
+            del self.tokens[token]
+        return len(stale)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+In-process metrics for the bot: counters, gauges and latency histograms
+Exposed as Prometheus text over HTTP and as a summary for /stats
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+PREFIX = 'zcrypto'
+
+# Latency buckets in seconds, from fast cache hits to slow API timeouts
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record one sample"""
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile as the upper bound of the bucket containing it"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.started = time.time()
+
+    def inc(self, name: str, value: float = 1):
+        """Increment a counter"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """Set a gauge to an absolute value"""
+        with self.lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, seconds: float):
+        """Record a latency sample"""
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a block of code into the named latency histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            lines.append(f'# TYPE {PREFIX}_uptime_seconds gauge')
+            lines.append(f'{PREFIX}_uptime_seconds {time.time() - self.started:.3f}')
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'# TYPE {PREFIX}_{name}_total counter')
+                lines.append(f'{PREFIX}_{name}_total {value:g}')
+
+            for name, value in sorted(self.gauges.items()):
+                lines.append(f'# TYPE {PREFIX}_{name} gauge')
+                lines.append(f'{PREFIX}_{name} {value:g}')
+
+            for name, histogram in sorted(self.histograms.items()):
+                metric = f'{PREFIX}_{name}_seconds'
+                lines.append(f'# TYPE {metric} histogram')
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f'{metric}_sum {histogram.total:.6f}')
+                lines.append(f'{metric}_count {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> str:
+        """Compact human-readable summary for the /stats command (Telegram Markdown)
+
+        Names go in inline code: their underscores would otherwise open italics
+        """
+        with self.lock:
+            uptime = int(time.time() - self.started)
+            lines = [f"⏱️ Uptime: {uptime // 3600}h {uptime % 3600 // 60}m"]
+
+            if self.counters:
+                lines.append("")
+                lines.append("**Counters:**")
+                for name, value in sorted(self.counters.items()):
+                    lines.append(f"• `{name}`: {value:g}")
+
+            if self.gauges:
+                lines.append("")
+                lines.append("**Gauges:**")
+                for name, value in sorted(self.gauges.items()):
+                    lines.append(f"• `{name}`: {value:g}")
+
+            if self.histograms:
+                lines.append("")
+                lines.append("**Latency (avg / p50 / p95):**")
+                for name, histogram in sorted(self.histograms.items()):
+                    avg = histogram.total / histogram.count if histogram.count else 0.0
+                    lines.append(f"• `{name}`: {avg * 1000:.1f}ms / ≤{histogram.quantile(0.5) * 1000:g}ms / "
+                                 f"≤{histogram.quantile(0.95) * 1000:g}ms (n={histogram.count})")
+
+        return '\n'.join(lines)
+
+
+def start_http_server(registry: Metrics, port: int, host: str = '127.0.0.1') -> 'ThreadingHTTPServer':
+    """Serve /metrics in a daemon thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+# Process-wide registry shared by the analyzer and the Telegram handlers
+metrics = Metrics()
@@ -4,208 +4,379 @@ Zcryptoanalysis Bot - Production Ready for Telegram Channel
 Optimized for :Zcryptoanzlysis_bot
 """
 
+from __future__ import annotations
+
+import time
+
+BOOT_STARTED = time.perf_counter()
+
 import os
 import asyncio
-import requests
+import signal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from telegram import Update
-from telegram.ext import Application, CommandHandler, ContextTypes
+from typing import TYPE_CHECKING
+
+from mention_velocity import MentionVelocity
+from engine import (TelegramRenderer, MultiChainScanner, PairLookup, PrefixIndex, PollScheduler, PRODUCTION,
+                    CHAIN_PROFILES, CHAIN_LABELS)
+from engine.fetcher import SyncFetcher, TICKER_ENDPOINTS, source_notice
+from engine.snapshot_store import SnapshotStore
+from engine.interest import InterestLog, DEFAULT_INTEREST_PATH
+from engine.bus import SnapshotPublisher, SnapshotSubscriber
+from engine.shm_snapshot import ColumnarSnapshotWriter, ColumnarSnapshotReader, DEFAULT_SHM_PATH
+from engine.ticker_log import TickerLog, DEFAULT_LOG_DIR, token_key
+from engine.rollup import OHLCVRollup
+from engine.chart import ChartService, CHARTS_AVAILABLE
+from metrics import metrics, start_http_server
+from profiler import HandlerProfiler
+from rate_limit import ChatRateLimiter
+
+# telegram and the Twitter client (aiohttp) are imported when first needed
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import ContextTypes
 
 # Production configuration
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_TOKEN', '6994487405:AAH8Qv1Kz3J8mN3xY9r5P8kL2mN4xY7z')
+TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN', '')
+TWITTER_POLL_SECONDS = int(os.getenv('TWITTER_POLL_SECONDS', '120'))
+# Static sample data is only served when explicitly enabled (demos/testing)
+ALLOW_SAMPLE_DATA = os.getenv('ALLOW_SAMPLE_DATA', '').lower() in ('1', 'true', 'yes')
+# Prometheus endpoint (0 disables) and Telegram user ids allowed to run admin commands
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+ADMIN_USER_IDS = {int(uid) for uid in os.getenv('ADMIN_USER_IDS', '').split(',') if uid.strip()}
+# Window profiled when the process receives SIGUSR1
+PROFILE_SIGNAL_SECONDS = int(os.getenv('PROFILE_SIGNAL_SECONDS', '30'))
+# Per-chat /scan budget: SCAN_BURST presses at once, refilling at SCAN_RATE_PER_MINUTE
+SCAN_RATE_PER_MINUTE = float(os.getenv('SCAN_RATE_PER_MINUTE', '6'))
+SCAN_BURST = int(os.getenv('SCAN_BURST', '3'))
+# Updates handled at once, so a /scan waiting on a refresh does not hold up other chats
+CONCURRENT_UPDATES = int(os.getenv('CONCURRENT_UPDATES', '64'))
+# Pairs shown in full by /token before the rest are summarized
+MAX_TOKEN_MATCHES = 5
+# Channel or chat id that receives liquidity-drain (rug pull) alerts; unset disables them.
+# Standalone mode then also refreshes every SCAN_INTERVAL_SECONDS instead of only on /scan
+ALERT_CHAT_ID = os.getenv('ALERT_CHAT_ID', '')
+MAX_ALERTS_PER_SCAN = 5
+# Inline autocomplete: suggestions per keystroke and how long Telegram may cache them
+INLINE_RESULTS = 10
+INLINE_CACHE_SECONDS = int(os.getenv('INLINE_CACHE_SECONDS', '30'))
+# Last good snapshot and report, restored at boot so /scan answers before the first fetch
+SNAPSHOT_CACHE_PATH = os.getenv('SNAPSHOT_CACHE_PATH', '/var/tmp/zcryptoanalysis/snapshot.json')
+# 'standalone' scans and replies in one process; for scale-out run one 'scanner'
+# and any number of 'worker' processes sharing SNAPSHOT_SOCKET
+BOT_ROLE = os.getenv('BOT_ROLE', 'standalone')
+SNAPSHOT_SOCKET = os.getenv('SNAPSHOT_SOCKET', '/tmp/zcryptoanalysis/snapshots.sock')
+# 'shm' shares one columnar buffer that workers read in place; 'socket' streams JSON frames
+SNAPSHOT_TRANSPORT = os.getenv('SNAPSHOT_TRANSPORT', 'shm')
+SNAPSHOT_SHM_PATH = os.getenv('SNAPSHOT_SHM_PATH', DEFAULT_SHM_PATH)
+# Pairs users look up on workers, drained by the scanner into its poll cadence (pairs/adaptive modes)
+INTEREST_LOG_PATH = os.getenv('INTEREST_LOG_PATH', DEFAULT_INTEREST_PATH)
+# Pseudo-chain of a published snapshot carrying every scored pair, for the workers' /token index
+ALL_PAIRS = '*'
+# How often workers check for a newer snapshot to rebuild their /token index from, off the event loop
+LOOKUP_POLL_SECONDS = float(os.getenv('LOOKUP_POLL_SECONDS', '1'))
+SCAN_INTERVAL_SECONDS = int(os.getenv('SCAN_INTERVAL_SECONDS', '30'))
+# /chart: candles from the ticker log in TICKER_LOG_DIR, rendered by CHART_WORKERS processes
+CHART_WORKERS = int(os.getenv('CHART_WORKERS', '2'))
+CHART_CACHE_SIZE = int(os.getenv('CHART_CACHE_SIZE', '128'))
+CHART_RESOLUTION = os.getenv('CHART_RESOLUTION', '5m')
+CHART_HOURS = float(os.getenv('CHART_HOURS', '24'))
+# /scan reports: opportunities per page (pages also stop short of Telegram's 4096 chars),
+# and how many chain/snapshot page sets stay cached for Next/Prev on older messages
+REPORT_PAGE_SIZE = int(os.getenv('REPORT_PAGE_SIZE', '5'))
+REPORT_PAGE_CHARS = 3500
+PAGE_CACHE_SIZE = 32
+
+DEXSCREENER_ENDPOINTS = TICKER_ENDPOINTS
+# 'trending' polls the whole tickers list every scan. 'pairs' and 'adaptive' poll only tracked
+# pairs (every reported pair, plus pairs users look up), pulling the list every DEX_DISCOVERY_SECONDS;
+# 'adaptive' gives each pair its own cadence under DEX_REQUESTS_PER_MINUTE
+DEX_FETCH_MODE = os.getenv('DEX_FETCH_MODE', 'trending')
+DEX_REQUESTS_PER_MINUTE = float(os.getenv('DEX_REQUESTS_PER_MINUTE', '60'))
+DEX_DISCOVERY_SECONDS = float(os.getenv('DEX_DISCOVERY_SECONDS', '900'))
+MAX_TRACKED_PAIRS = int(os.getenv('MAX_TRACKED_PAIRS', '1000'))
+# Interest a /token or /chart lookup adds to each pair it shows; it halves every 30 minutes
+LOOKUP_INTEREST = 1.0
+
+def markdown_code(text):
+    """User or API text as a legacy-Markdown code span, which leaves _ * [ alone; a backtick would end it"""
+    return '`' + str(text).replace('`', "'") + '`'
 
 class ProductionZcryptoBot:
+    """Production analyzer: a thin wrapper over the shared engine pipeline"""
+    
     def __init__(self):
         self.base_url = 'https://api.dexscreener.com/latest'
-        self.min_liquidity = 50000
-        
+        self.min_liquidity = PRODUCTION.filter.min_liquidity
+        self.fetcher = dex_fetcher()
+        # One shared fetch, partitioned by chainId into per-chain pipelines with their own thresholds
+        self.scanner = MultiChainScanner(
+            self.fetcher, CHAIN_PROFILES,
+            renderer_factory=lambda chain, profile: TelegramRenderer(chain_label=CHAIN_LABELS[chain]),
+            track_indicators=True,
+            detect_drains=True,
+            group_pairs=True
+        )
+        self.pipeline = self.scanner.pipelines['base']
+        self.renderer = self.pipeline.renderer
+        self.store = SnapshotStore(SNAPSHOT_CACHE_PATH)
+        self.lookup = PairLookup()
+        self.prefixes = PrefixIndex()
+        self.ticker_log = None
+        self.rollup = None
+        # One writer thread: snapshot saves and ticker-log appends land in snapshot order, never interleaved
+        self.writer = ThreadPoolExecutor(1, thread_name_prefix='snapshot-writer')
+    
+    @property
+    def snapshot_changed(self):
+        return self.fetcher.snapshot_changed
+    
+    @property
+    def data_source(self):
+        return self.fetcher.data_source
+    
     def get_base_tokens(self):
         """Get trending tokens on Base chain with production reliability"""
+        return self.pipeline.parser.select_chain(self.fetcher.fetch())
+    
+    def data_notice(self):
+        """Warning line when the report is not built from live data"""
+        return self.fetcher.data_notice()
+    
+    def scan_report(self, chain='base'):
+        """Fetch, analyze and render, skipping analysis when the snapshot is unchanged"""
+        return self.scanner.run()[chain]
+    
+    async def scan_report_async(self, chain='base'):
+        """Fetch off the event loop and analyze every chain concurrently"""
+        return (await self.scanner.run_async())[chain]
+    
+    def restore_snapshot(self):
+        """Load the last saved snapshot and report from disk"""
+        if not self.store.restore(self.pipeline):
+            return False
+        self.scanner.restore_missing()
+        self.rebuild_lookup()
+        return True
+    
+    def open_history(self, readonly=False):
+        """Ticker log and candle rollups; workers only read what the scanner writes"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            # Try multiple endpoints for reliability
-            endpoints = [
-                'https://api.dexscreener.com/latest/dex/tickers',
-                'https://api.dexscreener.io/latest/dex/tickers'
-            ]
-            
-            for endpoint in endpoints:
-                try:
-                    response = requests.get(endpoint, headers=headers, timeout=15)
-                    if response.status_code == 200:
-                        data = response.json()
-                        tickers = data.get('tickers', [])
-                        return [t for t in tickers if t.get('chainId') == 'base']
-                except:
-                    continue
-            
-            # Fallback sample data
-            return self.get_sample_data()
-            
-        except Exception:
-            return self.get_sample_data()
+            self.ticker_log = TickerLog(DEFAULT_LOG_DIR, readonly=readonly)
+            self.rollup = OHLCVRollup(self.ticker_log)
+            if not readonly:
+                self.rollup.catch_up()
+        except OSError as e:
+            print(f"⚠️ Ticker log unavailable: {e}")
+            self.ticker_log = self.rollup = None
+        return self.rollup
+    
+    def history_batch(self):
+        """(records, snapshot time) of every chain's live tickers; None when the snapshot is not logged"""
+        if self.rollup is None or self.ticker_log.readonly or self.data_source != 'live':
+            return None
+        records = [record for pipeline in self.scanner.pipelines.values() for record in pipeline.snapshot_records()]
+        return records, self.fetcher.snapshot_time
+    
+    def log_snapshot(self, batch=None):
+        """Append a snapshot's tickers to the ticker log and roll them into candles (off the event loop)"""
+        batch = batch or self.history_batch()
+        if batch is None:
+            return 0
+        records, timestamp = batch
+        try:
+            logged = self.ticker_log.append(records, timestamp=timestamp)
+            self.rollup.add(records, timestamp)
+        except OSError as e:
+            print(f"⚠️ Ticker log write failed: {e}")
+            return 0
+        return logged
+    
+    def track_opportunities(self):
+        """Pairs/adaptive modes: keep polling every pair that made a chain's report"""
+        if DEX_FETCH_MODE == 'trending':
+            return
+        for chain, result in self.scanner.cached().items():
+            self.fetcher.track_pairs((opp['pair_address'] for opp in result.opportunities), chain)
+    
+    def add_interest(self, interest):
+        """Pairs/adaptive modes: users looked these pairs up (chain -> {pair address: weight}), poll them sooner"""
+        if DEX_FETCH_MODE == 'trending':
+            return
+        for chain, weights in interest.items():
+            self.fetcher.add_interest(weights, chain=chain)
+    
+    def rebuild_lookup(self):
+        """Index every pair of the current snapshot for /token, swapping it in atomically"""
+        self.set_lookup(PairLookup.from_pipelines(self.scanner.pipelines, version=self.fetcher.snapshot_time))
+    
+    def set_lookup(self, lookup):
+        """Install a /token index and the Base autocomplete index built from it (callable from any thread)"""
+        prefixes = PrefixIndex(r for r in lookup.records if r.get('chain_id') == 'base')
+        # Both built first, then swapped in back to back, so handlers never see a half-built index
+        self.lookup = lookup
+        self.prefixes = prefixes
+    
+    def format_token_matches(self, query, matches):
+        """Every pair matching a /token query, deepest liquidity first"""
+        if not matches:
+            return f"🔎 No pairs found for {markdown_code(query)} in the latest snapshot."
+        
+        text = f"🔎 {markdown_code(query)} - {len(matches)} pair{'s' if len(matches) != 1 else ''}\n\n"
+        for record in matches[:MAX_TOKEN_MATCHES]:
+            chain = record.get('chain_id', '')
+            text += f"⛓️ {CHAIN_LABELS.get(chain, chain)} · `{record['pair_address']}`\n"
+            text += self.renderer.format_opportunity(record) + "\n"
+        if len(matches) > MAX_TOKEN_MATCHES:
+            text += f"…and {len(matches) - MAX_TOKEN_MATCHES} more pairs. Use a pair address to pick one."
+        return text
+    
+    def format_drain_alert(self, alert):
+        """Channel alert for a pool whose liquidity was pulled since the last scan"""
+        from telegram.helpers import escape_markdown
+        
+        chain = alert['chain_id']
+        # Token names come from DexScreener: the symbol goes in a code span, the name is escaped
+        text = (f"🚨 **Liquidity drain:** {markdown_code(alert['token'])} "
+                f"({escape_markdown(alert['name'][:20], version=1)})\n"
+                f"⛓️ {CHAIN_LABELS.get(chain, chain)} · `{alert['pair_address']}`\n"
+                f"💧 Liquidity: ${alert['previous_liquidity']:,.0f} → ${alert['liquidity']:,.0f} "
+                f"({-alert['drop_percent']:+.1f}%)\n"
+                f"💰 Price: ${alert['price']:.8f} ({alert['price_change']:+.1f}% since last scan)\n")
+        if alert['price_spike']:
+            text += "⚠️ Liquidity is leaving while price spikes - classic rug pull pattern\n"
+        return text
+    
+    def build_snapshot(self, spikes=None):
+        """Scored opportunities for every chain, plus every scored pair, as published to bot workers"""
+        chains = {chain: result.opportunities for chain, result in self.scanner.cached().items()}
+        chains[ALL_PAIRS] = self.lookup.records
+        return {
+            'data_source': self.fetcher.data_source,
+            'snapshot_time': self.fetcher.snapshot_time,
+            'chains': chains,
+            'spikes': spikes or []
+        }
+    
+    def save_snapshot(self):
+        """Persist the current live snapshot and report (run off the event loop)"""
+        try:
+            return self.store.save(self.pipeline)
+        except OSError as e:
+            print(f"⚠️ Snapshot cache write failed: {e}")
+            return False
+    
+    def persist(self):
+        """Queue the snapshot save and ticker-log append on the writer thread; returns its Future"""
+        # The log batch is taken now, so a refresh landing before the write cannot change what is logged
+        future = self.writer.submit(self.write_snapshot, self.history_batch())
+        future.add_done_callback(self.persist_done)
+        return future
+    
+    def write_snapshot(self, batch):
+        self.save_snapshot()
+        return self.log_snapshot(batch) if batch is not None else 0
+    
+    @staticmethod
+    def persist_done(future):
+        if future.exception() is not None:
+            metrics.inc('snapshot_write_errors')
+            print(f"⚠️ Snapshot write failed: {future.exception()}")
     
     def get_sample_data(self):
-        """Production-ready sample data for reliability"""
-        return [
-            {
-                'chainId': 'base',
-                'baseToken': {'symbol': 'AERO', 'name': 'Aerodrome Finance'},
-                'priceUsd': '0.000001234',
-                'liquidity': {'usd': 75000},
-                'volume': {'h24': 250000},
-                'priceChange': {'h24': 15.7}
-            },
-            {
-                'chainId': 'base',
-                'baseToken': {'symbol': 'DEGEN', 'name': 'Degen'},
-                'priceUsd': '0.00004567',
-                'liquidity': {'usd': 125000},
-                'volume': {'h24': 180000},
-                'priceChange': {'h24': -8.3}
-            },
-            {
-                'chainId': 'base',
-                'baseToken': {'symbol': 'BASEDOG', 'name': 'Base Dog'},
-                'priceUsd': '0.000000891',
-                'liquidity': {'usd': 95000},
-                'volume': {'h24': 120000},
-                'priceChange': {'h24': 45.2}
-            },
-            {
-                'chainId': 'base',
-                'baseToken': {'symbol': 'BRETT', 'name': 'Brett'},
-                'priceUsd': '0.00001234',
-                'liquidity': {'usd': 200000},
-                'volume': {'h24': 350000},
-                'priceChange': {'h24': 28.5}
-            }
-        ]
+        """Sample data, only served when ALLOW_SAMPLE_DATA is set"""
+        return self.fetcher.sample_data
     
     def analyze_opportunities(self, tickers):
         """Analyze opportunities with enhanced scoring"""
-        opportunities = []
-        
-        for ticker in tickers:
-            try:
-                token = ticker['baseToken']['symbol']
-                name = ticker['baseToken'].get('name', token)
-                price = float(ticker['priceUsd'])
-                
-                # Extract metrics safely
-                liquidity = float(ticker.get('liquidity', {}).get('usd', 0))
-                volume = float(ticker.get('volume', {}).get('h24', 0))
-                price_change = float(ticker.get('priceChange', {}).get('h24', 0))
-                
-                if liquidity >= 50000 and abs(price_change) >= 3:
-                    risk_score = self.calculate_risk(liquidity, volume, abs(price_change))
-                    
-                    opportunities.append({
-                        'token': token,
-                        'name': name,
-                        'price': price,
-                        'change_24h': price_change,
-                        'liquidity': liquidity,
-                        'volume_24h': volume,
-                        'risk_score': risk_score,
-                        'risk_level': self.get_risk_level(risk_score),
-                        'timestamp': str(datetime.utcnow())[:19]
-                    })
-                    
-            except Exception as e:
-                continue
-        
-        return sorted(opportunities, key=lambda x: abs(x['change_24h']), reverse=True)
-    
-    def calculate_risk(self, liquidity, volume, price_change):
-        """Advanced risk calculation"""
-        score = 2  # Base score
-        
-        # Liquidity tiers
-        if liquidity < 50000:
-            score += 4
-        elif liquidity < 100000:
-            score += 3
-        elif liquidity < 250000:
-            score += 2
-        elif liquidity < 500000:
-            score += 1
-        
-        # Volatility tiers
-        if price_change > 100:
-            score += 4
-        elif price_change > 50:
-            score += 3
-        elif price_change > 25:
-            score += 2
-        elif price_change > 10:
-            score += 1
-        
-        # Volume tiers
-        if volume < 50000:
-            score += 2
-        elif volume < 100000:
-            score += 1
-        
-        return min(score, 10)
+        return self.pipeline.analyze(tickers)
+    
+    def calculate_risk(self, liquidity, volume, price_change, rsi=None, vwap_deviation=None):
+        """Advanced risk calculation, with RSI and VWAP deviation once the pair has history"""
+        return self.pipeline.scorer.score(liquidity, volume, price_change, rsi, vwap_deviation)
     
     def get_risk_level(self, score):
         """Get risk level with emojis"""
-        if score <= 3:
-            return "🟢 Low Risk"
-        elif score <= 5:
-            return "🟡 Medium Risk"
-        elif score <= 7:
-            return "🟠 High Risk"
-        else:
-            return "🔴 Extreme Risk"
+        return PRODUCTION.risk_model.risk_level(score)
     
     def format_opportunity(self, opp):
         """Format opportunity for Telegram"""
-        emoji = "🚀" if opp['change_24h'] > 0 else "📉"
-        return f"{emoji} **{opp['token']}** ({opp['name'][:20]}...)
-💰 Price: \${opp['price']:.8f}
-📈 Change: {opp['change_24h']:+.2f}%
-💧 Liquidity: \${opp['liquidity']:,}
-📊 Volume: \${opp['volume_24h']:,}
-{opp['risk_level']} ({opp['risk_score']}/10)
-"
+        return self.renderer.format_opportunity(opp)
     
     def generate_summary(self, opportunities):
         """Generate channel summary"""
+        return self.renderer.render(opportunities)
+    
+    def generate_pages(self, opportunities):
+        """Every opportunity as report pages, empty when there are none"""
         if not opportunities:
-            return "ℹ️ No Base chain opportunities found meeting criteria."
-        
-        total = len(opportunities)
-        low_risk = len([o for o in opportunities if o['risk_score'] <= 3])
-        high_risk = len([o for o in opportunities if o['risk_score'] > 7])
+            return []
+        return self.renderer.render_pages(opportunities, REPORT_PAGE_SIZE, REPORT_PAGE_CHARS)
+    
+    def format_social_spikes(self, spikes, token_index=None):
+        """Format mention-velocity spikes for Telegram"""
+        if not spikes:
+            return ""
         
-        summary = f"🎯 **Zcryptoanalysis Report**
-📊 Found **{total}** Base chain opportunities
-
-🔍 **Risk Distribution:**
-🟢 Low Risk: {low_risk}
-🟡 Medium Risk: {total - low_risk - high_risk}
-🔴 High Risk: {high_risk}
-
-📈 **Top Opportunities:**
+        section = "\n🔥 **Social Spikes (5m mentions):**\n"
+        for spike in spikes[:5]:
+            symbol = spike.get('symbol') or token_index.describe(spike['token']).get('symbol', spike['token'][:10])
+            section += (f"• **{symbol}**: {spike['mentions_5m']} in 5m / "
+                        f"{spike['mentions_1h']} in 1h (z={spike['zscore']:.1f})\n")
+        return section
 
-"
-        
-        for i, opp in enumerate(opportunities[:5]):
-            summary += self.format_opportunity(opp)
-            if i < len(opportunities[:5]) - 1:
-                summary += "─" * 40 + "\n"
-        
-        return summary
+class ReportPages:
+    """One chain's report for one snapshot, pre-rendered page by page"""
+    __slots__ = ('pages', 'data_source', 'snapshot_time', 'social', 'source')
+    
+    def __init__(self, pages, data_source='live', snapshot_time=None, social=False, source=None):
+        self.pages = pages
+        self.data_source = data_source
+        self.snapshot_time = snapshot_time
+        # Whether the first page gets the social spikes, rendered fresh each time it is sent
+        self.social = social
+        # Opportunities the pages were rendered from (local scans)
+        self.source = source
 
 class ZcryptoTelegramBot:
-    def __init__(self):
+    def __init__(self, subscriber=None):
         self.analyzer = ProductionZcryptoBot()
         self.token = TELEGRAM_BOT_TOKEN
+        self.velocity = MentionVelocity()
+        self.profiler = HandlerProfiler()
+        self.startup_refresh = None
+        self.startup_seconds = None
+        self.refresh_task = None
+        self.rate_limiter = ChatRateLimiter(SCAN_RATE_PER_MINUTE, SCAN_BURST)
+        
+        # Worker mode: snapshots come from the scanner process, this process only renders/replies
+        self.subscriber = subscriber
+        # (chain, snapshot version) -> ReportPages, least recently used first
+        self.pages = OrderedDict()
+        self.twitter = None
+        self.restored = False
+        # Bot used to post drain alerts: the application's in standalone mode, a bare Bot in the scanner
+        self.alert_bot = None
+        # Workers pass the pairs users look up on to the scanner's poll scheduler
+        self.interest_log = InterestLog(INTEREST_LOG_PATH) if subscriber is not None else None
+        # Workers chart from the candles the scanner writes
+        rollup = self.analyzer.open_history(readonly=subscriber is not None)
+        self.charts = None
+        if rollup is not None and CHARTS_AVAILABLE:
+            self.charts = ChartService(rollup, workers=CHART_WORKERS, cache_size=CHART_CACHE_SIZE,
+                                       resolution=CHART_RESOLUTION, hours=CHART_HOURS)
+        if subscriber is not None:
+            return
+        
+        if TWITTER_BEARER_TOKEN:
+            from crypto_twitter_analyzer import TwitterAnalyzer
+            self.twitter = TwitterAnalyzer(TWITTER_BEARER_TOKEN, velocity=self.velocity)
+        # Serve the on-disk snapshot until the background startup refresh lands
+        self.restored = self.analyzer.restore_snapshot()
     
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         welcome = """🚀 **Zcryptoanalysis Bot - Base Chain Scanner**
@@ -214,42 +385,470 @@ class ZcryptoTelegramBot:
 
 **Available Commands:**
 • `/scan` - Get latest Base opportunities
+• `/scan <chain>` - solana, ethereum or arbitrum
+• `/token <symbol|address>` - One token's pairs
+• `/chart <symbol|address>` - Price & liquidity chart
+• `@Zcryptoanzlysis_bot <symbol>` - Autocomplete in any chat
 • `/help` - Show detailed help
 • `/status` - Bot status & info
 
 **Features:**
 • Real-time DexScreener integration
-• Base chain exclusive analysis
+• Base, Solana, Ethereum and Arbitrum with per-chain thresholds
 • Risk scoring (1-10)
-• $50k+ liquidity filter
+• Per-chain liquidity floors (Base $50k+)
 • 3%+ price change detection"""
         await update.message.reply_text(welcome, parse_mode='Markdown')
     
     async def scan(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Main scan command"""
-        await update.message.reply_text("🔍 Scanning Base chain opportunities...")
+        """Main scan command: /scan [chain]"""
+        scanner = self.analyzer.scanner
+        chain = scanner.resolve(context.args[0] if context.args else None)
+        if chain is None:
+            await update.message.reply_text(f"Usage: /scan [{'|'.join(scanner.chains)}]")
+            return
+        
+        chat_id = update.effective_chat.id if update.effective_chat else 0
+        allowed, retry_in = self.rate_limiter.allow(chat_id)
+        if not allowed:
+            metrics.inc('scans_rate_limited')
+            if self.rate_limiter.should_warn(chat_id):
+                await update.message.reply_text(f"⏳ Easy there - next scan available in {retry_in:.0f}s.")
+            return
         
-        tickers = self.analyzer.get_base_tokens()
-        opportunities = self.analyzer.analyze_opportunities(tickers)
+        metrics.inc('scans')
+        with metrics.span('scan'):
+            await self.run_scan(update, chain)
+    
+    async def run_scan(self, update: Update, chain: str = 'base'):
+        """Send a placeholder, then edit it in place with the report"""
+        with metrics.span('reply_text'):
+            placeholder = await update.message.reply_text(f"🔍 Scanning {CHAIN_LABELS[chain]} opportunities...")
         
+        try:
+            if self.subscriber is not None:
+                key, report = self.published_pages(chain)
+            else:
+                await self.coalesced_refresh()
+                key, report = self.local_pages(chain)
+        except Exception as e:
+            print(f"⚠️ Scan error: {e}")
+            metrics.inc('scan_errors')
+            await placeholder.edit_text("⚠️ The scan failed. Please try again in a moment.")
+            return
+        
+        # Message.edit_text is Bot.edit_message_text on the placeholder: one send per /scan, not two
+        with metrics.span('edit_message_text'):
+            await placeholder.edit_text(self.page_text(report, 0), parse_mode='Markdown',
+                                        reply_markup=self.page_keyboard(key, report, 0))
+    
+    async def coalesced_refresh(self):
+        """Refresh the snapshot; concurrent /scans share the one in flight instead of each fetching"""
+        if self.startup_refresh is not None and not self.startup_refresh.done():
+            if self.restored:
+                metrics.inc('restored_scans')
+                return
+            await asyncio.shield(self.startup_refresh)
+            return
+        
+        if self.refresh_task is not None:
+            metrics.inc('scans_coalesced')
+        else:
+            self.refresh_task = asyncio.ensure_future(self.refresh())
+            self.refresh_task.add_done_callback(self.refresh_done)
+        # Shielded so one caller's cancellation does not cancel everyone else's result
+        await asyncio.shield(self.refresh_task)
+    
+    def refresh_done(self, task):
+        """Let the next /scan start a fresh refresh"""
+        self.refresh_task = None
+    
+    async def refresh(self):
+        """One fetch and per-chain analysis, then persistence, /token index and Twitter upkeep"""
+        await self.analyzer.scanner.run_async()
+        if self.analyzer.snapshot_changed:
+            # Alerts go out in the background so /scans waiting on this refresh are not held up
+            asyncio.ensure_future(self.send_alerts(self.analyzer.scanner.alerts()))
+            await asyncio.to_thread(self.analyzer.rebuild_lookup)
+            self.analyzer.track_opportunities()
+            self.analyzer.persist()
+            if self.twitter:
+                self.twitter.update_token_universe(self.analyzer.pipeline.last_result.rows)
+    
+    async def send_alerts(self, alerts):
+        """Post this snapshot's liquidity-drain alerts to ALERT_CHAT_ID, biggest outflows first"""
+        if not alerts or not ALERT_CHAT_ID or self.alert_bot is None:
+            return
+        for alert in alerts[:MAX_ALERTS_PER_SCAN]:
+            try:
+                await self.alert_bot.send_message(ALERT_CHAT_ID, self.analyzer.format_drain_alert(alert),
+                                                  parse_mode='Markdown')
+                metrics.inc('drain_alerts_sent')
+            except Exception as e:
+                print(f"⚠️ Drain alert failed: {e}")
+        if len(alerts) > MAX_ALERTS_PER_SCAN:
+            metrics.inc('drain_alerts_suppressed', len(alerts) - MAX_ALERTS_PER_SCAN)
+    
+    async def watch_liquidity(self):
+        """Standalone with alerts on: keep refreshing so drains are caught within one interval"""
+        if self.startup_refresh is not None:
+            await asyncio.shield(self.startup_refresh)
+        while True:
+            await asyncio.sleep(SCAN_INTERVAL_SECONDS)
+            try:
+                await self.coalesced_refresh()
+            except Exception as e:
+                print(f"⚠️ Scan error: {e}")
+    
+    def cache_pages(self, key, report):
+        """Keep a snapshot's pages for Next/Prev, dropping the least recently paged past PAGE_CACHE_SIZE"""
+        self.pages[key] = report
+        self.pages.move_to_end(key)
+        while len(self.pages) > PAGE_CACHE_SIZE:
+            self.pages.popitem(last=False)
+        return report
+    
+    def no_opportunities(self, chain: str):
+        return ReportPages([f"ℹ️ No {CHAIN_LABELS[chain]} opportunities found meeting criteria. Try again later."])
+    
+    def local_pages(self, chain: str):
+        """(cache key, pages) for a chain from this process's own scan, rendered once per analysis"""
+        if self.analyzer.data_source == 'none':
+            return None, ReportPages(
+                ["⚠️ DexScreener is unavailable right now and no cached data exists yet. Try again shortly."])
+        
+        opportunities = self.analyzer.scanner.pipelines[chain].last_result.opportunities
         if not opportunities:
-            await update.message.reply_text("ℹ️ No opportunities found meeting criteria. Try again later.")
+            return None, self.no_opportunities(chain)
+        
+        # The /token index is rebuilt once per analysed snapshot, so its version doubles as the report's
+        key = (chain, str(self.analyzer.lookup.version))
+        report = self.pages.get(key)
+        if report is None or report.source is not opportunities:
+            report = self.cache_pages(key, ReportPages(
+                self.analyzer.generate_pages(opportunities), self.analyzer.data_source,
+                self.analyzer.fetcher.snapshot_time, social=True, source=opportunities))
+        return key, report
+    
+    def published_pages(self, chain: str):
+        """(cache key, pages) for a chain of the newest snapshot the scanner published, rendered once per version"""
+        snapshot = self.subscriber.latest
+        if snapshot is None or snapshot['data_source'] == 'none':
+            return None, ReportPages(
+                ["⚠️ No market snapshot available yet - the scanner is still starting. Try again shortly."])
+        
+        key = (chain, str(snapshot['version']))
+        report = self.pages.get(key)
+        if report is None:
+            result = self.subscriber.render(chain, self.analyzer.generate_pages)
+            if result is not None:
+                version, pages = result
+                key = (chain, str(version))
+                report = self.cache_pages(key, ReportPages(
+                    pages, snapshot['data_source'], snapshot.get('snapshot_time'), social=True))
+        if report is None or not report.pages:
+            return None, self.no_opportunities(chain)
+        
+        metrics.set_gauge('served_snapshot_version', snapshot['version'])
+        return key, report
+    
+    def page_text(self, report, index):
+        """One page; the first carries the data-source notice and social spikes"""
+        text = report.pages[index]
+        if index == 0:
+            age = time.time() - report.snapshot_time if report.snapshot_time else None
+            text = source_notice(report.data_source, age) + text
+            if report.social:
+                text += self.social_footer()
+        return text
+    
+    def social_footer(self):
+        """Social spikes as of now, from this process's tracker or the newest published snapshot"""
+        if self.subscriber is not None:
+            snapshot = self.subscriber.latest
+            return self.analyzer.format_social_spikes(snapshot.get('spikes'), None) if snapshot else ""
+        if self.twitter:
+            return self.analyzer.format_social_spikes(self.velocity.spikes(), self.twitter.token_index)
+        return ""
+    
+    def page_keyboard(self, key, report, index):
+        """Prev/Next buttons addressing cached pages, None for a single page"""
+        if key is None or len(report.pages) < 2:
+            return None
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+        
+        chain, version = key
+        buttons = []
+        if index > 0:
+            buttons.append(InlineKeyboardButton("◀️ Prev", callback_data=f"page:{chain}:{version}:{index - 1}"))
+        if index < len(report.pages) - 1:
+            buttons.append(InlineKeyboardButton("Next ▶️", callback_data=f"page:{chain}:{version}:{index + 1}"))
+        return InlineKeyboardMarkup([buttons])
+    
+    async def turn_page(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Prev/Next on a /scan report: edited in place from the page cache, never re-fetched"""
+        query = update.callback_query
+        try:
+            _, chain, version, index = query.data.split(':')
+            index = int(index)
+        except ValueError:
+            await query.answer()
             return
         
-        summary = self.analyzer.generate_summary(opportunities)
-        await update.message.reply_text(summary, parse_mode='Markdown')
+        key = (chain, version)
+        report = self.pages.get(key)
+        if report is None or not 0 <= index < len(report.pages):
+            metrics.inc('report_pages_expired')
+            await query.answer("⌛ This report has expired - send /scan for a fresh one.", show_alert=True)
+            return
+        
+        metrics.inc('report_pages_served')
+        self.pages.move_to_end(key)
+        await query.answer()
+        with metrics.span('edit_message_text'):
+            await query.edit_message_text(self.page_text(report, index), parse_mode='Markdown',
+                                          reply_markup=self.page_keyboard(key, report, index))
+    
+    def current_lookup(self):
+        """The /token index; handlers only read it, rebuilds are swapped in from worker threads"""
+        return self.analyzer.lookup
+    
+    def build_published_lookup(self):
+        """Workers: index the newest published snapshot (run in a thread, then swapped in)"""
+        # Every parsed pair, not just the opportunities that passed the filters
+        result = self.subscriber.render(ALL_PAIRS, list)
+        if result is None:
+            return
+        version, records = result
+        self.analyzer.set_lookup(PairLookup(records, version=version))
+        metrics.inc('worker_lookup_rebuilds')
+    
+    async def follow_lookup(self):
+        """Workers: rebuild the /token and inline indexes off the event loop whenever a newer snapshot lands"""
+        while True:
+            try:
+                snapshot = self.subscriber.latest
+                if snapshot is not None and self.analyzer.lookup.version != snapshot['version']:
+                    await asyncio.to_thread(self.build_published_lookup)
+            except Exception as e:
+                print(f"⚠️ Lookup rebuild error: {e}")
+            await asyncio.sleep(LOOKUP_POLL_SECONDS)
+    
+    async def inline_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """@bot <prefix> in any chat: Base tokens whose symbol or name starts with the prefix"""
+        from telegram import InlineQueryResultArticle, InputTextMessageContent
+        
+        metrics.inc('inline_queries')
+        with metrics.span('inline_query'):
+            matches = self.analyzer.prefixes.complete(update.inline_query.query, INLINE_RESULTS)
+            results = [
+                InlineQueryResultArticle(
+                    id=(record['pair_address'] or f"{record['token']}-{i}")[:64],
+                    title=f"{record['token']} · {record['name'][:40]}",
+                    description=(f"${record['price']:.8f} · {record['change_24h']:+.2f}% · "
+                                 f"liq ${record['liquidity']:,.0f} · {record['risk_level']}"),
+                    input_message_content=InputTextMessageContent(
+                        self.analyzer.renderer.format_opportunity(record), parse_mode='Markdown')
+                )
+                for i, record in enumerate(matches)
+            ]
+        await update.inline_query.answer(results, cache_time=INLINE_CACHE_SECONDS)
+    
+    async def token_lookup(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Look up one token by symbol, name, token address or pair address"""
+        if not context.args:
+            await update.message.reply_text("Usage: /token <symbol|address>")
+            return
+        
+        metrics.inc('token_lookups')
+        query = ' '.join(context.args)
+        with metrics.span('token_lookup'):
+            matches = self.current_lookup().find(query)
+        self.watch(matches[:MAX_TOKEN_MATCHES])
+        await update.message.reply_text(self.analyzer.format_token_matches(query, matches), parse_mode='Markdown')
+    
+    async def chart(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Price and liquidity chart for a token's deepest pair, from the stored candles"""
+        if not context.args:
+            await update.message.reply_text("Usage: /chart <symbol|address>")
+            return
+        if self.charts is None:
+            await update.message.reply_text("📉 Charts are unavailable on this bot (no ticker log or matplotlib).")
+            return
+        
+        query = ' '.join(context.args)
+        matches = self.current_lookup().find(query)
+        if not matches:
+            await update.message.reply_text(self.analyzer.format_token_matches(query, matches), parse_mode='Markdown')
+            return
+        
+        record = matches[0]
+        self.watch([record])
+        metrics.inc('charts')
+        with metrics.span('chart'):
+            chart = await self.charts.chart(token_key(record), f"{record['token']} · {record['name'][:30]}")
+        if chart is None:
+            await update.message.reply_text(f"📉 Not enough history for {record['token']} yet - try again later.")
+            return
+        
+        caption = f"📈 {record['token']} · last {CHART_HOURS:g}h of {CHART_RESOLUTION} candles · ${record['price']:.8f}"
+        with metrics.span('send_photo'):
+            message = await update.message.reply_photo(chart.photo, caption=caption)
+        if chart.file_id is None and message.photo:
+            # Telegram keeps the upload; resend it by file_id from now on
+            chart.uploaded(message.photo[-1].file_id)
+    
+    def watch(self, records):
+        """Pairs a user looked up: polled sooner in pairs/adaptive modes, via the scanner on workers"""
+        if DEX_FETCH_MODE == 'trending' or not records:
+            return
+        if self.interest_log is not None:
+            # Appended on the writer thread, off the event loop
+            pairs = [(record.get('chain_id'), record.get('pair_address')) for record in records]
+            self.analyzer.writer.submit(self.record_interest, pairs)
+            return
+        interest = {}
+        for record in records:
+            interest.setdefault(record.get('chain_id'), {})[record.get('pair_address')] = LOOKUP_INTEREST
+        self.analyzer.add_interest(interest)
+    
+    def record_interest(self, pairs):
+        try:
+            self.interest_log.record(pairs, LOOKUP_INTEREST)
+        except OSError as e:
+            print(f"⚠️ Interest log write failed: {e}")
+    
+    async def poll_twitter(self):
+        """Feed the mention-velocity tracker from Twitter in the background"""
+        while True:
+            try:
+                # Seed from the scanner's last Base rows rather than fetching: a fetch here would race
+                # the scanner's and swallow its snapshot_changed
+                result = self.analyzer.pipeline.last_result
+                if not self.twitter.token_index.tokens and result is not None:
+                    self.twitter.update_token_universe(result.rows)
+                await self.twitter.search_crypto_tweets(['base'])
+                self.velocity.prune()
+            except Exception as e:
+                print(f"⚠️ Twitter poll error: {e}")
+            await asyncio.sleep(TWITTER_POLL_SECONDS)
+    
+    def is_admin(self, update: Update):
+        """Whether the sender may run admin commands"""
+        user = update.effective_user
+        return user is not None and user.id in ADMIN_USER_IDS
+    
+    async def stats(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Admin-only metrics summary"""
+        if not self.is_admin(update):
+            await update.message.reply_text("⛔ Admin only.")
+            return
+        
+        text = f"📊 **Bot Metrics**\n\n{metrics.summary()}"
+        await update.message.reply_text(text, parse_mode='Markdown')
+    
+    async def profile(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Admin-only: profile the next N seconds of handler activity"""
+        if not self.is_admin(update):
+            await update.message.reply_text("⛔ Admin only.")
+            return
+        if self.profiler.active:
+            await update.message.reply_text("⏳ A profile is already running.")
+            return
+        
+        try:
+            seconds = int(context.args[0]) if context.args else 30
+        except ValueError:
+            await update.message.reply_text("Usage: /profile <seconds>")
+            return
+        
+        await update.message.reply_text(f"🔬 Profiling the next {seconds}s of bot activity...")
+        # Run in the background so other updates keep flowing while we sample
+        context.application.create_task(self.send_profile(update, seconds))
+    
+    async def send_profile(self, update: Update, seconds):
+        """Finish a /profile run and send back the hot functions and .prof dump"""
+        try:
+            report, path = await self.profiler.profile_for(seconds)
+        except RuntimeError as e:
+            await update.message.reply_text(f"⚠️ {e}")
+            return
+        
+        await update.message.reply_text(f"```\n{report[:3900]}\n```", parse_mode='Markdown')
+        with open(path, 'rb') as f:
+            await update.message.reply_document(f, filename=os.path.basename(path))
+    
+    async def profile_on_signal(self):
+        """SIGUSR1 equivalent of /profile: results go to the journal and PROFILE_DIR"""
+        try:
+            report, path = await self.profiler.profile_for(PROFILE_SIGNAL_SECONDS)
+        except RuntimeError as e:
+            print(f"⚠️ Profile skipped: {e}")
+            return
+        print(f"🔬 Profile written to {path}\n{report}")
+    
+    async def warm_start(self):
+        """Pre-warm DexScreener DNS/TLS, then refresh the snapshot; the blocking parts run in threads"""
+        warm = getattr(self.analyzer.fetcher, 'warm', None)
+        warm_seconds = await asyncio.to_thread(warm) if warm is not None else 0.0
+        metrics.set_gauge('startup_warm_seconds', warm_seconds)
+        result = await self.analyzer.scanner.run_async()
+        await asyncio.to_thread(self.analyzer.rebuild_lookup)
+        self.analyzer.track_opportunities()
+        await asyncio.wrap_future(self.analyzer.persist())
+        metrics.set_gauge('startup_refresh_seconds', time.perf_counter() - BOOT_STARTED)
+        print(f"🔥 Warm start done in {time.perf_counter() - BOOT_STARTED:.2f}s "
+              f"(connections {warm_seconds:.2f}s, source: {self.analyzer.data_source})")
+        return result
+    
+    async def post_init(self, app):
+        """Start background jobs once the application is running"""
+        # Telegram's connection is already warm: Application.initialize() has called getMe
+        self.startup_seconds = time.perf_counter() - BOOT_STARTED
+        metrics.set_gauge('startup_seconds', self.startup_seconds)
+        self.install_profile_signal(app)
+        
+        if self.subscriber is not None:
+            print(f"⚡ Worker ready in {self.startup_seconds:.2f}s, following {self.subscriber.path}")
+            # The socket subscriber follows a stream; the shared-memory reader is read on demand
+            follow = getattr(self.subscriber, 'run', None)
+            if follow is not None:
+                app.create_task(follow())
+            app.create_task(self.follow_lookup())
+            return
+        
+        print(f"⚡ Ready in {self.startup_seconds:.2f}s "
+              f"({'restored snapshot' if self.restored else 'no saved snapshot'})")
+        self.startup_refresh = asyncio.ensure_future(self.warm_start())
+        if ALERT_CHAT_ID:
+            self.alert_bot = app.bot
+            app.create_task(self.watch_liquidity())
+        
+        if self.twitter:
+            app.create_task(self.poll_twitter())
+    
+    def install_profile_signal(self, app):
+        """SIGUSR1 starts a profile of the running process"""
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGUSR1, lambda: app.create_task(self.profile_on_signal()))
+        except (NotImplementedError, AttributeError):
+            pass
     
     async def help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         help_text = """🤖 **Zcryptoanalysis Help**
 
 **Commands:**
 • `/scan` - Get current Base opportunities
+• `/scan <chain>` - solana (sol), ethereum (eth), arbitrum (arb)
+• `/token <symbol|address>` - Every pair of one token, by symbol, name or address
+• `/chart <symbol|address>` - Price and liquidity chart of one token, from stored candles
 • `/help` - Show this help
 • `/status` - Bot system info
 
 **How it works:**
-1. **Scans** DexScreener for Base chain tokens
-2. **Filters** by liquidity > $50k
+1. **Scans** DexScreener once for Base, Solana, Ethereum and Arbitrum
+2. **Filters** by liquidity (Base $50k, Solana $25k, Ethereum $250k, Arbitrum $75k)
 3. **Detects** price changes > 3%
 4. **Scores** risk from 1-10
 5. **Formats** for easy reading
@@ -270,29 +869,156 @@ class ZcryptoTelegramBot:
 ✅ **Online**: Ready for queries
 📊 **Data Source**: DexScreener API
 ⏱️ **Response Time**: <5 seconds
-🎯 **Focus**: Base chain tokens only
-💰 **Liquidity**: $50k+ minimum
+🎯 **Focus**: Base (default), Solana, Ethereum, Arbitrum
+💰 **Liquidity**: $50k+ on Base, tuned per chain
 📈 **Change Threshold**: 3%+
+🚀 **Startup**: {}
 
-**Last Update**: {}""".format(str(datetime.utcnow())[:19])
+**Last Update**: {}""".format(f"{self.startup_seconds:.2f}s" if self.startup_seconds is not None else "n/a",
+                              str(datetime.utcnow())[:19])
         await update.message.reply_text(status, parse_mode='Markdown')
     
     def run(self):
         """Run the bot"""
-        app = Application.builder().token(self.token).build()
+        from telegram.ext import Application, CommandHandler, InlineQueryHandler, CallbackQueryHandler
+        
+        app = (Application.builder().token(self.token).post_init(self.post_init)
+               .concurrent_updates(CONCURRENT_UPDATES).build())
         
         app.add_handler(CommandHandler('start', self.start))
         app.add_handler(CommandHandler('scan', self.scan))
+        app.add_handler(CommandHandler('token', self.token_lookup))
+        app.add_handler(CommandHandler('chart', self.chart))
+        app.add_handler(InlineQueryHandler(self.inline_query))
+        app.add_handler(CallbackQueryHandler(self.turn_page, pattern=r'^page:'))
         app.add_handler(CommandHandler('help', self.help))
         app.add_handler(CommandHandler('status', self.status))
+        app.add_handler(CommandHandler('stats', self.stats))
+        app.add_handler(CommandHandler('profile', self.profile))
+        
+        serve_metrics()
         
         print('🤖 Zcryptoanalysis Bot started for @Zcryptoanzlysis_bot')
         print('✅ Ready for Telegram queries!')
-        print('📍 Commands: /scan, /help, /status')
+        print('📍 Commands: /scan, /token, /chart, /help, /status')
         
         app.run_polling()
 
+class ScannerService:
+    """Scanner role: fetch and score on a timer, publishing each new snapshot to bot workers"""
+    
+    def __init__(self, bot, publisher=None, interval=SCAN_INTERVAL_SECONDS):
+        # Reuses the bot's analyzer, snapshot restore and Twitter tracking, without Telegram
+        self.bot = bot
+        self.analyzer = bot.analyzer
+        self.publisher = publisher or snapshot_publisher()
+        self.interval = interval
+        self.last_spikes = []
+        self.interest_log = InterestLog(INTEREST_LOG_PATH)
+    
+    def current_spikes(self):
+        """Social spikes with symbols resolved, since workers have no token index"""
+        if not self.bot.twitter:
+            return []
+        index = self.bot.twitter.token_index
+        return [dict(spike, symbol=index.describe(spike['token']).get('symbol', spike['token'][:10]))
+                for spike in self.bot.velocity.spikes()[:5]]
+    
+    def publish(self):
+        """Publish the current per-chain results"""
+        self.last_spikes = self.current_spikes()
+        version = self.publisher.publish(self.analyzer.build_snapshot(self.last_spikes))
+        if version is not None:
+            print(f"📡 Published snapshot {version} ({self.analyzer.data_source})")
+    
+    async def scan_once(self):
+        """One refresh; publishes only when the data or the social spikes changed"""
+        if DEX_FETCH_MODE != 'trending':
+            # Lookups on the workers since the last scan
+            self.analyzer.add_interest(await asyncio.to_thread(self.interest_log.drain))
+        await self.analyzer.scanner.run_async()
+        if self.analyzer.snapshot_changed:
+            await self.bot.send_alerts(self.analyzer.scanner.alerts())
+            # Published with the snapshot as the workers' /token index
+            await asyncio.to_thread(self.analyzer.rebuild_lookup)
+            self.analyzer.track_opportunities()
+            if self.bot.twitter:
+                self.bot.twitter.update_token_universe(self.analyzer.pipeline.last_result.rows)
+            await asyncio.wrap_future(self.analyzer.persist())
+        if self.analyzer.snapshot_changed or self.current_spikes() != self.last_spikes:
+            self.publish()
+    
+    async def start_alerts(self):
+        """The scanner has no Telegram application, so drain alerts go through a bare Bot"""
+        if not ALERT_CHAT_ID:
+            return
+        from telegram import Bot
+        self.bot.alert_bot = Bot(TELEGRAM_BOT_TOKEN)
+        await self.bot.alert_bot.initialize()
+    
+    async def run(self):
+        await self.start_alerts()
+        await self.publisher.start()
+        print(f"📡 Scanner publishing on {self.publisher.path}")
+        if self.bot.restored:
+            self.publish()
+        
+        await self.bot.warm_start()
+        self.publish()
+        if self.bot.twitter:
+            asyncio.create_task(self.bot.poll_twitter())
+        
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.scan_once()
+            except Exception as e:
+                print(f"⚠️ Scan error: {e}")
+    
+    def start(self):
+        serve_metrics()
+        asyncio.run(self.run())
+
+def dex_fetcher():
+    """DexScreener fetcher for the configured DEX_FETCH_MODE"""
+    if DEX_FETCH_MODE == 'trending':
+        return SyncFetcher(DEXSCREENER_ENDPOINTS, allow_sample=ALLOW_SAMPLE_DATA)
+    # aiohttp is only needed by the tracked-pair modes
+    from engine.async_fetcher import AsyncFetcher, MAX_ADDRESSES_PER_REQUEST
+    return AsyncFetcher(DEXSCREENER_ENDPOINTS, key='tickers', fetch_mode=DEX_FETCH_MODE,
+                        max_tracked_pairs=MAX_TRACKED_PAIRS, discovery_interval=DEX_DISCOVERY_SECONDS,
+                        scheduler=PollScheduler(requests_per_minute=DEX_REQUESTS_PER_MINUTE,
+                                                batch_size=MAX_ADDRESSES_PER_REQUEST),
+                        allow_sample=ALLOW_SAMPLE_DATA)
+
+def snapshot_publisher():
+    """Scanner side of the configured SNAPSHOT_TRANSPORT"""
+    if SNAPSHOT_TRANSPORT == 'socket':
+        return SnapshotPublisher(SNAPSHOT_SOCKET)
+    return ColumnarSnapshotWriter(SNAPSHOT_SHM_PATH)
+
+def snapshot_subscriber():
+    """Worker side of the configured SNAPSHOT_TRANSPORT"""
+    if SNAPSHOT_TRANSPORT == 'socket':
+        return SnapshotSubscriber(SNAPSHOT_SOCKET)
+    return ColumnarSnapshotReader(SNAPSHOT_SHM_PATH)
+
+def serve_metrics():
+    """Start the Prometheus endpoint; each process of a split deployment needs its own METRICS_PORT"""
+    if not METRICS_PORT:
+        return
+    try:
+        start_http_server(metrics, METRICS_PORT, METRICS_HOST)
+    except OSError as e:
+        print(f'⚠️ Metrics port {METRICS_PORT} unavailable: {e}')
+        return
+    print(f'📈 Metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics')
+
 if __name__ == '__main__':
-    print("🚀 Starting Zcryptoanalysis Bot...")
-    bot = ZcryptoTelegramBot()
-    bot.run()
\ No newline at end of file
+    print(f"🚀 Starting Zcryptoanalysis Bot ({BOT_ROLE})...")
+    if BOT_ROLE == 'scanner':
+        ScannerService(ZcryptoTelegramBot()).start()
+    elif BOT_ROLE == 'worker':
+        ZcryptoTelegramBot(subscriber=snapshot_subscriber()).run()
+    else:
+        ZcryptoTelegramBot().run()
\ No newline at end of file
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+On-demand profiling for a live bot process
+Runs cProfile over the next N seconds of event-loop activity, and samples the
+stacks of every other thread (to_thread and executor workers) over the same window
+"""
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+PROFILE_DIR = os.getenv('PROFILE_DIR', '/tmp/zcrypto-profiles')
+MAX_PROFILE_SECONDS = 300
+
+# Event loop plumbing that would otherwise dominate the cumulative listing
+IDLE_FILTER = r'^(?!.*(selectors|base_events|events\.py|epoll|_contextvars|sleep)).*'
+
+# Seconds between stack samples of the worker threads
+SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+
+# Innermost frames of a worker parked on its queue or a lock, not doing work
+IDLE_FRAMES = {('thread.py', '_worker'), ('threading.py', 'wait'), ('queue.py', 'get'),
+               ('selectors.py', 'select')}
+
+
+class ThreadSampler:
+    """Statistical profile of other threads, in pstats form so it merges with cProfile's
+
+    cProfile only sees the thread that enabled it. Here ncalls counts samples, and
+    times are the wall-clock time between samples
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL, exclude: Iterable[int] = ()):
+        self.interval = interval
+        self.exclude = set(exclude)
+        # function -> [samples, own time, cumulative time, {caller: samples}]
+        self.entries: Dict[tuple, list] = {}
+        self.samples = 0
+        self.stats = {}
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name='profile-sampler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while not self.stopped.wait(self.interval):
+            now = time.perf_counter()
+            for ident, frame in sys._current_frames().items():
+                if ident != own and ident not in self.exclude:
+                    self.sample(frame, now - last)
+            last = now
+
+    def sample(self, frame, elapsed: float):
+        """Charge one thread's current stack with the time since the previous sample"""
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+            return
+        self.samples += 1
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+
+        seen = set()
+        for depth, func in enumerate(stack):
+            entry = self.entries.get(func)
+            if entry is None:
+                entry = self.entries[func] = [0, 0.0, 0.0, {}]
+            if depth == 0:
+                entry[1] += elapsed
+            # Recursive frames count once per sample
+            if func in seen:
+                continue
+            seen.add(func)
+            entry[0] += 1
+            entry[2] += elapsed
+            if depth + 1 < len(stack):
+                caller = stack[depth + 1]
+                entry[3][caller] = entry[3].get(caller, 0) + 1
+
+    def create_stats(self):
+        """pstats hook: {function: (samples, samples, own time, cumulative time, callers)}"""
+        self.stats = {}
+        for func, (samples, own, cumulative, callers) in self.entries.items():
+            share = cumulative / samples if samples else 0.0
+            self.stats[func] = (samples, samples, own, cumulative,
+                                {caller: (n, n, 0.0, n * share) for caller, n in callers.items()})
+
+
+class HandlerProfiler:
+    def __init__(self, output_dir: str = PROFILE_DIR, top_n: int = 15):
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.active = False
+
+    async def profile_for(self, seconds: float) -> Tuple[str, str]:
+        """Profile the event loop and worker threads for a window, returning (top functions, .prof path)"""
+        if self.active:
+            raise RuntimeError('a profile is already running')
+        seconds = max(1.0, min(float(seconds), MAX_PROFILE_SECONDS))
+
+        self.active = True
+        profile = cProfile.Profile()
+        # The loop thread is covered exactly by cProfile
+        sampler = ThreadSampler(exclude=[threading.get_ident()])
+        try:
+            sampler.start()
+            profile.enable()
+            await asyncio.sleep(seconds)
+        finally:
+            profile.disable()
+            sampler.stop()
+            self.active = False
+
+        stats = pstats.Stats(profile)
+        if sampler.samples:
+            stats.add(sampler)
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof")
+        stats.dump_stats(path)
+        return self.top_functions(stats), path
+
+    def top_functions(self, stats: pstats.Stats) -> str:
+        """Hottest functions by cumulative time, excluding the idle event loop wait"""
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.strip_dirs().sort_stats('cumulative').print_stats(IDLE_FILTER, self.top_n)
+
+        lines = [line for line in stream.getvalue().splitlines() if line.strip()]
+        start = next((i for i, line in enumerate(lines) if line.lstrip().startswith('ncalls')), 0)
+        return '\n'.join(lines[start:])
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Per-chat token-bucket rate limiting for bot commands
+Keeps one user hammering /scan from costing a fetch and two API calls per press
+"""
+
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+
+class TokenBucket:
+    __slots__ = ('tokens', 'updated', 'warned')
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated = now
+        self.warned = False
+
+
+class ChatRateLimiter:
+    def __init__(self, rate_per_minute: float = 6, burst: int = 3, max_chats: int = 10000):
+        # A zero rate never refills (and the retry-after divides by it); a burst under 1 never allows a request
+        if not rate_per_minute > 0:
+            raise ValueError(f'rate_per_minute must be positive, got {rate_per_minute}')
+        if burst < 1:
+            raise ValueError(f'burst must be at least 1, got {burst}')
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self.max_chats = max_chats
+        self.buckets: OrderedDict = OrderedDict()
+
+    def bucket(self, chat_id: int, now: float) -> TokenBucket:
+        """The chat's bucket, refilled up to now; least recently seen chats are evicted"""
+        bucket = self.buckets.get(chat_id)
+        if bucket is None:
+            bucket = self.buckets[chat_id] = TokenBucket(self.capacity, now)
+            if len(self.buckets) > self.max_chats:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(chat_id)
+            bucket.tokens = min(self.capacity, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+        return bucket
+
+    def allow(self, chat_id: int, now: float = None) -> Tuple[bool, float]:
+        """(allowed, seconds until the next token) for one request from a chat"""
+        now = time.monotonic() if now is None else now
+        bucket = self.bucket(chat_id, now)
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            bucket.warned = False
+            return True, 0.0
+        return False, (1 - bucket.tokens) / self.rate
+
+    def should_warn(self, chat_id: int) -> bool:
+        """True once per throttled stretch, so the limit notice is not itself spam"""
+        bucket = self.buckets.get(chat_id)
+        if bucket is None or bucket.warned:
+            return False
+        bucket.warned = True
+        return True
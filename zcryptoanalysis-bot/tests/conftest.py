@@ -0,0 +1,9 @@
+"""
+Shared setup for the unit tests: the bot's modules live flat in its root,
+so that directory is put on the import path
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,35 @@
+"""
+Per-token aggregation across pools and its report line, including tokens
+whose pools all report zero liquidity
+"""
+
+from engine.aggregator import PairAggregator
+from engine.renderer import TelegramRenderer
+
+
+def pool(pair, price, liquidity, token='0xt', volume=1000.0):
+    return {'token': 'TOK', 'name': 'Token', 'token_address': token, 'pair_address': pair,
+            'price': price, 'liquidity': liquidity, 'volume_24h': volume, 'change_24h': 5.0,
+            'risk_level': '🟢 LOW', 'risk_score': 2}
+
+
+def test_weighted_price_volume_and_spread():
+    records = PairAggregator().annotate([pool('0xa', 1.0, 30000.0), pool('0xb', 1.1, 10000.0),
+                                         pool('0xc', 1.0, 1.0, token='0xother')])
+
+    a = records[0]
+    assert a['pairs'] == 2
+    assert a['weighted_price'] == (1.0 * 30000 + 1.1 * 10000) / 40000
+    assert a['total_volume'] == 2000.0
+    assert round(a['spread'], 6) == 10.0 and a['arbitrage']
+    assert records[2]['pairs'] == 1
+
+
+def test_zero_liquidity_token_renders_without_an_average():
+    records = PairAggregator().annotate([pool('0xa', 1.0, 0.0), pool('0xb', 1.2, 0.0)])
+    assert records[0]['weighted_price'] is None
+    assert records[0]['spread'] == 0.0
+
+    renderer = TelegramRenderer()
+    assert renderer.format_group(records[0]) == "🔀 2 pairs · Avg n/a · Total vol $2,000 · Spread 0.0%\n"
+    assert "Avg n/a" in renderer.format_opportunity(records[0])
@@ -0,0 +1,127 @@
+"""
+Tracked-pair polling in AsyncFetcher, with the HTTP layer replaced by a
+fake per-batch responder
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+import engine.async_fetcher as async_fetcher  # noqa: E402
+from engine.async_fetcher import AsyncFetcher  # noqa: E402
+from engine.scheduler import PollScheduler  # noqa: E402
+
+
+class FakeSession:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def pair(address, price=1.0, chain='base'):
+    return {'chainId': chain, 'pairAddress': address, 'priceUsd': str(price), 'volume': {'h24': 0}}
+
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    monkeypatch.setattr(async_fetcher, 'aiohttp', SimpleNamespace(ClientSession=FakeSession,
+                                                                  ClientTimeout=lambda total: None))
+    fetcher = AsyncFetcher(fetch_mode='adaptive', discovery_interval=float('inf'),
+                           scheduler=PollScheduler(requests_per_minute=60, min_interval=15, max_interval=600))
+    # Discovery is not under test here
+    fetcher.discovered_at = 0.0
+    fetcher.failing = set()
+    fetcher.requests = []
+
+    async def fetch_batch(session, path, addresses):
+        fetcher.requests.append((path, list(addresses)))
+        if fetcher.failing & set(addresses):
+            raise OSError('batch failed')
+        return [pair(address) for address in addresses]
+
+    fetcher.fetch_batch = fetch_batch
+    return fetcher
+
+
+def test_failed_batch_is_retried_soon(fetcher):
+    addresses = [f'0x{i:040x}' for i in range(40)]
+    fetcher.track_pairs(addresses)
+    fetcher.failing = {addresses[35]}
+
+    rows = asyncio.run(fetcher.fetch())
+    assert len(rows) == 30
+    assert fetcher.data_source == 'live'
+    scheduler = fetcher.scheduler
+    now = min(scheduler.due_at.values())
+    # The failed batch comes back after min_interval; the rest wait out their cadence
+    assert {a for a, due in scheduler.due_at.items() if due <= now + scheduler.min_interval} == set(addresses[30:])
+    assert all(scheduler.pairs[a].polled_at is None for a in addresses[30:])
+
+
+def test_every_batch_failing_serves_the_cache(fetcher):
+    fetcher.track_pairs(['0xa', '0xb'])
+    asyncio.run(fetcher.fetch())
+    fetcher.failing = {'0xa'}
+    for address in ('0xa', '0xb'):
+        fetcher.scheduler.schedule(address, 0.0)
+
+    rows = asyncio.run(fetcher.fetch())
+    assert fetcher.data_source == 'cache'
+    assert {row['pairAddress'] for row in rows} == {'0xa', '0xb'}
+    assert set(fetcher.scheduler.due_at) == {'0xa', '0xb'}
+
+
+def test_tracked_pairs_are_looked_up_per_chain(fetcher):
+    fetcher.track_pairs(['0xb1', '0xb2'])
+    fetcher.track_pairs(['sol1'], 'solana')
+    asyncio.run(fetcher.fetch())
+    assert sorted(fetcher.requests) == [('pairs/base', ['0xb1', '0xb2']), ('pairs/solana', ['sol1'])]
+
+
+def test_discovered_pairs_survive_later_polls(fetcher):
+    fetcher.discovered = [pair('0xtracked', price=9.0), pair('0xnew', price=3.0)]
+    fetcher.track_pairs(['0xtracked'])
+
+    rows = asyncio.run(fetcher.fetch())
+    assert {row['pairAddress']: row['priceUsd'] for row in rows} == {'0xtracked': '1.0', '0xnew': '3.0'}
+    # Nothing is due on the next poll; the discovered pair is still in the snapshot
+    rows = asyncio.run(fetcher.fetch())
+    assert {row['pairAddress'] for row in rows} == {'0xtracked', '0xnew'}
+    assert not fetcher.snapshot_changed
+
+
+def test_watchlist_survives_a_restart(fetcher):
+    fetcher.discovered = [pair('0xnew')]
+    fetcher.track_pairs(['0xb1'])
+    fetcher.track_pairs(['sol1'], 'solana')
+    asyncio.run(fetcher.fetch())
+    state = fetcher.export_state()
+
+    restarted = AsyncFetcher(fetch_mode='adaptive')
+    restarted.restore_state(state)
+    assert restarted.tracked_pairs == {'0xb1': 'base', 'sol1': 'solana'}
+    assert set(restarted.scheduler.due_at) == {'0xb1', 'sol1'}
+    assert set(restarted.pair_rows) == {'0xb1', 'sol1'}
+    assert [row['pairAddress'] for row in restarted.discovered] == ['0xnew']
+    assert restarted.data_source == 'restored'
+
+
+def test_interest_tracks_pairs_and_pulls_their_next_poll_in(fetcher):
+    fetcher.track_pairs(['0xa'])
+    asyncio.run(fetcher.fetch())
+    scheduler = fetcher.scheduler
+    dormant = scheduler.due_at['0xa']
+
+    fetcher.add_interest({'0xa': 5.0}, chain='base')
+    fetcher.add_interest(['So1'], chain='solana')
+    assert fetcher.tracked_pairs == {'0xa': 'base', 'So1': 'solana'}
+    assert scheduler.due_at['0xa'] < dormant
+    assert scheduler.pairs['So1'].interest == 1.0
@@ -0,0 +1,130 @@
+"""
+Chart cache: keyed by a per-token candle version, so only that token's
+updates invalidate it, with concurrent requests sharing one render
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import engine.chart as chart_module
+from engine.chart import ChartService
+from engine.rollup import OHLCVRollup
+from engine.ticker_log import TickerLog
+
+KEEP_ALL = {'raw': None, '1m': None, '5m': None}
+# An hour ago on a 5-minute boundary, inside the charts' 24-hour window
+START = time.time() // 300 * 300 - 3600
+
+
+def tick(token, price):
+    return {'token': token, 'token_address': token.lower(), 'price': price, 'liquidity': 50000.0,
+            'volume_24h': 1000.0, 'change_24h': 0.0}
+
+
+@pytest.fixture
+def rollup(tmp_path):
+    rollup = OHLCVRollup(TickerLog(str(tmp_path)), retention=KEEP_ALL)
+    for step in range(30):
+        rollup.add([tick('AAA', 1.0 + step), tick('BBB', 2.0 + step)], START + step * 60)
+    return rollup
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+
+    def render_chart(title, times, closes, liquidity):
+        calls.append((title, len(times)))
+        return b'png'
+
+    monkeypatch.setattr(chart_module, 'render_chart', render_chart)
+    return calls
+
+
+def service_for(rollup, **kwargs):
+    service = ChartService(rollup, **kwargs)
+    # The default thread pool instead of the process pool; the fake renderer is not picklable
+    service.executor = lambda: None
+    return service
+
+
+def test_token_version_ignores_other_tokens(rollup):
+    version = rollup.token_version('AAA', '5m')
+    rollup.add([tick('BBB', 99.0)], START + 30 * 60)
+    assert rollup.token_version('AAA', '5m') == version
+
+    rollup.add([tick('AAA', 99.0)], START + 31 * 60)
+    assert rollup.token_version('AAA', '5m') != version
+
+
+def test_token_version_of_flushed_candles(rollup, tmp_path):
+    # A reader process has no open buckets: the version comes from the newest stored bucket
+    reader = OHLCVRollup(TickerLog(str(tmp_path), readonly=True))
+    version = reader.token_version('AAA', '1m')
+    assert version == ((START + 28 * 60, 29.0, 50000.0),)
+    assert reader.token_version('missing', '1m') == ()
+
+
+def test_unchanged_token_is_served_from_cache(rollup, renders):
+    service = service_for(rollup)
+
+    async def scenario():
+        first = await service.chart('AAA', 'AAA 5m')
+        again = await service.chart('AAA', 'AAA 5m')
+        rollup.add([tick('BBB', 99.0)], START + 30 * 60)
+        after_other = await service.chart('AAA', 'AAA 5m')
+        rollup.add([tick('AAA', 99.0)], START + 31 * 60)
+        after_own = await service.chart('AAA', 'AAA 5m')
+        return first, again, after_other, after_own
+
+    first, again, after_other, after_own = asyncio.run(scenario())
+    assert first is again is after_other
+    assert after_own is not first
+    assert len(renders) == 2
+    # The superseded version is dropped rather than left to age out
+    assert list(service.cache) == [after_own.key]
+
+
+def test_concurrent_requests_share_one_render(rollup, renders):
+    service = service_for(rollup)
+
+    async def scenario():
+        return await asyncio.gather(*[service.chart('AAA', 'AAA 5m') for _ in range(5)])
+
+    charts = asyncio.run(scenario())
+    assert all(chart is charts[0] for chart in charts)
+    assert len(renders) == 1
+    assert service.pending == {}
+
+
+def test_cache_evicts_least_recently_used(rollup, renders):
+    service = service_for(rollup, cache_size=1)
+
+    async def scenario():
+        await service.chart('AAA', 'AAA')
+        await service.chart('BBB', 'BBB')
+        await service.chart('AAA', 'AAA')
+
+    asyncio.run(scenario())
+    assert len(renders) == 3
+    assert [key[0] for key in service.cache] == ['AAA']
+    assert set(service.latest) == {'AAA'}
+
+
+def test_upload_swaps_bytes_for_file_id(rollup, renders):
+    service = service_for(rollup)
+    chart = asyncio.run(service.chart('AAA', 'AAA'))
+    assert chart.photo == b'png'
+    chart.uploaded('file-1')
+    assert chart.photo == 'file-1' and chart.png is None
+    assert service.stats() == {'cached': 1, 'rendering': 0, 'uploaded': 1}
+
+
+def test_too_little_history_renders_nothing(tmp_path, renders):
+    rollup = OHLCVRollup(TickerLog(str(tmp_path)), retention=KEEP_ALL)
+    rollup.add([tick('AAA', 1.0)], time.time() - 60)
+    assert asyncio.run(service_for(rollup).chart('AAA', 'AAA')) is None
+    assert asyncio.run(service_for(rollup).chart('unknown', 'unknown')) is None
+    assert renders == []
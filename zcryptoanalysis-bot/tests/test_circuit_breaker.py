@@ -0,0 +1,64 @@
+"""
+Circuit breaker state transitions: trips past the failure threshold, backs
+off exponentially, and lets exactly one probe through when the backoff ends
+"""
+
+from circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+def tripped(now=0.0):
+    breaker = CircuitBreaker(failure_threshold=3, base_backoff=30, max_backoff=100)
+    for _ in range(3):
+        assert breaker.allow_request(now=now)
+        breaker.record_failure(now=now)
+    return breaker
+
+
+def test_opens_after_threshold_and_rejects_until_backoff_ends():
+    breaker = CircuitBreaker(failure_threshold=3, base_backoff=30)
+    breaker.record_failure(now=0.0)
+    breaker.record_failure(now=0.0)
+    assert breaker.state == CLOSED and breaker.allow_request(now=0.0)
+
+    breaker.record_failure(now=0.0)
+    assert breaker.state == OPEN
+    assert not breaker.allow_request(now=29.0)
+    assert breaker.retry_in(now=20.0) == 10.0
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = tripped()
+    assert breaker.allow_request(now=30.0)
+    assert breaker.state == HALF_OPEN and breaker.probe_in_flight
+    assert not breaker.allow_request(now=31.0)
+
+
+def test_successful_probe_closes_and_resets_backoff():
+    breaker = tripped()
+    breaker.allow_request(now=30.0)
+    breaker.record_success()
+
+    assert breaker.state == CLOSED and not breaker.probe_in_flight
+    assert breaker.failures == 0 and breaker.trips == 0
+    assert breaker.allow_request(now=30.0)
+
+
+def test_failed_probe_reopens_with_doubled_backoff_up_to_the_cap():
+    breaker = tripped()
+    breaker.allow_request(now=30.0)
+    breaker.record_failure(now=30.0)
+    assert breaker.state == OPEN and breaker.opened_until == 90.0
+
+    breaker.allow_request(now=90.0)
+    breaker.record_failure(now=90.0)
+    # 30 * 4 capped at max_backoff
+    assert breaker.opened_until == 190.0
+
+
+def test_released_probe_lets_the_next_call_probe():
+    breaker = tripped()
+    breaker.allow_request(now=30.0)
+    breaker.release_probe()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request(now=31.0)
@@ -0,0 +1,134 @@
+"""
+Liquidity-drain detector: drop and price-spike alerts, the gates that keep
+it quiet (dust, feed gaps, cooldown) and slot reuse for pairs that left,
+each run with the numpy diff and with the pure-Python one
+"""
+
+import random
+
+import pytest
+
+import engine.drain_detector as drain_detector
+from engine.drain_detector import LiquidityDrainDetector
+
+T0 = 1_700_000_000
+
+
+@pytest.fixture(autouse=True, params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(drain_detector, 'numpy', None)
+    return request.param
+
+
+def pair(address, liquidity, price=1.0):
+    return {'token': address.upper(), 'name': f'{address} token', 'chain_id': 'base', 'pair_address': address,
+            'price': price, 'liquidity': liquidity}
+
+
+def test_drop_past_threshold_alerts_once_with_details():
+    detector = LiquidityDrainDetector()
+    assert detector.observe([pair('a', 100000), pair('b', 100000)], now=T0 + 1000) == []
+
+    alerts = detector.observe([pair('a', 60000), pair('b', 75000)], now=T0 + 1060)
+    assert [alert['pair_address'] for alert in alerts] == ['a']
+    alert = alerts[0]
+    assert alert['previous_liquidity'] == 100000 and alert['liquidity'] == 60000
+    assert alert['drop_percent'] == 40.0
+    assert alert['price_spike'] is False
+    assert alert['detected_at'] == T0 + 1060
+
+
+def test_smaller_drop_alerts_when_price_spikes():
+    detector = LiquidityDrainDetector()
+    detector.observe([pair('a', 100000, price=1.0), pair('b', 100000, price=1.0)], now=T0 + 1000)
+    alerts = detector.observe([pair('a', 80000, price=1.5), pair('b', 80000, price=1.05)], now=T0 + 1060)
+    assert [alert['pair_address'] for alert in alerts] == ['a']
+    assert alerts[0]['price_spike'] is True
+    assert round(alerts[0]['price_change'], 6) == 50.0
+
+
+def test_alerts_sorted_by_liquidity_lost():
+    detector = LiquidityDrainDetector()
+    detector.observe([pair('small', 20000), pair('large', 500000)], now=T0 + 1000)
+    alerts = detector.observe([pair('small', 1000), pair('large', 100000)], now=T0 + 1060)
+    assert [alert['pair_address'] for alert in alerts] == ['large', 'small']
+
+
+def test_dust_pools_gaps_and_repeated_timestamps_are_ignored():
+    detector = LiquidityDrainDetector(min_liquidity=10000, max_gap=900)
+    detector.observe([pair('dust', 5000), pair('gap', 100000)], now=T0 + 1000)
+    # A snapshot with the same timestamp (e.g. a restored copy) is not compared
+    assert detector.observe([pair('gap', 1000)], now=T0 + 1000) == []
+    assert detector.observe([pair('dust', 100)], now=T0 + 1060) == []
+    # 'gap' was last seen 1000s ago, past max_gap
+    assert detector.observe([pair('gap', 1000)], now=T0 + 2000) == []
+
+
+def test_cooldown_suppresses_repeat_alerts():
+    detector = LiquidityDrainDetector(cooldown=1800)
+    detector.observe([pair('a', 200000)], now=T0 + 1000)
+    assert len(detector.observe([pair('a', 100000)], now=T0 + 1060)) == 1
+    assert detector.observe([pair('a', 50000)], now=T0 + 1120) == []
+    detector.observe([pair('a', 50000)], now=T0 + 2800)
+    assert len(detector.observe([pair('a', 20000)], now=T0 + 2900)) == 1
+
+
+def test_missing_pairs_are_evicted_and_their_slots_reused():
+    detector = LiquidityDrainDetector(evict_after=3)
+    detector.observe([pair('gone', 100000), pair('stays', 100000)], now=T0)
+    slot = detector.slots['gone']
+    # Missing from 3 snapshots by the 4th; the sweep only runs on every 3rd
+    for step in range(1, 5):
+        detector.observe([pair('stays', 100000)], now=T0 + step * 60)
+        assert 'gone' in detector.slots
+    detector.observe([pair('stays', 100000)], now=T0 + 300)
+    assert 'gone' not in detector.slots
+    assert len(detector) == 1
+    assert detector.free == [slot]
+
+    detector.observe([pair('new', 100000), pair('stays', 100000)], now=T0 + 360)
+    assert detector.slots['new'] == slot
+    assert len(detector.keys) == 2
+    assert detector.observe([pair('new', 10), pair('stays', 100000)], now=T0 + 420)[0]['previous_liquidity'] == 100000
+    # A returning pair starts clean: no comparison against liquidity from before its eviction
+    assert detector.observe([pair('gone', 10), pair('stays', 100000)], now=T0 + 480) == []
+
+
+def test_memory_stays_bounded_under_churn():
+    detector = LiquidityDrainDetector(evict_after=5)
+    for step in range(200):
+        detector.observe([pair(f'p{step}-{i}', 50000) for i in range(10)], now=T0 + step * 60)
+    # 2000 pairs came and went; at most two sweep periods' worth hold a slot
+    assert len(detector.keys) <= 100
+    assert len(detector) <= 100
+    assert len(detector.liquidity) == len(detector.keys)
+
+
+def test_empty_snapshot():
+    detector = LiquidityDrainDetector()
+    assert detector.observe([], now=T0) == []
+    detector.observe([pair('a', 100000)], now=T0 + 60)
+    assert detector.observe([], now=T0 + 120) == []
+
+
+def test_backends_agree_on_random_snapshots(backend, monkeypatch):
+    if backend != 'numpy':
+        pytest.skip('compares the numpy diff against the Python one')
+    rng = random.Random(7)
+    snapshots = []
+    for step in range(30):
+        records = [pair(f'p{i}', rng.choice([0.0, 5000.0, rng.uniform(1e4, 1e6)]), price=rng.uniform(0.5, 2.0))
+                   for i in range(300) if rng.random() < 0.9]
+        snapshots.append((records, T0 + step * 60))
+
+    def run():
+        detector = LiquidityDrainDetector(evict_after=7)
+        return [detector.observe([dict(r) for r in records], now=now) for records, now in snapshots]
+
+    vectorized = run()
+    monkeypatch.setattr(drain_detector, 'numpy', None)
+    assert run() == vectorized
+    assert sum(map(len, vectorized)) > 0
@@ -0,0 +1,115 @@
+"""
+SyncFetcher over a fake session: conditional requests and body dedup for
+unchanged snapshots, and bodies that are not a tickers payload counting as
+endpoint failures without leaving a half-open probe in flight
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from circuit_breaker import OPEN, HALF_OPEN
+from engine.fetcher import SyncFetcher
+
+ENDPOINT = 'https://dex.test/latest/dex/tickers'
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.sent_headers.append(headers)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        status, body = response
+        return SimpleNamespace(status_code=status, headers={'ETag': f'"{len(body)}"'}, content=body)
+
+
+def fetcher(*responses):
+    fetcher = SyncFetcher([ENDPOINT])
+    fetcher.session = FakeSession(*responses)
+    return fetcher
+
+
+def half_open(fetcher):
+    breaker = fetcher.breakers[ENDPOINT]
+    breaker.state, breaker.opened_until, breaker.trips = OPEN, 0.0, 1
+    return breaker
+
+
+def ok(rows):
+    return 200, json.dumps({'tickers': rows}).encode()
+
+
+def test_not_modified_reuses_the_snapshot():
+    rows = [{'chainId': 'base', 'pairAddress': '0xa'}]
+    f = fetcher(ok(rows), (304, b''))
+
+    assert f.fetch() == rows and f.snapshot_changed
+    assert f.session.sent_headers[0] == {}
+    first_time = f.snapshot_time
+
+    assert f.fetch() == rows
+    # The validator from the first response went out, and the 304 counts as fresh but unchanged data
+    assert f.session.sent_headers[1] == {'If-None-Match': f'"{len(ok(rows)[1])}"'}
+    assert not f.snapshot_changed
+    assert f.data_source == 'live' and f.snapshot_time >= first_time
+
+
+def test_identical_body_is_not_reparsed():
+    rows = [{'chainId': 'base', 'pairAddress': '0xa'}]
+    f = fetcher(ok(rows), ok(rows), ok(rows + [{'chainId': 'base', 'pairAddress': '0xb'}]))
+
+    first = f.fetch()
+    assert f.fetch() is first
+    assert not f.snapshot_changed
+
+    assert len(f.fetch()) == 2
+    assert f.snapshot_changed
+
+
+def test_not_modified_without_a_snapshot_is_a_failure():
+    f = fetcher((304, b''))
+    assert f.fetch() == []
+    assert f.breakers[ENDPOINT].failures == 1
+
+
+@pytest.mark.parametrize('body', [b'[1, 2]', b'"maintenance"', b'{"tickers": {"a": 1}}', b'<html>'])
+def test_bad_body_on_a_probe_reopens_the_breaker(body):
+    f = fetcher((200, body))
+    breaker = half_open(f)
+
+    assert f.fetch() == []
+    assert f.data_source == 'none'
+    assert breaker.state == OPEN and not breaker.probe_in_flight
+    # Never revalidated later with a 304
+    assert ENDPOINT not in f.validators
+
+
+def test_unexpected_error_still_clears_the_probe(monkeypatch):
+    f = fetcher(ok([{'chainId': 'base'}]))
+    breaker = half_open(f)
+
+    def broken(*args):
+        raise KeyError('boom')
+    monkeypatch.setattr(f, 'accept_response', broken)
+
+    assert f.fetch() == []
+    assert breaker.state == OPEN and not breaker.probe_in_flight
+
+
+def test_good_probe_closes_and_bad_body_keeps_last_snapshot():
+    rows = [{'chainId': 'base', 'pairAddress': '0xa'}]
+    f = fetcher(ok(rows), (200, b'null'))
+    breaker = half_open(f)
+
+    assert f.fetch() == rows and f.data_source == 'live'
+    assert breaker.state not in (OPEN, HALF_OPEN)
+
+    assert f.fetch() == rows
+    assert f.data_source == 'cache'
+    assert breaker.failures == 1 and not breaker.probe_in_flight
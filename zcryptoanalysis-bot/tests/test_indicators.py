@@ -0,0 +1,88 @@
+"""
+Streaming EMA, Wilder RSI and liquidity-weighted VWAP per pair, checked
+against straightforward batch formulas over the same price series
+"""
+
+import pytest
+
+from engine.indicators import IndicatorTracker, vwap_deviation
+
+T0 = 1_700_000_000.0
+
+
+def rec(price, liquidity=50000.0, pair='0xa'):
+    return {'token': 'TOK', 'pair_address': pair, 'price': price, 'liquidity': liquidity}
+
+
+def feed(tracker, prices, liquidity=50000.0, pair='0xa'):
+    record = None
+    for step, price in enumerate(prices):
+        record = tracker.update([rec(price, liquidity, pair)], now=T0 + step * 60)[0]
+    return record
+
+
+def reference_rsi(prices, period=14):
+    moves = [b - a for a, b in zip(prices, prices[1:])]
+    gain = sum(max(m, 0.0) for m in moves[:period]) / period
+    loss = sum(max(-m, 0.0) for m in moves[:period]) / period
+    for m in moves[period:]:
+        gain = (gain * (period - 1) + max(m, 0.0)) / period
+        loss = (loss * (period - 1) + max(-m, 0.0)) / period
+    return 100 - 100 / (1 + gain / loss)
+
+
+PRICES = [1.0, 1.02, 0.99, 1.05, 1.07, 1.03, 1.01, 1.08, 1.1, 1.04, 1.06, 1.12, 1.09, 1.11, 1.15, 1.13, 1.18, 1.16]
+
+
+def test_ema_and_rsi_match_batch_formulas():
+    record = feed(IndicatorTracker(ema_period=12, rsi_period=14), PRICES)
+
+    ema, alpha = PRICES[0], 2 / 13
+    for price in PRICES[1:]:
+        ema += alpha * (price - ema)
+    assert record['ema'] == pytest.approx(ema)
+    assert record['rsi'] == pytest.approx(reference_rsi(PRICES))
+
+
+def test_warm_up_leaves_indicators_unset():
+    tracker = IndicatorTracker(rsi_period=14)
+    record = feed(tracker, [1.0])
+    assert (record['ema'], record['rsi'], record['vwap']) == (None, None, None)
+
+    # EMA and VWAP after one move; RSI only after rsi_period moves
+    record = feed(tracker, PRICES[:14])
+    assert record['ema'] is not None and record['vwap'] is not None and record['rsi'] is None
+    assert feed(IndicatorTracker(rsi_period=14), PRICES[:15])['rsi'] is not None
+
+
+def test_vwap_weights_prices_by_liquidity():
+    tracker = IndicatorTracker(vwap_period=48)
+    tracker.update([rec(1.0, liquidity=90000.0)], now=T0)
+    record = tracker.update([rec(2.0, liquidity=10000.0)], now=T0 + 60)[0]
+
+    keep = 1 - 2 / 49
+    assert record['vwap'] == pytest.approx((1.0 * 90000 * keep + 2.0 * 10000) / (90000 * keep + 10000))
+    assert vwap_deviation(2.0, record['vwap']) > 0
+    assert vwap_deviation(2.0, None) is None
+
+
+def test_same_snapshot_twice_is_one_sample():
+    tracker = IndicatorTracker()
+    tracker.update([rec(1.0)], now=T0)
+    tracker.update([rec(1.5)], now=T0 + 60)
+    once = dict(tracker.update([rec(1.5)], now=T0 + 60)[0])
+    assert tracker.samples[tracker.slots['0xa']] == 2
+    assert once['ema'] == pytest.approx(1.0 + 2 / 13 * 0.5)
+
+
+def test_idle_pairs_are_pruned_and_slots_reused_clean():
+    tracker = IndicatorTracker(max_idle=3600)
+    feed(tracker, [1.0, 2.0], pair='old')
+    slot = tracker.slots['old']
+
+    tracker.update([rec(5.0, pair='new')], now=T0 + 2 * 3600)
+    assert 'old' not in tracker.slots
+    tracker.update([rec(5.0, pair='newer')], now=T0 + 2 * 3600 + 60)
+    assert tracker.slots['newer'] == slot
+    assert tracker.samples[slot] == 1 and tracker.ema[slot] == 5.0
+    assert tracker.stats()['pairs'] == 2
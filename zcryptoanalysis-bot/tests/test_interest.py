@@ -0,0 +1,29 @@
+"""
+Worker-to-scanner interest log: appends from several processes, drained
+once per scan into per-chain weights
+"""
+
+from engine.interest import InterestLog
+
+
+def test_drain_sums_weights_per_chain_and_empties_the_log(tmp_path):
+    log = InterestLog(str(tmp_path / 'interest.log'))
+    assert log.record([('base', '0xa'), ('solana', 'So1')]) == 2
+    assert log.record([('base', '0xa'), ('base', '0xb')], weight=0.5) == 2
+
+    assert log.drain() == {'base': {'0xa': 1.5, '0xb': 0.5}, 'solana': {'So1': 1.0}}
+    assert log.drain() == {}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_entries_without_chain_or_address_are_dropped(tmp_path):
+    log = InterestLog(str(tmp_path / 'interest.log'))
+    assert log.record([(None, '0xa'), ('base', ''), ('base', None)]) == 0
+    assert log.drain() == {}
+
+
+def test_malformed_lines_are_skipped(tmp_path):
+    path = tmp_path / 'interest.log'
+    path.write_text('base\t0xa\t1\ngarbage\nbase\t0xa\tnot-a-number\n')
+
+    assert InterestLog(str(path)).drain() == {'base': {'0xa': 1.0}}
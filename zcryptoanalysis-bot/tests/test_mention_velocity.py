@@ -0,0 +1,47 @@
+"""
+Mention-velocity spikes: sliding windows, and no spikes for tokens whose
+baseline has not had time to form
+"""
+
+from mention_velocity import MentionVelocity, MIN_BASELINE_SAMPLES
+
+T0 = 1_800_000_000.0
+
+
+def burst(velocity, token, now, count):
+    for i in range(count):
+        velocity.record(token, ts=now, now=now)
+
+
+def test_new_token_burst_is_not_a_spike():
+    velocity = MentionVelocity()
+    burst(velocity, 'NEW', T0, 40)
+
+    assert velocity.counts('NEW', now=T0)['5m'] == 40
+    assert velocity.tokens['NEW'].zscore() == 0.0
+    assert velocity.spikes(now=T0) == []
+
+
+def test_burst_over_a_formed_baseline_is_a_spike():
+    velocity = MentionVelocity()
+    # One mention per 5m bucket until the baseline has enough history
+    now = T0
+    for _ in range(MIN_BASELINE_SAMPLES + 1):
+        velocity.record('OLD', ts=now, now=now)
+        now += 300
+    assert velocity.spikes(now=now) == []
+
+    burst(velocity, 'OLD', now, 20)
+    burst(velocity, 'NEW', now, 20)
+    spikes = velocity.spikes(now=now)
+    assert [spike['token'] for spike in spikes] == ['OLD']
+    assert spikes[0]['mentions_5m'] == 20 and spikes[0]['zscore'] >= velocity.z_threshold
+
+
+def test_windows_expire_old_mentions():
+    velocity = MentionVelocity()
+    burst(velocity, 'TOK', T0, 3)
+
+    assert velocity.counts('TOK', now=T0 + 360) == {'5m': 0, '1h': 3, '24h': 3}
+    assert velocity.counts('TOK', now=T0 + 2 * 86400)['24h'] == 0
+    assert velocity.prune(now=T0 + 2 * 86400) == 1
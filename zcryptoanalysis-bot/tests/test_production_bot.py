@@ -0,0 +1,195 @@
+"""
+production_bot checked without a bot token or network: Markdown-safe
+formatting of user and API text, /scan refresh coalescing, and paging
+through cached report pages
+"""
+
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+import production_bot
+from production_bot import ProductionZcryptoBot, ZcryptoTelegramBot, ReportPages, markdown_code, PAGE_CACHE_SIZE
+
+
+@pytest.fixture
+def analyzer():
+    # Formatting needs no fetcher, scanner or snapshot store
+    return ProductionZcryptoBot.__new__(ProductionZcryptoBot)
+
+
+def test_markdown_code_keeps_the_span_closed():
+    assert markdown_code('my_token*[x]') == '`my_token*[x]`'
+    assert markdown_code('a`b') == "`a'b`"
+
+
+def test_token_query_is_sent_as_code(analyzer):
+    text = analyzer.format_token_matches('pepe_*coin', [])
+    assert text == "🔎 No pairs found for `pepe_*coin` in the latest snapshot."
+    assert '**' not in text
+
+
+def test_drain_alert_escapes_token_names(analyzer):
+    pytest.importorskip('telegram.helpers')
+    alert = {'chain_id': 'base', 'token': 'RUG_X', 'name': 'Rug_*Pull', 'pair_address': '0xp',
+             'previous_liquidity': 100000.0, 'liquidity': 10000.0, 'drop_percent': 90.0,
+             'price': 1.0, 'price_change': 25.0, 'price_spike': False}
+    first_line = analyzer.format_drain_alert(alert).split('\n')[0]
+    assert first_line == "🚨 **Liquidity drain:** `RUG_X` (Rug\\_\\*Pull)"
+    assert production_bot.CHAIN_LABELS['base'] in analyzer.format_drain_alert(alert)
+
+
+@pytest.fixture
+def bot():
+    """A bot whose refresh is a counted, gated stand-in for a fetch"""
+    bot = ZcryptoTelegramBot.__new__(ZcryptoTelegramBot)
+    bot.startup_refresh = None
+    bot.restored = False
+    bot.refresh_task = None
+    bot.refreshes = 0
+    bot.gate = None
+
+    async def refresh():
+        bot.refreshes += 1
+        await bot.gate.wait()
+    bot.refresh = refresh
+    return bot
+
+
+def test_concurrent_scans_share_one_refresh(bot):
+    async def scenario():
+        bot.gate = asyncio.Event()
+        waiters = [asyncio.ensure_future(bot.coalesced_refresh()) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        assert bot.refreshes == 1
+        bot.gate.set()
+        await asyncio.gather(*waiters)
+        assert bot.refresh_task is None
+
+        # The next scan after it finished starts a new one
+        await bot.coalesced_refresh()
+        assert bot.refreshes == 2
+    asyncio.run(scenario())
+
+
+def test_cancelled_scan_does_not_cancel_the_shared_refresh(bot):
+    async def scenario():
+        bot.gate = asyncio.Event()
+        first = asyncio.ensure_future(bot.coalesced_refresh())
+        second = asyncio.ensure_future(bot.coalesced_refresh())
+        await asyncio.sleep(0.01)
+        task = bot.refresh_task
+
+        first.cancel()
+        await asyncio.sleep(0)
+        assert first.cancelled()
+        assert not task.done()
+
+        bot.gate.set()
+        await second
+        assert task.done() and not task.cancelled()
+        assert bot.refreshes == 1
+    asyncio.run(scenario())
+
+
+def test_scans_during_startup_wait_for_the_startup_refresh(bot):
+    async def scenario():
+        startup_done = asyncio.Event()
+        bot.startup_refresh = asyncio.ensure_future(startup_done.wait())
+        waiter = asyncio.ensure_future(bot.coalesced_refresh())
+        await asyncio.sleep(0)
+        assert not waiter.done() and bot.refreshes == 0
+
+        startup_done.set()
+        await waiter
+        assert bot.refreshes == 0
+
+        # With a restored snapshot to serve, scans do not wait at all
+        bot.restored = True
+        bot.startup_refresh = asyncio.ensure_future(asyncio.Event().wait())
+        await bot.coalesced_refresh()
+        bot.startup_refresh.cancel()
+    asyncio.run(scenario())
+
+
+class FakeCallbackQuery:
+    def __init__(self, data):
+        self.data = data
+        self.answers = []
+        self.edits = []
+
+    async def answer(self, *args, **kwargs):
+        self.answers.append((args, kwargs))
+
+    async def edit_message_text(self, text, **kwargs):
+        self.edits.append((text, kwargs))
+
+
+@pytest.fixture
+def pager():
+    """A bot with one cached three-page report, and no social footer"""
+    bot = ZcryptoTelegramBot.__new__(ZcryptoTelegramBot)
+    bot.pages = OrderedDict()
+    bot.subscriber = None
+    bot.twitter = None
+    bot.cache_pages(('base', '7'), ReportPages(['P0', 'P1', 'P2']))
+    return bot
+
+
+def press(bot, data):
+    query = FakeCallbackQuery(data)
+    asyncio.run(bot.turn_page(SimpleNamespace(callback_query=query), None))
+    return query
+
+
+def callbacks(markup):
+    return [(button.text, button.callback_data) for button in markup.inline_keyboard[0]]
+
+
+def test_keyboard_offers_only_pages_that_exist(pager):
+    pytest.importorskip('telegram')
+    report = pager.pages[('base', '7')]
+    assert callbacks(pager.page_keyboard(('base', '7'), report, 0)) == [('Next ▶️', 'page:base:7:1')]
+    assert callbacks(pager.page_keyboard(('base', '7'), report, 1)) == [
+        ('◀️ Prev', 'page:base:7:0'), ('Next ▶️', 'page:base:7:2')]
+    assert callbacks(pager.page_keyboard(('base', '7'), report, 2)) == [('◀️ Prev', 'page:base:7:1')]
+    # A single page, or a report not in the cache, gets no buttons
+    assert pager.page_keyboard(('base', '7'), ReportPages(['only']), 0) is None
+    assert pager.page_keyboard(None, report, 0) is None
+
+
+def test_turning_a_page_edits_in_place_from_the_cache(pager):
+    pytest.importorskip('telegram')
+    query = press(pager, 'page:base:7:2')
+    assert query.answers == [((), {})]
+    (text, kwargs), = query.edits
+    assert text == 'P2' and kwargs['parse_mode'] == 'Markdown'
+    assert callbacks(kwargs['reply_markup']) == [('◀️ Prev', 'page:base:7:1')]
+
+
+@pytest.mark.parametrize('data', ['page:base:7:3', 'page:base:7:-1', 'page:base:8:0', 'page:solana:7:0'])
+def test_pages_out_of_range_or_evicted_ask_for_a_fresh_scan(pager, data):
+    query = press(pager, data)
+    assert query.edits == []
+    (args, kwargs), = query.answers
+    assert 'expired' in args[0] and kwargs == {'show_alert': True}
+
+
+@pytest.mark.parametrize('data', ['page:base:7', 'page:base:7:next', 'garbage'])
+def test_malformed_callbacks_are_only_acknowledged(pager, data):
+    query = press(pager, data)
+    assert query.answers == [((), {})] and query.edits == []
+
+
+def test_page_cache_keeps_the_most_recently_used_reports(pager):
+    pytest.importorskip('telegram')
+    for version in range(PAGE_CACHE_SIZE - 1):
+        pager.cache_pages(('base', f'v{version}'), ReportPages(['x', 'y']))
+    # Paging the oldest report makes it recent again
+    press(pager, 'page:base:7:0')
+    pager.cache_pages(('base', 'newest'), ReportPages(['x', 'y']))
+
+    assert len(pager.pages) == PAGE_CACHE_SIZE
+    assert ('base', '7') in pager.pages and ('base', 'v0') not in pager.pages
@@ -0,0 +1,82 @@
+"""
+On-demand profiler: work pushed to worker threads shows up next to the
+event loop's own functions
+"""
+
+import asyncio
+import os
+import pstats
+import threading
+
+from profiler import HandlerProfiler, ThreadSampler
+
+
+def busy_in_worker(seconds):
+    """CPU-bound loop, run through asyncio.to_thread"""
+    deadline = threading.Event()
+    timer = threading.Timer(seconds, deadline.set)
+    timer.start()
+    total = 0
+    while not deadline.is_set():
+        total += sum(range(1000))
+    return total
+
+
+def busy_on_loop():
+    return sum(range(200000))
+
+
+def test_to_thread_work_is_profiled(tmp_path):
+    profiler = HandlerProfiler(output_dir=str(tmp_path), top_n=40)
+
+    async def workload():
+        await asyncio.sleep(0.05)
+        busy_on_loop()
+        await asyncio.to_thread(busy_in_worker, 0.5)
+
+    async def scenario():
+        task = asyncio.create_task(workload())
+        result = await profiler.profile_for(1)
+        await task
+        return result
+
+    report, path = asyncio.run(scenario())
+    assert 'busy_in_worker' in report
+    assert 'busy_on_loop' in report
+    assert not profiler.active
+
+    stats = pstats.Stats(path)
+    worker = [value for func, value in stats.stats.items() if func[2] == 'busy_in_worker']
+    assert worker and worker[0][3] > 0.2
+    assert os.path.dirname(path) == str(tmp_path)
+
+
+def test_parked_workers_are_not_sampled():
+    sampler = ThreadSampler(interval=0.001)
+    parked = threading.Event()
+    thread = threading.Thread(target=parked.wait)
+    thread.start()
+    sampler.start()
+    try:
+        threading.Event().wait(0.05)
+    finally:
+        sampler.stop()
+        parked.set()
+        thread.join()
+    assert sampler.samples == 0
+
+
+def test_second_profile_is_refused_while_one_runs(tmp_path):
+    profiler = HandlerProfiler(output_dir=str(tmp_path))
+
+    async def scenario():
+        first = asyncio.create_task(profiler.profile_for(1))
+        await asyncio.sleep(0)
+        try:
+            await profiler.profile_for(1)
+        except RuntimeError as exc:
+            error = str(exc)
+        await first
+        return error
+
+    assert asyncio.run(scenario()) == 'a profile is already running'
@@ -0,0 +1,63 @@
+"""
+Per-chat token buckets for /scan: burst, refill, retry-after and the
+one-warning-per-stretch rule
+"""
+
+import pytest
+
+from rate_limit import ChatRateLimiter
+
+
+def test_burst_then_throttled_with_retry_after():
+    limiter = ChatRateLimiter(rate_per_minute=6, burst=3)
+    assert [limiter.allow(1, now=0.0)[0] for _ in range(3)] == [True] * 3
+
+    allowed, retry_in = limiter.allow(1, now=0.0)
+    assert not allowed
+    # 6 per minute: one token every 10s
+    assert retry_in == pytest.approx(10.0)
+    # Other chats have their own bucket
+    assert limiter.allow(2, now=0.0) == (True, 0.0)
+
+
+def test_bucket_refills_at_rate_up_to_burst():
+    limiter = ChatRateLimiter(rate_per_minute=6, burst=3)
+    for _ in range(3):
+        limiter.allow(1, now=0.0)
+
+    allowed, retry_in = limiter.allow(1, now=4.0)
+    assert not allowed and retry_in == pytest.approx(6.0)
+    assert limiter.allow(1, now=10.0)[0]
+    assert not limiter.allow(1, now=10.0)[0]
+
+    # A long idle stretch refills to the burst, not beyond it
+    assert [limiter.allow(1, now=1000.0)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_warns_once_per_throttled_stretch():
+    limiter = ChatRateLimiter(rate_per_minute=6, burst=1)
+    limiter.allow(1, now=0.0)
+    assert not limiter.allow(1, now=1.0)[0]
+    assert limiter.should_warn(1)
+    assert not limiter.allow(1, now=2.0)[0]
+    assert not limiter.should_warn(1)
+
+    # An allowed request ends the stretch
+    assert limiter.allow(1, now=20.0)[0]
+    assert not limiter.allow(1, now=20.0)[0]
+    assert limiter.should_warn(1)
+
+
+def test_least_recently_seen_chats_are_evicted():
+    limiter = ChatRateLimiter(burst=1, max_chats=2)
+    limiter.allow(1, now=0.0)
+    limiter.allow(2, now=0.0)
+    limiter.allow(1, now=1.0)
+    limiter.allow(3, now=1.0)
+    assert list(limiter.buckets) == [1, 3]
+
+
+@pytest.mark.parametrize('rate, burst', [(0, 3), (-1, 3), (6, 0)])
+def test_invalid_settings_are_rejected(rate, burst):
+    with pytest.raises(ValueError):
+        ChatRateLimiter(rate_per_minute=rate, burst=burst)
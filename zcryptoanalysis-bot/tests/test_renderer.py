@@ -0,0 +1,70 @@
+"""
+Report pagination: every opportunity lands on exactly one page, pages stay
+within their entry and size budgets, and continuation pages say where they are
+"""
+
+import re
+
+import pytest
+
+from engine.renderer import SEPARATOR, TelegramRenderer
+
+
+def opportunity(i, name='Token'):
+    return {'token': f'T{i}', 'name': name, 'price': 0.001 * (i + 1), 'change_24h': 5.0 - i,
+            'liquidity': 10_000 + i, 'volume_24h': 50_000 + i, 'risk_level': '🟡 MEDIUM',
+            'risk_score': i % 10 + 1}
+
+
+def entries(page):
+    return re.findall(r'\*\*(T\d+)\*\*', page)
+
+
+@pytest.fixture
+def renderer():
+    return TelegramRenderer(chain_label='Base chain')
+
+
+def test_no_opportunities_is_one_notice_page(renderer):
+    assert renderer.render_pages([]) == ['ℹ️ No Base chain opportunities found meeting criteria.']
+
+
+def test_a_short_report_is_one_page_without_a_footer(renderer):
+    opps = [opportunity(i) for i in range(3)]
+    page, = renderer.render_pages(opps, per_page=5)
+    assert page == renderer.header(opps) + SEPARATOR.join(map(renderer.format_opportunity, opps))
+    assert '📄 Page' not in page
+
+
+@pytest.mark.parametrize('count, per_page, sizes', [(5, 5, [5]), (6, 5, [5, 1]), (12, 5, [5, 5, 2]), (4, 1, [1, 1, 1, 1])])
+def test_pages_hold_at_most_per_page_entries(renderer, count, per_page, sizes):
+    pages = renderer.render_pages([opportunity(i) for i in range(count)], per_page=per_page)
+
+    assert [len(entries(page)) for page in pages] == sizes
+    assert [t for page in pages for t in entries(page)] == [f'T{i}' for i in range(count)]
+
+
+def test_continuation_pages_carry_a_range_title_and_footer(renderer):
+    pages = renderer.render_pages([opportunity(i) for i in range(12)], per_page=5)
+
+    assert pages[0].startswith('🎯 **Zcryptoanalysis Report**')
+    assert pages[1].startswith('📈 **Base chain opportunities 6-10 of 12**')
+    assert pages[2].startswith('📈 **Base chain opportunities 11-12 of 12**')
+    assert [page.rstrip().rsplit('\n', 1)[-1] for page in pages] == ['📄 Page 1/3', '📄 Page 2/3', '📄 Page 3/3']
+
+
+def test_pages_close_before_max_chars(renderer):
+    opps = [opportunity(i, name='N' * 20) for i in range(20)]
+    entry = len(renderer.format_opportunity(opps[0])) + len(SEPARATOR)
+    max_chars = len(renderer.header(opps)) + 3 * entry
+
+    pages = renderer.render_pages(opps, per_page=10, max_chars=max_chars)
+
+    assert len(pages) > 2
+    assert all(len(page) <= max_chars for page in pages)
+    assert [t for page in pages for t in entries(page)] == [f'T{i}' for i in range(20)]
+
+
+def test_an_entry_larger_than_max_chars_still_gets_its_own_page(renderer):
+    pages = renderer.render_pages([opportunity(i) for i in range(3)], per_page=5, max_chars=10)
+    assert [entries(page) for page in pages] == [['T0'], ['T1'], ['T2']]
@@ -0,0 +1,139 @@
+"""
+OHLCV rollups: candles match the raw snapshots at every resolution, a
+restarted process catches up to the same candles, and tiers compact
+"""
+
+import random
+
+import pytest
+
+from engine.rollup import OHLCVRollup
+from engine.ticker_log import TickerLog
+
+T0 = 1_699_920_000
+KEEP_ALL = {'raw': None, '1m': None, '5m': None}
+
+
+def tick(token, price, liquidity=50000.0, address=None):
+    return {'token': token, 'token_address': address or token.lower(), 'price': price, 'liquidity': liquidity,
+            'volume_24h': 1000.0, 'change_24h': 0.0}
+
+
+def random_walk(seconds, step=37, seed=2):
+    """(timestamp, price) samples of one token"""
+    random.seed(seed)
+    price, samples = 1.0, []
+    for ts in range(T0, T0 + seconds, step):
+        price *= 1 + random.uniform(-0.01, 0.01)
+        samples.append((float(ts), price))
+    return samples
+
+
+def expected(samples, seconds):
+    """bucket start -> (open, high, low, close, samples), computed straight from the raw samples"""
+    buckets = {}
+    for ts, price in samples:
+        bucket = buckets.setdefault(ts - ts % seconds, [price, price, price, price, 0])
+        bucket[1] = max(bucket[1], price)
+        bucket[2] = min(bucket[2], price)
+        bucket[3] = price
+        bucket[4] += 1
+    return {start: tuple(bucket) for start, bucket in buckets.items()}
+
+
+def ohlc(candles):
+    return {c['timestamp']: (c['open'], c['high'], c['low'], c['close'], c['samples']) for c in candles}
+
+
+def record_all(rollup, samples, token='AAA'):
+    for ts, price in samples:
+        records = [tick(token, price)]
+        rollup.log.append(records, ts)
+        rollup.add(records, ts)
+
+
+@pytest.mark.parametrize('resolution, seconds', [('1m', 60), ('5m', 300), ('1h', 3600)])
+def test_candles_match_raw_samples(tmp_path, resolution, seconds):
+    samples = random_walk(30000)
+    rollup = OHLCVRollup(TickerLog(str(tmp_path)), retention=KEEP_ALL)
+    record_all(rollup, samples)
+    assert ohlc(rollup.candles('AAA', resolution, 0, 1e12)) == expected(samples, seconds)
+
+
+def test_snapshot_takes_price_from_the_deepest_pool(tmp_path):
+    rollup = OHLCVRollup(TickerLog(str(tmp_path)), retention=KEEP_ALL)
+    # Two pools of one token, and a second snapshot where the other pool is deeper
+    rollup.add([tick('AAA', 1.0, 10000.0, '0xa'), tick('AAA', 2.0, 90000.0, '0xa')], T0)
+    rollup.add([tick('AAA', 4.0, 80000.0, '0xa'), tick('AAA', 3.0, 20000.0, '0xa')], T0 + 30)
+    candle, = rollup.candles('0xa', '1m', 0, 1e12)
+    assert (candle['open'], candle['high'], candle['low'], candle['close']) == (2.0, 4.0, 2.0, 4.0)
+    assert candle['liquidity'] == 100000.0
+    assert candle['volume_24h'] == 2000.0
+    assert candle['samples'] == 2
+
+
+def test_restart_catches_up_to_a_continuous_run(tmp_path):
+    samples = random_walk(30000)
+    half = len(samples) // 2
+
+    continuous = OHLCVRollup(TickerLog(str(tmp_path / 'continuous')), retention=KEEP_ALL)
+    record_all(continuous, samples)
+
+    first = OHLCVRollup(TickerLog(str(tmp_path / 'restarted')), retention=KEEP_ALL)
+    record_all(first, samples[:half])
+    # The process dies with its open buckets; the ticker log and flushed candles survive
+    restarted = OHLCVRollup(TickerLog(str(tmp_path / 'restarted')), retention=KEEP_ALL)
+    assert restarted.catch_up() > 0
+    record_all(restarted, samples[half:])
+
+    for resolution in ('1m', '5m', '1h', '1d'):
+        assert ohlc(restarted.candles('AAA', resolution, 0, 1e12)) == \
+            ohlc(continuous.candles('AAA', resolution, 0, 1e12)), resolution
+
+
+def test_catch_up_from_the_log_alone(tmp_path):
+    samples = random_walk(20000)
+    log = TickerLog(str(tmp_path))
+    for ts, price in samples:
+        log.append([tick('AAA', price)], ts)
+    rollup = OHLCVRollup(TickerLog(str(tmp_path)), retention=KEEP_ALL)
+    assert rollup.catch_up() == len(samples)
+    assert ohlc(rollup.candles('AAA', '5m', 0, 1e12)) == expected(samples, 300)
+
+
+def test_compaction_applies_each_tiers_retention(tmp_path):
+    rollup = OHLCVRollup(TickerLog(str(tmp_path)), retention={'raw': 3600, '1m': 7200, '5m': 4 * 3600})
+    samples = random_walk(6 * 3600, step=60)
+    record_all(rollup, samples)
+    now = samples[-1][0]
+
+    dropped = rollup.compact(now)
+    assert dropped['raw'] > 0 and dropped['1m'] > 0 and dropped['5m'] > 0
+    assert '1h' not in dropped
+    assert rollup.log.stats()['first'] >= now - 3600
+    assert min(c['timestamp'] for c in rollup.candles('AAA', '1m', 0, 1e12)) >= now - 7200
+    assert min(c['timestamp'] for c in rollup.candles('AAA', '5m', 0, 1e12)) >= now - 4 * 3600
+    # Hourly candles are kept forever and still cover the whole run
+    assert ohlc(rollup.candles('AAA', '1h', 0, 1e12)) == expected(samples, 3600)
+    # Raw history that survived is unchanged
+    assert [s['price'] for s in rollup.log.history('AAA', now - 600, now)] == \
+        [price for ts, price in samples if ts >= now - 600]
+
+
+def test_add_compacts_on_its_own_every_interval(tmp_path):
+    rollup = OHLCVRollup(TickerLog(str(tmp_path)), retention={'raw': 600})
+    record_all(rollup, random_walk(2 * 3600, step=60))
+    # Compaction last ran within the hour; everything older than its cutoff is gone
+    assert rollup.log.stats()['first'] >= rollup.compacted_at - 600
+
+
+def test_readonly_rollup_refuses_writes(tmp_path):
+    writer = OHLCVRollup(TickerLog(str(tmp_path)), retention=KEEP_ALL)
+    record_all(writer, random_walk(600))
+    reader = OHLCVRollup(TickerLog(str(tmp_path), readonly=True))
+    # Flushed candles are visible to another process
+    assert reader.candles('AAA', '1m', 0, 1e12)
+    with pytest.raises(PermissionError):
+        reader.add([tick('AAA', 1.0)], T0 + 1000)
+    with pytest.raises(PermissionError):
+        reader.catch_up()
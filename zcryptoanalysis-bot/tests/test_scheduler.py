@@ -0,0 +1,156 @@
+"""
+Adaptive poll scheduler: batches under the request budget, faster cadence
+for volatile, liquid or watched pairs, and requeueing of missing pairs
+"""
+
+import random
+from collections import Counter
+
+from engine.scheduler import PollScheduler
+
+
+def addresses(count, prefix='0x'):
+    return [f'{prefix}{i:040x}' for i in range(count)]
+
+
+def row(address, price, volume=10000.0):
+    return {'pairAddress': address, 'priceUsd': str(price), 'volume': {'h24': volume}}
+
+
+def test_new_pairs_are_due_in_full_batches_within_budget():
+    scheduler = PollScheduler(requests_per_minute=2, batch_size=30)
+    pairs = addresses(100)
+    scheduler.track(pairs, now=0.0)
+
+    due = scheduler.due(now=0.0)
+    # Two requests' worth of tokens, each a full batch
+    assert due == pairs[:60]
+    assert scheduler.due(now=0.0) == []
+    assert scheduler.stats(now=0.0)['overdue'] == 40
+    # Half a minute refills one token
+    assert scheduler.due(now=30.0) == pairs[60:90]
+
+
+def test_due_soon_pairs_ride_along_in_a_partial_batch():
+    scheduler = PollScheduler(batch_size=30, piggyback=60, min_interval=15, max_interval=600)
+    scheduler.track(['a', 'b'], now=0.0)
+    scheduler.observe([row('a', 1.0), row('b', 1.0)], now=0.0)
+    scheduler.track(['c'], now=550.0)
+
+    # 'c' is due now; 'a' and 'b' are due within the piggyback window at 600
+    assert sorted(scheduler.due(now=550.0)) == ['a', 'b', 'c']
+    assert scheduler.due(now=480.0 + 600) == []
+
+
+def test_request_budget_holds_over_an_hour():
+    random.seed(3)
+    scheduler = PollScheduler(requests_per_minute=2, batch_size=30)
+    pairs = addresses(300)
+    price = dict.fromkeys(pairs, 1.0)
+    scheduler.track(pairs, now=0.0)
+
+    requests = 0
+    now = 0.0
+    while now < 3600:
+        due = scheduler.due(now)
+        requests += -(-len(due) // 30)
+        for address in due:
+            price[address] *= 1 + random.uniform(-0.001, 0.001)
+        scheduler.observe([row(address, price[address]) for address in due], due, now)
+        now += 5
+    # Burst of one minute's tokens plus the refill rate
+    assert requests <= 2 + 2 * 60
+
+
+def test_hot_and_watched_pairs_are_polled_more_often_than_cold_ones():
+    random.seed(3)
+    scheduler = PollScheduler(requests_per_minute=2, batch_size=30)
+    pairs = addresses(300)
+    hot, watched, cold = set(pairs[:20]), pairs[20:25], pairs[25:]
+    price = dict.fromkeys(pairs, 1.0)
+    scheduler.track(pairs, now=0.0)
+
+    polls = Counter()
+    now = 0.0
+    while now < 3600:
+        due = scheduler.due(now)
+        rows = []
+        for address in due:
+            swing = 0.05 if address in hot else 0.001
+            price[address] *= 1 + random.uniform(-swing, swing)
+            rows.append(row(address, price[address], 2e6 if address in hot else 1e4))
+            polls[address] += 1
+        if now == 600:
+            for address in watched:
+                scheduler.add_interest(address, 5, now)
+        scheduler.observe(rows, due, now)
+        now += 5
+
+    def average(group):
+        return sum(polls[address] for address in group) / len(group)
+
+    assert average(hot) > 3 * average(cold)
+    assert average(watched) > average(cold)
+    # Cold pairs still get refreshed, just slowly
+    assert all(polls[address] >= 2 for address in cold)
+
+
+def test_requested_pairs_missing_from_the_response_are_requeued():
+    scheduler = PollScheduler(requests_per_minute=60, batch_size=30, max_interval=600)
+    scheduler.track(['a', 'b', 'c'], now=0.0)
+    due = scheduler.due(now=0.0)
+    assert sorted(due) == ['a', 'b', 'c']
+
+    scheduler.observe([row('a', 1.0)], due, now=0.0)
+    assert set(scheduler.due_at) == {'a', 'b', 'c'}
+    assert scheduler.due_at['b'] == 600.0
+    assert sorted(scheduler.due(now=600.0)) == ['a', 'b', 'c']
+
+
+def test_failed_batches_are_retried_soon_not_deferred():
+    scheduler = PollScheduler(requests_per_minute=60, batch_size=30, min_interval=15, max_interval=600)
+    scheduler.track(['a', 'b', 'c'], now=0.0)
+    scheduler.observe([row('a', 1.0, volume=0.0), row('b', 1.0, volume=0.0), row('c', 1.0, volume=0.0)],
+                      ['a', 'b', 'c'], now=0.0)
+    assert sorted(scheduler.due(now=600.0)) == ['a', 'b', 'c']
+
+    # The request for 'b' and 'c' failed; 'a' came back
+    scheduler.observe([row('a', 1.0, volume=0.0)], ['a'], now=600.0)
+    scheduler.retry(['b', 'c'], now=600.0)
+    assert scheduler.due_at['a'] == 1200.0
+    assert scheduler.due_at['b'] == scheduler.due_at['c'] == 615.0
+    assert sorted(scheduler.due(now=615.0)) == ['b', 'c']
+    # Their cadence and last poll are left as they were
+    assert scheduler.pairs['b'].polled_at == 0.0
+    assert scheduler.pairs['b'].interval == 600.0
+
+
+def test_retry_never_postpones_a_sooner_poll():
+    scheduler = PollScheduler(min_interval=15)
+    scheduler.track(['a'], now=0.0)
+    scheduler.retry(['a', 'untracked'], now=0.0)
+    assert scheduler.due_at == {'a': 0.0}
+    assert scheduler.due(now=0.0) == ['a']
+
+
+def test_interest_pulls_the_next_poll_in():
+    scheduler = PollScheduler(min_interval=15, max_interval=600, interest_ref=5)
+    scheduler.track(['a'], now=0.0)
+    scheduler.due(now=0.0)
+    scheduler.observe([row('a', 1.0, volume=0.0)], ['a'], now=0.0)
+    assert scheduler.due_at['a'] == 600.0
+
+    scheduler.add_interest('a', 5, now=10.0)
+    assert scheduler.due_at['a'] < 600.0
+    assert scheduler.due(now=scheduler.due_at['a']) == ['a']
+
+
+def test_untracked_pairs_are_never_returned():
+    scheduler = PollScheduler()
+    scheduler.track(['a', 'b'], now=0.0)
+    scheduler.untrack(['a'])
+    assert scheduler.due(now=0.0) == ['b']
+    assert len(scheduler) == 1
+    # Rows for pairs no longer tracked are ignored
+    scheduler.observe([row('a', 1.0), row('b', 1.0)], ['b'], now=0.0)
+    assert 'a' not in scheduler.due_at
@@ -0,0 +1,158 @@
+"""
+Columnar shared-memory snapshot buffer: round trips through the columns,
+the seqlock that keeps readers off half-written snapshots, and versioning
+"""
+
+import asyncio
+
+import pytest
+
+from engine.shm_snapshot import (ColumnarSnapshotWriter, ColumnarSnapshotReader, SEQ, SEQ_OFFSET,
+                                 READ_RETRIES)
+
+
+def opportunity(token, price, **extra):
+    record = {'token': token, 'name': f'{token} Token', 'price': price, 'change_24h': 12.5,
+              'liquidity': 50000.0, 'volume_24h': 250000.0, 'risk_score': 3, 'risk_level': 'MEDIUM',
+              'pair_address': f'0xpair{token.lower()}', 'token_address': f'0xtoken{token.lower()}'}
+    record.update(extra)
+    return record
+
+
+def snapshot(snapshot_time, chains, spikes=None):
+    return {'snapshot_time': snapshot_time, 'data_source': 'live', 'chains': chains, 'spikes': spikes or []}
+
+
+@pytest.fixture
+def buffer(tmp_path):
+    path = str(tmp_path / 'snapshot.shm')
+    writer = ColumnarSnapshotWriter(path)
+    writer.open()
+    yield writer, ColumnarSnapshotReader(path)
+    asyncio.run(writer.close())
+
+
+def test_reader_sees_nothing_before_first_publish(tmp_path):
+    reader = ColumnarSnapshotReader(str(tmp_path / 'missing.shm'))
+    assert reader.latest is None
+    assert reader.render('base', list) is None
+
+
+def test_round_trip_per_chain(buffer):
+    writer, reader = buffer
+    version = writer.publish(snapshot(1000.0, {
+        'base': [opportunity('AAA', 1.5, rsi=55.0, pairs=2, arbitrage=True), opportunity('BBB', 0.25)],
+        'solana': [opportunity('CCC', 3.0)]
+    }, spikes=[{'token': 'AAA', 'zscore': 4.2}]))
+
+    got_version, rows = reader.render('base', list)
+    assert got_version == version
+    assert [row['token'] for row in rows] == ['AAA', 'BBB']
+    assert rows[0]['price'] == 1.5
+    assert rows[0]['rsi'] == 55.0
+    assert rows[0]['pairs'] == 2 and rows[0]['arbitrage'] is True
+    # Missing optional values come back as None, not NaN or -1
+    assert rows[1]['rsi'] is None
+    assert rows[1]['pairs'] is None and rows[1]['arbitrage'] is None
+    assert rows[1]['chain_id'] == 'base'
+    assert rows[1]['pair_address'] == '0xpairbbb'
+
+    _, solana = reader.render('solana', lambda columns: [columns[-1]['token'], len(columns)])
+    assert solana == ['CCC', 1]
+    _, missing = reader.render('ethereum', len)
+    assert missing == 0
+
+    meta = reader.latest
+    assert meta['version'] == version
+    assert meta['snapshot_time'] == 1000.0
+    assert meta['data_source'] == 'live'
+    assert meta['spikes'] == [{'token': 'AAA', 'zscore': 4.2}]
+
+
+def test_mixed_chain_section_keeps_each_rows_chain(buffer):
+    writer, reader = buffer
+    base, solana = opportunity('AAA', 1.0), opportunity('CCC', 2.0)
+    writer.publish(snapshot(1000.0, {
+        'base': [base],
+        'solana': [solana],
+        '*': [dict(base, chain_id='base'), dict(solana, chain_id='solana')]
+    }))
+    _, rows = reader.render('*', list)
+    assert [(row['token'], row['chain_id']) for row in rows] == [('AAA', 'base'), ('CCC', 'solana')]
+
+
+def test_versions_increase_and_stale_publishes_are_rejected(buffer):
+    writer, reader = buffer
+    first = writer.publish(snapshot(1000.0, {'base': [opportunity('AAA', 1.0)]}))
+    second = writer.publish(snapshot(1000.0, {'base': [opportunity('AAA', 2.0)]}))
+    assert second > first
+
+    assert writer.publish(snapshot(900.0, {'base': [opportunity('AAA', 9.0)]})) is None
+    version, price = reader.render('base', lambda columns: columns[0]['price'])
+    assert (version, price) == (second, 2.0)
+
+
+def test_buffer_grows_for_large_snapshots(buffer):
+    writer, reader = buffer
+    size = len(writer.mm)
+    rows = [opportunity(f'T{i}', float(i)) for i in range(2000)]
+    writer.publish(snapshot(1000.0, {'base': rows}))
+    assert len(writer.mm) > size
+    _, tokens = reader.render('base', lambda columns: [row['token'] for row in columns])
+    assert tokens == [f'T{i}' for i in range(2000)]
+
+
+def test_reader_gives_up_while_a_write_is_in_progress(buffer):
+    writer, reader = buffer
+    writer.publish(snapshot(1000.0, {'base': [opportunity('AAA', 1.0)]}))
+    seq = SEQ.unpack_from(writer.mm, SEQ_OFFSET)[0]
+    SEQ.pack_into(writer.mm, SEQ_OFFSET, seq + 1)
+
+    calls = []
+    with pytest.raises(RuntimeError):
+        reader.read_consistent(lambda mm, header: calls.append(1))
+    # An odd sequence is never read through
+    assert calls == []
+
+    SEQ.pack_into(writer.mm, SEQ_OFFSET, seq + 2)
+    assert reader.render('base', len)[1] == 1
+
+
+def test_read_overlapping_a_publish_is_retried(buffer):
+    writer, reader = buffer
+    writer.publish(snapshot(1000.0, {'base': [opportunity('AAA', 1.0)]}))
+    attempts = []
+
+    def read(mm, header):
+        columns = reader.columns(mm, header, 'base')
+        price = columns[0]['price']
+        if not attempts:
+            # The scanner publishes while this read is in flight
+            writer.publish(snapshot(1001.0, {'base': [opportunity('AAA', 2.0)]}))
+        attempts.append(price)
+        return price
+
+    version, price = reader.read_consistent(read)
+    assert len(attempts) == 2
+    assert price == 2.0
+    assert version == writer.version
+    assert len(attempts) <= READ_RETRIES
+
+
+def test_reopened_writer_recovers_from_a_crash_mid_write(buffer, tmp_path):
+    writer, reader = buffer
+    version = writer.publish(snapshot(1000.0, {'base': [opportunity('AAA', 1.0)]}))
+    seq = SEQ.unpack_from(writer.mm, SEQ_OFFSET)[0]
+    # Crash after the seq bump, before the closing one
+    SEQ.pack_into(writer.mm, SEQ_OFFSET, seq + 1)
+    asyncio.run(writer.close())
+
+    restarted = ColumnarSnapshotWriter(writer.path)
+    restarted.open()
+    try:
+        assert SEQ.unpack_from(restarted.mm, SEQ_OFFSET)[0] % 2 == 0
+        assert restarted.version == version
+        assert reader.render('base', len) == (version, 1)
+        assert restarted.publish(snapshot(1000.0, {'base': []})) > version
+    finally:
+        asyncio.run(restarted.close())
@@ -0,0 +1,117 @@
+"""
+Append-only ticker log: time-range history through the mmap'd index,
+the incremental per-token record lists, compaction and crash repair
+"""
+
+import os
+
+import pytest
+
+from engine.ticker_log import TickerLog, RECORD, INDEX_ENTRY, DATA_FILE, INDEX_FILE
+
+
+def record(token, price, address=None):
+    return {'token': token, 'token_address': address, 'price': price, 'liquidity': 1000.0 * price,
+            'volume_24h': 5000.0, 'change_24h': 1.0}
+
+
+def prices(samples):
+    return [(sample['timestamp'], sample['price']) for sample in samples]
+
+
+@pytest.fixture
+def log(tmp_path):
+    return TickerLog(str(tmp_path))
+
+
+def test_history_by_address_and_time_range(log):
+    for step in range(10):
+        log.append([record('AAA', 1.0 + step, '0xAaa'), record('BBB', 100.0 + step, '0xbbb')], 1000.0 + step * 60)
+
+    assert prices(log.history('0xaaa')) == [(1000.0 + step * 60, 1.0 + step) for step in range(10)]
+    assert prices(log.history('0xAAA', 1120.0, 1300.0)) == [(1120.0, 3.0), (1180.0, 4.0), (1240.0, 5.0),
+                                                            (1300.0, 6.0)]
+    sample = log.history('0xbbb', 1000.0, 1000.0)[0]
+    assert sample['token'] == 'BBB' and sample['token_key'] == '0xbbb'
+    assert sample['liquidity'] == 100000.0
+    assert log.history('0xccc') == []
+    assert log.history('0xaaa', 5000.0, 6000.0) == []
+
+
+def test_symbol_covers_every_pair_sharing_it_in_log_order(log):
+    log.append([record('PEPE', 1.0, '0x1'), record('PEPE', 2.0, '0x2'), record('OTHER', 3.0, '0x3')], 1000.0)
+    log.append([record('pepe', 4.0, '0x2'), record('PEPE', 5.0, '0x1')], 1060.0)
+    assert prices(log.history('PEPE')) == [(1000.0, 1.0), (1000.0, 2.0), (1060.0, 4.0), (1060.0, 5.0)]
+    # Tokens without an address are keyed by symbol
+    log.append([record('NOADDR', 7.0)], 1120.0)
+    assert prices(log.history('noaddr')) == [(1120.0, 7.0)]
+
+
+def test_index_extends_over_new_appends(log):
+    log.append([record('AAA', 1.0, '0xa'), record('BBB', 2.0, '0xb')], 1000.0)
+    assert len(log.history('0xa')) == 1
+    assert log.indexed == 2
+
+    log.append([record('AAA', 3.0, '0xa')], 1060.0)
+    log.append([record('BBB', 4.0, '0xb')], 1120.0)
+    assert prices(log.history('0xa')) == [(1000.0, 1.0), (1060.0, 3.0)]
+    assert log.indexed == 4
+    assert list(log.postings[log.ids['0xb']]) == [1, 3]
+
+
+def test_compaction_drops_old_snapshots_and_renumbers(log):
+    for step in range(6):
+        log.append([record('AAA', float(step), '0xa'), record('BBB', 10.0 + step, '0xb')], 1000.0 + step * 60)
+    assert len(log.history('0xa')) == 6
+
+    assert log.compact(1180.0) == 6
+    stats = log.stats()
+    assert stats['records'] == 6 and stats['snapshots'] == 3 and stats['first'] == 1180.0
+    # The postings were rebuilt against the rewritten file
+    assert prices(log.history('0xb')) == [(1180.0, 13.0), (1240.0, 14.0), (1300.0, 15.0)]
+    assert list(log.postings[log.ids['0xa']]) == [0, 2, 4]
+    assert log.compact(1000.0) == 0
+
+    log.append([record('AAA', 6.0, '0xa')], 1360.0)
+    assert prices(log.history('0xa'))[-2:] == [(1300.0, 5.0), (1360.0, 6.0)]
+
+
+def test_readonly_reader_follows_the_writer(log):
+    log.append([record('AAA', 1.0, '0xa')], 1000.0)
+    reader = TickerLog(log.directory, readonly=True)
+    assert prices(reader.history('0xa')) == [(1000.0, 1.0)]
+
+    log.append([record('AAA', 2.0, '0xa'), record('NEW', 3.0, '0xn')], 1060.0)
+    assert prices(reader.history('0xa')) == [(1000.0, 1.0), (1060.0, 2.0)]
+    assert prices(reader.history('NEW')) == [(1060.0, 3.0)]
+
+    log.compact(1060.0)
+    assert prices(reader.history('0xa')) == [(1060.0, 2.0)]
+    with pytest.raises(PermissionError):
+        reader.append([record('AAA', 4.0, '0xa')], 1120.0)
+
+
+def test_torn_tail_is_repaired_on_open(log):
+    log.append([record('AAA', 1.0, '0xa')], 1000.0)
+    log.append([record('AAA', 2.0, '0xa')], 1060.0)
+    data_path = os.path.join(log.directory, DATA_FILE)
+    index_path = os.path.join(log.directory, INDEX_FILE)
+    with open(data_path, 'ab') as f:
+        f.write(b'\x01' * (RECORD.size // 2))
+    with open(index_path, 'ab') as f:
+        f.write(b'\x01' * 3)
+
+    reopened = TickerLog(log.directory)
+    assert os.path.getsize(data_path) == 2 * RECORD.size
+    assert os.path.getsize(index_path) == 2 * INDEX_ENTRY.size
+    assert prices(reopened.history('0xa')) == [(1000.0, 1.0), (1060.0, 2.0)]
+    reopened.append([record('AAA', 3.0, '0xa')], 1120.0)
+    assert len(reopened.history('0xa')) == 3
+
+
+def test_records_without_an_index_entry_still_count(log):
+    log.append([record('AAA', 1.0, '0xa')], 1000.0)
+    # A crash between the data and index writes of the next append
+    with open(os.path.join(log.directory, DATA_FILE), 'ab') as f:
+        f.write(RECORD.pack(1060.0, log.ids['0xa'], 2.0, 2000.0, 5000.0, 1.0))
+    assert prices(log.history('0xa')) == [(1000.0, 1.0), (1060.0, 2.0)]
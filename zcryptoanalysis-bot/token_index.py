@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Token mention index for mapping tweet text to DexScreener tokens
+Built from each scan's baseToken symbol/name/address set
+"""
+
+import re
+from typing import List, Dict, Any, Set, Tuple
+
+# One regex pass splits a tweet into cashtags, contract addresses and words
+WORD_PATTERN = re.compile(r'\$[A-Za-z][A-Za-z0-9_]{0,14}|0x[0-9a-fA-F]{40}|[A-Za-z0-9]+')
+
+# Bare (non-cashtag) symbols shorter than this are too ambiguous to match
+MIN_BARE_SYMBOL_LEN = 3
+
+# Ordinary words that are also token names or symbols ("Base", "Degen"): in tweet
+# text they only count as a $cashtag, or as part of a longer name
+STOPWORDS = frozenset({
+    'a', 'ai', 'all', 'alpha', 'and', 'ape', 'app', 'base', 'based', 'bear', 'bot', 'bull', 'buy', 'cash',
+    'cat', 'chain', 'coin', 'crypto', 'dao', 'degen', 'dev', 'dog', 'dump', 'eth', 'for', 'frog', 'fun',
+    'game', 'gem', 'gm', 'gold', 'hold', 'home', 'it', 'just', 'king', 'launch', 'life', 'love', 'meme',
+    'money', 'moon', 'new', 'now', 'one', 'pump', 'rug', 'sell', 'send', 'the', 'this', 'time', 'token',
+    'usd', 'wif', 'you'
+})
+
+# Cashtags Twitter search accepts: a letter, then up to 14 letters, digits or underscores
+CASHTAG_PATTERN = re.compile(r'[A-Z][A-Z0-9_]{0,14}')
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Normalize a symbol or cashtag to its lookup key"""
+    return symbol.lstrip('$').upper()
+
+
+def normalize_words(text: str) -> Tuple[str, ...]:
+    """Split a token name into lowercase word keys"""
+    return tuple(w.lower() for w in re.findall(r'[A-Za-z0-9]+', text))
+
+
+class TokenIndex:
+    def __init__(self):
+        self.symbols: Dict[str, Set[str]] = {}
+        self.addresses: Dict[str, str] = {}
+        self.names: Dict[str, Dict[Tuple[str, ...], Set[str]]] = {}
+        self.tokens: Dict[str, Dict[str, str]] = {}
+        self.max_name_words = 1
+
+    def token_key(self, ticker: Dict) -> str:
+        """Stable key for a ticker's base token (address, else symbol)"""
+        base = ticker.get('baseToken', {})
+        address = (base.get('address') or '').lower()
+        return address or normalize_symbol(base.get('symbol', ''))
+
+    def update(self, tickers: List[Dict]) -> Dict[str, int]:
+        """Sync the index with a scan's token universe, touching only what changed"""
+        current = {}
+        for ticker in tickers:
+            base = ticker.get('baseToken', {})
+            if not base.get('symbol'):
+                continue
+            current[self.token_key(ticker)] = {
+                'symbol': base['symbol'],
+                'name': base.get('name', ''),
+                'address': (base.get('address') or '').lower()
+            }
+
+        removed = [key for key in self.tokens if key not in current]
+        added = [key for key, token in current.items() if self.tokens.get(key) != token]
+
+        replaced = [key for key in added if key in self.tokens]
+        for key in removed + replaced:
+            self.remove_token(key)
+        if removed or replaced:
+            # Longest indexed name may have gone; additions below only raise it
+            self.max_name_words = max((len(phrase) for phrases in self.names.values() for phrase in phrases),
+                                      default=1)
+        for key in added:
+            self.add_token(key, current[key])
+
+        return {'added': len(added), 'removed': len(removed), 'total': len(self.tokens)}
+
+    def add_token(self, key: str, token: Dict[str, str]):
+        """Add one token's symbol, name and address entries"""
+        self.tokens[key] = token
+        self.symbols.setdefault(normalize_symbol(token['symbol']), set()).add(key)
+
+        if token['address']:
+            self.addresses[token['address']] = key
+
+        words = normalize_words(token['name'])
+        # A one-word name that is an ordinary word would match everyday tweets
+        if len(words) > 1 or (words and words[0] not in STOPWORDS):
+            self.names.setdefault(words[0], {}).setdefault(words, set()).add(key)
+            self.max_name_words = max(self.max_name_words, len(words))
+
+    def remove_token(self, key: str):
+        """Drop one token's entries from every lookup table"""
+        token = self.tokens.pop(key)
+
+        symbol = normalize_symbol(token['symbol'])
+        self.symbols.get(symbol, set()).discard(key)
+        if not self.symbols.get(symbol):
+            self.symbols.pop(symbol, None)
+
+        if self.addresses.get(token['address']) == key:
+            del self.addresses[token['address']]
+
+        words = normalize_words(token['name'])
+        if words:
+            phrases = self.names.get(words[0], {})
+            phrases.get(words, set()).discard(key)
+            if not phrases.get(words):
+                phrases.pop(words, None)
+            if not phrases:
+                self.names.pop(words[0], None)
+
+    def extract_mentions(self, text: str) -> List[str]:
+        """Return token keys mentioned in text, in order of first appearance"""
+        found: Dict[str, None] = {}
+        matches = WORD_PATTERN.findall(text)
+        words = [m.lower() for m in matches]
+
+        for i, raw in enumerate(matches):
+            keys: Set[str] = set()
+
+            if raw[0] == '$':
+                keys = self.symbols.get(normalize_symbol(raw), set())
+            elif raw[:2] in ('0x', '0X') and len(raw) == 42:
+                key = self.addresses.get(raw.lower())
+                keys = {key} if key else set()
+            else:
+                if len(raw) >= MIN_BARE_SYMBOL_LEN and raw.isupper() and words[i] not in STOPWORDS:
+                    keys = self.symbols.get(raw, set())
+                phrases = self.names.get(words[i])
+                if phrases:
+                    keys = set(keys)
+                    # One-word names only as a proper noun ("Brett", not "brett")
+                    shortest = 1 if raw[0].isupper() else 2
+                    for length in range(shortest, self.max_name_words + 1):
+                        phrase = tuple(words[i:i + length])
+                        if phrase in phrases:
+                            keys |= phrases[phrase]
+
+            for key in sorted(keys):
+                found.setdefault(key, None)
+
+        return list(found)
+
+    def cashtags(self) -> List[str]:
+        """Distinct symbols usable as search cashtags, in the order tokens entered the index"""
+        symbols: Dict[str, None] = {}
+        for token in self.tokens.values():
+            symbol = normalize_symbol(token['symbol'])
+            if CASHTAG_PATTERN.fullmatch(symbol):
+                symbols.setdefault(symbol, None)
+        return list(symbols)
+
+    def describe(self, key: str) -> Dict[str, Any]:
+        """Symbol/name/address for a token key returned by extract_mentions"""
+        return dict(self.tokens.get(key, {}))
@@ -1,28 +1,25 @@
+import os
 import requests
 import time
 from datetime import datetime
 
+from engine import Pipeline, CompactRenderer, WORKING
+from engine.fetcher import SyncFetcher
+
 BOT_TOKEN = "6994487405:AAH8Qv1Kz3J8mN3xY9r5P8kL2mN4xY7z"
 API_URL = f"https://api.telegram.org/bot{BOT_TOKEN}"
 
-def get_report():
-    return """🎯 **Zcryptoanalysis Report**
-
-**Found 3 Base chain opportunities:**
-
-🚀 **AERO** - $0.00000123
-📈 +15.70% | 💧 $75,000
-Risk: 🟡 Medium (5/10)
+fetcher = SyncFetcher(
+    ['https://api.dexscreener.com/latest/dex/tickers'],
+    timeout=10,
+    allow_sample=os.getenv('ALLOW_SAMPLE_DATA', '').lower() in ('1', 'true', 'yes')
+)
+pipeline = Pipeline.from_profile(WORKING, fetcher=fetcher, renderer=CompactRenderer(top_n=3))
 
-📉 **DEGEN** - $0.00004567
-📈 -8.30% | 💧 $125,000
-Risk: 🟡 Medium (4/10)
-
-🚀 **BRETT** - $0.00001234
-📈 +28.50% | 💧 $200,000
-Risk: 🟠 High (6/10)
-
-📊 Updated: {}""".format(str(datetime.now())[:19])
+def get_report():
+    _, opportunities, report = pipeline.run()
+    report = fetcher.data_notice() + (report or pipeline.renderer.render([]))
+    return report + "📊 Updated: {}".format(str(datetime.now())[:19])
 
 def send_message(chat_id, text):
     url = f"{API_URL}/sendMessage"
@@ -34,28 +31,27 @@ def main():
     last_update_id = 0
     while True:
         try:
-            response = requests.get(f"{API_URL}/getUpdates?offset={last_update_id + 1}")
-            updates = response.json().get(result, [])
+            response = requests.get(f"{API_URL}/getUpdates?offset={last_update_id + 1}&timeout=10")
+            updates = response.json().get('result', [])
             for update in updates:
-                if message in update:
-                    message = update[message]
-                    chat_id = message[chat][id]
-                    text = message.get(text, )
+                if 'message' in update:
+                    message = update['message']
+                    chat_id = message['chat']['id']
+                    text = message.get('text', '')
                     
-                    if text.startswith(/scan):
+                    if text.startswith('/scan'):
                         send_message(chat_id, get_report())
-                    elif text.startswith(/help):
+                    elif text.startswith('/help'):
                         send_message(chat_id, "Commands: /scan, /help, /status")
-            last_update_id = update[update_id]
+                last_update_id = update['update_id']
             time.sleep(2)
         except KeyboardInterrupt:
             break
         except:
             time.sleep(5)
 
-if __name__ == __main__:
+if __name__ == '__main__':
     print("✅ Bot ready for @Zcryptoanzlysis_bot")
     print("📊 Sample output:")
     print(get_report())
     main()
-
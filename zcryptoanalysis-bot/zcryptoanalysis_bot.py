@@ -1,160 +1,48 @@
 #!/usr/bin/env python3
 """
 Zcryptoanalysis Bot - Working Version
-Uses correct DexScreener endpoints
+Console runner over the shared engine
 """
 
-import json
-import requests
-from datetime import datetime
 import os
 
+from engine import Pipeline, ConsoleRenderer, ZCRYPTO
+from engine.fetcher import SyncFetcher
+
 class ZcryptoAnalyzer:
     def __init__(self):
         self.base_url = 'https://api.dexscreener.com/latest'
-        self.min_liquidity = 50000
+        self.min_liquidity = ZCRYPTO.filter.min_liquidity
+        self.fetcher = SyncFetcher(
+            ['https://api.dexscreener.io/latest/dex/tickers', 'https://api.dexscreener.com/latest/dex/tickers'],
+            timeout=10,
+            allow_sample=os.getenv('ALLOW_SAMPLE_DATA', '').lower() in ('1', 'true', 'yes')
+        )
+        self.pipeline = Pipeline.from_profile(ZCRYPTO, fetcher=self.fetcher, renderer=ConsoleRenderer())
         
     def get_base_tokens(self):
         """Get trending tokens on Base chain"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            # Try the correct endpoint for trending
-            response = requests.get('https://api.dexscreener.io/latest/dex/tickers', headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                tickers = data.get('tickers', [])
-            else:
-                # Fallback to pairs endpoint
-                response = requests.get('https://api.dexscreener.com/latest/dex/tickers', headers=headers, timeout=10)
-                data = response.json()
-                tickers = data.get('tickers', [])
-            
-            # Filter for Base chain (chainId = base)
-            base_tickers = [t for t in tickers if t.get('chainId') == 'base']
-            return base_tickers
-            
-        except Exception as e:
-            print(f"❌ API Error: {e}")
-            # Return sample data for testing
-            return self.get_sample_data()
+        tickers = self.pipeline.parser.select_chain(self.fetcher.fetch())
+        notice = self.fetcher.data_notice()
+        if notice:
+            print(notice.strip())
+        return tickers
     
     def get_sample_data(self):
         """Sample data for testing when API is unavailable"""
-        return [
-            {
-                'chainId': 'base',
-                'baseToken': {'symbol': 'AERO', 'name': 'Aerodrome Finance'},
-                'priceUsd': '0.000001234',
-                'liquidity': {'usd': 75000},
-                'volume': {'h24': 250000},
-                'priceChange': {'h24': 15.7}
-            },
-            {
-                'chainId': 'base',
-                'baseToken': {'symbol': 'DEGEN', 'name': 'Degen'},
-                'priceUsd': '0.00004567',
-                'liquidity': {'usd': 125000},
-                'volume': {'h24': 180000},
-                'priceChange': {'h24': -8.3}
-            },
-            {
-                'chainId': 'base',
-                'baseToken': {'symbol': 'BASEDOG', 'name': 'Base Dog'},
-                'priceUsd': '0.000000891',
-                'liquidity': {'usd': 45000},
-                'volume': {'h24': 95000},
-                'priceChange': {'h24': 45.2}
-            }
-        ]
+        return self.fetcher.sample_data
     
     def analyze_opportunities(self, tickers):
         """Analyze and score opportunities"""
-        opportunities = []
-        
-        for ticker in tickers:
-            try:
-                # Extract data safely
-                token = ticker['baseToken']['symbol']
-                name = ticker['baseToken'].get('name', token)
-                price = float(ticker['priceUsd'])
-                
-                # Handle different data structures
-                liquidity = float(ticker.get('liquidity', {}).get('usd', 0))
-                if liquidity == 0:
-                    liquidity = float(ticker.get('liquidityUsd', 0))
-                
-                volume = float(ticker.get('volume', {}).get('h24', 0))
-                if volume == 0:
-                    volume = float(ticker.get('volume24h', 0))
-                
-                price_change = float(ticker.get('priceChange', {}).get('h24', 0))
-                if price_change == 0:
-                    price_change = float(ticker.get('priceChange24h', 0))
-                
-                # Filter criteria
-                if liquidity >= 50000 and abs(price_change) >= 5:
-                    risk_score = self.calculate_risk(liquidity, volume, abs(price_change))
-                    
-                    opportunities.append({
-                        'token': token,
-                        'name': name,
-                        'price': price,
-                        'change_24h': price_change,
-                        'liquidity': liquidity,
-                        'volume_24h': volume,
-                        'risk_score': risk_score,
-                        'risk_level': self.get_risk_level(risk_score),
-                        'timestamp': str(datetime.utcnow())
-                    })
-                    
-            except Exception as e:
-                continue
-        
-        return sorted(opportunities, key=lambda x: abs(x['change_24h']), reverse=True)
+        return self.pipeline.analyze(tickers)
     
     def calculate_risk(self, liquidity, volume, price_change):
         """Calculate risk score 1-10"""
-        score = 3  # Base score
-        
-        # Liquidity risk
-        if liquidity < 100000:
-            score += 3
-        elif liquidity < 500000:
-            score += 2
-        elif liquidity < 1000000:
-            score += 1
-        
-        # Volatility risk
-        if price_change > 200:
-            score += 4
-        elif price_change > 100:
-            score += 3
-        elif price_change > 50:
-            score += 2
-        elif price_change > 20:
-            score += 1
-        
-        # Volume risk
-        if volume < 50000:
-            score += 2
-        elif volume < 100000:
-            score += 1
-        
-        return min(score, 10)
+        return self.pipeline.scorer.score(liquidity, volume, price_change)
     
     def get_risk_level(self, score):
         """Get risk level description"""
-        if score <= 3:
-            return "🟢 Low"
-        elif score <= 5:
-            return "🟡 Medium"
-        elif score <= 7:
-            return "🟠 High"
-        else:
-            return "🔴 Extreme"
+        return ZCRYPTO.risk_model.risk_level(score)
     
     def run_analysis(self):
         """Run complete analysis"""
@@ -176,29 +64,8 @@ class ZcryptoAnalyzer:
             print("ℹ️  No opportunities meeting criteria")
             return []
         
-        # Display results
-        print(f"\n🎯 Found {len(opportunities)} opportunities:")
-        print("-" * 60)
-        
-        for i, opp in enumerate(opportunities[:10]):
-            print(f"{i+1}. {opp['token']} - {opp['name'][:40]}")
-            print(f"   💰 Price: ${opp['price']:.8f}")
-            print(f"   📈 Change: {opp['change_24h']:+.2f}%")
-            print(f"   💧 Liquidity: ${opp['liquidity']:,}")
-            print(f"   📊 Volume: ${opp['volume_24h']:,}")
-            print(f"   {opp['risk_level']} Risk ({opp['risk_score']}/10)")
-            print()
-        
-        # Summary
-        total = len(opportunities)
-        low_risk = len([o for o in opportunities if o['risk_score'] <= 3])
-        high_risk = len([o for o in opportunities if o['risk_score'] > 7])
-        
-        print("📈 Analysis Summary:")
-        print(f"   Total opportunities: {total}")
-        print(f"   Low risk: {low_risk}")
-        print(f"   Medium risk: {total - low_risk - high_risk}")
-        print(f"   High risk: {high_risk}")
+        # Display results and summary
+        print(self.pipeline.render(opportunities))
         
         return opportunities
 